@@ -13,7 +13,6 @@ import numpy as np
 from PIL import Image
 import io
 import base64
-from sklearn.cluster import KMeans
 
 # Import our existing modules
 import sys
@@ -21,16 +20,47 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from preprocess import normalize_board
-from grid import cells_from_rectified
-from ocr_cell import read_cell
-from reconcile import load_players, reconcile_cell_with_position, grid_to_draft_pick
-from reconcile import top_n_matches_with_position, normalize_name, player_identity
+from grid import cells_from_rectified, detect_empty_cells
+from pipeline import ocr_board_cells, DEFAULT_OCR_MODE
+from staged_ocr import AdaptiveCellReader, StagedCellReader, strategy_stats, tier_counts
+from vocab_ocr import get_vocabulary_reader
+import ocr_engine
+from reconcile import (reconcile_cell_with_position, reconcile_cell_scan, grid_to_draft_pick, get_draft_table,
+                       empty_cell_result, CandidateScan)
+from player_db import get_player_db
+from reconcile import normalize_name, player_identity
+from score_matrix import ScoreMatrix
+from assignment import solve_assignment
+from board_state import BoardState
 from emit import emit_all_outputs
-from manual_color_calibration import ManualColorCalibrator
+from manual_color_calibration import ManualColorCalibrator, hsv_range_around, hsv_range_from_samples
+from color_clustering import cluster_cell_colors, cluster_image_colors
 
 app = Flask(__name__, template_folder='../web/templates', static_folder='../web/static')
 app.config['UPLOAD_FOLDER'] = '../.temp/uploads'
 app.config['OUTPUT_FOLDER'] = '../outputs/web_output'
+# OCR worker pool for /process (OCR_EXECUTOR: 'thread' or 'process')
+app.config['OCR_WORKERS'] = int(os.environ.get('OCR_WORKERS', os.cpu_count() or 1))
+app.config['OCR_EXECUTOR'] = os.environ.get('OCR_EXECUTOR', 'thread')
+if app.config['OCR_EXECUTOR'] == 'process' and not os.environ.get('OCR_CACHE_DIR'):
+    print("[app] OCR_EXECUTOR=process without OCR_CACHE_DIR: worker OCR caches are discarded after every board")
+# Auto color detection fallback: cluster per-cell dominant colors ('cells') or the image histogram ('pixels')
+app.config['COLOR_FALLBACK'] = os.environ.get('COLOR_FALLBACK', 'cells')
+# Player database: loaded once, revalidated by mtime/hash and hot-swapped on change
+app.config['PLAYERS_CSV'] = '../data/top500_playernames.csv'
+# Player assignment: 'greedy' (cell order with exact-name steals) or 'global' (one Hungarian solve)
+app.config['ASSIGNMENT'] = os.environ.get('ASSIGNMENT', 'greedy')
+# Score each OCR'd name only against players sharing its last-name trigrams (MATCH_BLOCKING=1);
+# off by default since a misread last name then cannot be rescued by team/bye/draft scores
+app.config['MATCH_BLOCKING'] = os.environ.get('MATCH_BLOCKING', '0') == '1'
+# Staged cell reading (OCR_MODE=staged): escalate past the last-name ROI only while the
+# best match leads the runner-up by less than this many points
+app.config['OCR_ESCALATION_MARGIN'] = float(os.environ.get('OCR_ESCALATION_MARGIN', 10.0))
+# Adaptive strategy selection (OCR_MODE=adaptive): cells read with both ROI and whole-cell
+# OCR to pick the board's dominant strategy (OCR_ADAPTIVE_SAMPLE)
+app.config['OCR_ADAPTIVE_SAMPLE'] = int(os.environ.get('OCR_ADAPTIVE_SAMPLE', 20))
+# Skip OCR and matching for cells with no sticker (blank paper), e.g. partially filled boards
+app.config['SKIP_EMPTY_CELLS'] = os.environ.get('SKIP_EMPTY_CELLS', '1') != '0'
 
 # Ensure directories exist
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
@@ -39,9 +69,59 @@ os.makedirs(os.path.join(app.config['OUTPUT_FOLDER'], 'results'), exist_ok=True)
 os.makedirs(os.path.join(app.config['OUTPUT_FOLDER'], 'results', 'cells'), exist_ok=True)
 # Template and static folders are configured in Flask constructor above
 
+# Load the player database once at startup; requests reuse the cached index
+try:
+    get_player_db(app.config['PLAYERS_CSV']).get()
+except OSError as e:
+    print(f"Warning: player database not loaded at startup ({e})")
+
 # Global variables to store session data
 session_data = {}
 
+
+def needs_manual_correction(result, confidence_threshold: float = 45.0) -> bool:
+    """Unmatched or low-confidence cells go to the manual correction queue (empty cells never do)."""
+    if result and result.get('empty'):
+        return False
+    return not result or not result.get('use_match', False) or result.get('match_score', 0) < confidence_threshold
+
+
+def board_ocr_key(image_path: str, team_count: int, round_count: int) -> tuple:
+    """Identifies a crop and grid; OCR results stay valid while it is unchanged."""
+    st = os.stat(image_path)
+    return (os.path.abspath(image_path), st.st_mtime_ns, st.st_size, team_count, round_count)
+
+
+def unrecognized_cell_entry(i, row, col, result, chosen_ocr, cell_img):
+    """Save the cell image and build its manual correction queue entry."""
+    cell_filename = f'cell_r{row}_c{col}.png'
+    cell_path = os.path.join(app.config['OUTPUT_FOLDER'], 'results', 'cells', cell_filename)
+    os.makedirs(os.path.dirname(cell_path), exist_ok=True)
+    if cell_img is not None:
+        cv2.imwrite(cell_path, cell_img)
+
+    suggested_player = None
+    if result and result.get('best_candidate'):
+        cand = result['best_candidate']
+        suggested_player = {
+            'name': cand.get('full_name', ''),
+            'position': cand.get('pos', ''),
+            'team': cand.get('team', ''),
+            'confidence': result.get('best_candidate_confidence', 0),
+            'is_db': True
+        }
+
+    return {
+        'index': i,
+        'row': row,
+        'col': col,
+        'cell_image': f'/cell_image/{cell_filename}',
+        'ocr_text': f"{chosen_ocr.get('ocr_first', '')} {chosen_ocr.get('ocr_last', '')}".strip(),
+        'detected_position': chosen_ocr.get('color_pos'),
+        'confidence': result.get('match_score', 0) if result else 0,
+        'suggested_player': suggested_player
+    }
+
 @app.route('/')
 def index():
     """Main page with upload interface"""
@@ -225,30 +305,8 @@ def calibrate_colors():
     color_profiles = {}
     
     for position, color_data in data['colors'].items():
-        h, s, v = color_data['hsv']
-        
-        # Create HSV range with position-specific tolerance
-        if position == 'QB':  # Orange - can be more variable
-            h_tolerance, s_tolerance, v_tolerance = 20, 50, 50
-        elif position == 'RB':  # Brown - needs more tolerance
-            h_tolerance, s_tolerance, v_tolerance = 25, 60, 60
-        elif position == 'WR':  # Blue - fairly consistent
-            h_tolerance, s_tolerance, v_tolerance = 15, 35, 35
-        elif position == 'TE':  # Red - can vary
-            h_tolerance, s_tolerance, v_tolerance = 20, 45, 45
-        elif position == 'K':   # Gray - reduce tolerance to prevent catch-all
-            h_tolerance, s_tolerance, v_tolerance = 15, 30, 30
-        elif position == 'DST': # Green - fairly consistent
-            h_tolerance, s_tolerance, v_tolerance = 15, 40, 40
-        else:
-            h_tolerance, s_tolerance, v_tolerance = 15, 40, 40
-        
-        h_min = max(0, h - h_tolerance)
-        h_max = min(180, h + h_tolerance)
-        s_min = max(0, s - s_tolerance)
-        s_max = min(255, s + s_tolerance)
-        v_min = max(0, v - v_tolerance)
-        v_max = min(255, v + v_tolerance)
+        # HSV range around the picked color with position-specific tolerance
+        (h_min, s_min, v_min), (h_max, s_max, v_max) = hsv_range_around(position, color_data['hsv'])
         
         color_profiles[position] = {
             'hsv_ranges': [[h_min, s_min, v_min], [h_max, s_max, v_max]],
@@ -271,7 +329,8 @@ def auto_detect_colors():
     - Build a rectified board and grid
     - OCR cells to find those with recognizable POS text and last names
     - For each POS, collect up to 5 unique last-name samples and compute HSV ranges
-    - Fallback to global KMeans color clustering if insufficient samples
+    - Fallback to clustering the per-cell dominant colors (or the image's HSV
+      histogram with COLOR_FALLBACK=pixels) if insufficient samples
     """
     if 'cropped_image' not in session_data:
         return jsonify({'error': 'No cropped image available'}), 400
@@ -280,10 +339,7 @@ def auto_detect_colors():
         # Build rectified board and cells
         from preprocess import normalize_board
         from grid import cells_from_rectified
-        from ocr_cell import read_cell_whole, dominant_nonwhite_hsv
-        from reconcile import load_players
-
-        players = load_players("../data/top500_playernames.csv")
+        from ocr_cell import read_cell_whole, dominant_hsv_for_cells
         team_count = session_data.get('team_count', 10)
         round_count = session_data.get('round_count', 16)
 
@@ -302,7 +358,10 @@ def auto_detect_colors():
             p = _re.sub(r'[^A-Z]', '', str(pos_text).upper())
             return p if p in target_positions else None
 
-        for (row, col, x, y, w, h) in cells:
+        # Dominant colors for every cell in one board-wide pass
+        cell_hsvs = dominant_hsv_for_cells(rectified, cells)
+
+        for i, (row, col, x, y, w, h) in enumerate(cells):
             cell_img = rectified[y:y+h, x:x+w]
             ocr_whole = read_cell_whole(cell_img)
             pos = clean_pos_text_local(ocr_whole.get('ocr_pos'))
@@ -312,7 +371,7 @@ def auto_detect_colors():
             if last in pos_to_lastnames[pos]:
                 continue
 
-            hsv = dominant_nonwhite_hsv(cell_img)
+            hsv = tuple(map(float, cell_hsvs[i]))
             pos_to_samples[pos].append(hsv)
             pos_to_lastnames[pos].add(last)
 
@@ -328,30 +387,8 @@ def auto_detect_colors():
             samples = pos_to_samples.get(pos, [])
             if len(samples) < 2:
                 continue
-            samples = np.array(samples, dtype=np.float32)
-            h_vals = samples[:, 0]
-            s_vals = samples[:, 1]
-            v_vals = samples[:, 2]
-
             # Use percentiles with padding
-            h_min, h_max = np.percentile(h_vals, [10, 90])
-            s_min, s_max = np.percentile(s_vals, [10, 90])
-            v_min, v_max = np.percentile(v_vals, [10, 90])
-
-            h_spread = max(1, int(h_max - h_min))
-            s_spread = max(1, int(s_max - s_min))
-            v_spread = max(1, int(v_max - v_min))
-
-            h_pad = max(8, int(0.20 * h_spread))
-            s_pad = max(20, int(0.20 * s_spread))
-            v_pad = max(20, int(0.20 * v_spread))
-
-            h_lo = int(max(0, h_min - h_pad))
-            h_hi = int(min(180, h_max + h_pad))
-            s_lo = int(max(0, s_min - s_pad))
-            s_hi = int(min(255, s_max + s_pad))
-            v_lo = int(max(0, v_min - v_pad))
-            v_hi = int(min(255, v_max + v_pad))
+            (h_lo, s_lo, v_lo), (h_hi, s_hi, v_hi) = hsv_range_from_samples(samples, (10, 90))
 
             # Center for UI
             h_c = int((h_lo + h_hi) / 2)
@@ -371,25 +408,16 @@ def auto_detect_colors():
                 'confidence': 1.0
             }
 
-        # If not enough positions were derived, fallback to KMeans heuristic
+        # If not enough positions were derived, fallback to color clustering
         if len(color_profiles) < 3:
-            img_bgr = cv2.imread(session_data['cropped_image'])
-            if img_bgr is None:
-                return jsonify({'error': 'Failed to load cropped image'}), 500
-
-            img_hsv = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2HSV)
-            hsv_flat = img_hsv.reshape(-1, 3)
-            s_threshold = 40
-            v_threshold = 60
-            mask = (hsv_flat[:, 1] >= s_threshold) & (hsv_flat[:, 2] >= v_threshold)
-            filtered = hsv_flat[mask]
-            if filtered.shape[0] < 1000:
-                filtered = hsv_flat
-            kmeans = KMeans(n_clusters=6, n_init=10, random_state=42)
-            labels = kmeans.fit_predict(filtered)
-            centers = kmeans.cluster_centers_
-            counts = np.bincount(labels, minlength=6)
-            order = np.argsort(counts)[::-1]
+            if app.config['COLOR_FALLBACK'] == 'pixels':
+                img_bgr = cv2.imread(session_data['cropped_image'])
+                if img_bgr is None:
+                    return jsonify({'error': 'Failed to load cropped image'}), 500
+                centers, counts = cluster_image_colors(img_bgr, k=6)
+            else:
+                centers, counts = cluster_cell_colors(cell_hsvs, k=6)
+            order = np.argsort(counts, kind='stable')[::-1]
             pos_order = ['WR', 'RB', 'QB', 'TE', 'DST', 'K']
             for rank, cluster_idx in enumerate(order):
                 pos = pos_order[rank]
@@ -421,8 +449,11 @@ def process_board():
         return jsonify({'error': 'Missing cropped image or color profiles'}), 400
     
     try:
-        # Load player database
-        players = load_players("../data/top500_playernames.csv")
+        data = request.get_json(silent=True) or {}
+        confidence_threshold = float(data.get('confidenceThreshold', 45.0))
+
+        # Player database (cached index, reloaded only if the CSV changed)
+        players = get_player_db(app.config['PLAYERS_CSV']).get()
         
         # Create custom calibrator with user's color profiles
         calibrator = ManualColorCalibrator()
@@ -436,83 +467,180 @@ def process_board():
                 confidence=profile_data['confidence']
             )
         
-        # Preprocess the cropped image
-        rectified_image = normalize_board(session_data['cropped_image'], app.config['OUTPUT_FOLDER'])
-        
-        # Extract grid cells with custom dimensions
         team_count = session_data.get('team_count', 10)
         round_count = session_data.get('round_count', 16)
-        cells = cells_from_rectified(rectified_image, rows=round_count, cols=team_count, output_dir=app.config['OUTPUT_FOLDER'])
+        # Same crop and grid as the previous run: only colors and reconciliation can differ,
+        # so reuse its rectified board, cells and OCR table
+        ocr_key = board_ocr_key(session_data['cropped_image'], team_count, round_count)
+        staged = DEFAULT_OCR_MODE == 'staged'
+        adaptive = DEFAULT_OCR_MODE == 'adaptive'
+        if staged or adaptive:
+            # Which OCR these readers run depends on the color profiles and threshold
+            ocr_key += (json.dumps(session_data['color_profiles'], sort_keys=True), confidence_threshold)
+        previous_ocr = session_data.get('board_ocr')
+        reuse_ocr = previous_ocr is not None and previous_ocr['key'] == ocr_key and not data.get('forceOcr')
+
+        if reuse_ocr:
+            rectified_image, cells = previous_ocr['rectified_image'], previous_ocr['cells']
+        else:
+            # Preprocess the cropped image
+            rectified_image = normalize_board(session_data['cropped_image'], app.config['OUTPUT_FOLDER'])
+
+            # Extract grid cells with custom dimensions
+            cells = cells_from_rectified(rectified_image, rows=round_count, cols=team_count, output_dir=app.config['OUTPUT_FOLDER'])
         
         # Process all cells
         results = []
+        chosen_ocrs = []
         unrecognized_cells = []
         used_players = set()
         total_cells = len(cells)
         
         debug_ocr = []
 
+        # Phase 1: OCR every cell in parallel (independent per cell)
+        def report_progress(done, total):
+            progress = done / total * 100
+            print(f"OCR cell {done}/{total} ({progress:.1f}%)")
+            # Store progress in session for frontend to check
+            session_data['processing_progress'] = {
+                'current': done,
+                'total': total,
+                'percentage': progress
+            }
+
+        # Draft-likelihood components for this board format, shared across requests
+        draft_table = get_draft_table(team_count, round_count, len(players))
+
+        if reuse_ocr:
+            print(f"Reusing OCR of {len(cells)} cells from the previous run")
+            ocr_table = previous_ocr['ocr_table']
+            report_progress(len(cells), len(cells))
+        else:
+            # Blank cells are neither OCR'd nor matched
+            empty = detect_empty_cells(rectified_image, cells) if app.config['SKIP_EMPTY_CELLS'] else None
+            def classify(hsvs):
+                return [pos if conf > 0.3 else None for pos, conf in calibrator.detect_positions(hsvs)]
+            reader = adaptive_reader = None
+            if staged:
+                reader = StagedCellReader(players, draft_table=draft_table, confidence_threshold=confidence_threshold,
+                                          margin=app.config['OCR_ESCALATION_MARGIN'], classify=classify,
+                                          block=app.config['MATCH_BLOCKING'])
+            elif adaptive:
+                adaptive_reader = AdaptiveCellReader(players, draft_table=draft_table,
+                                                     confidence_threshold=confidence_threshold,
+                                                     margin=app.config['OCR_ESCALATION_MARGIN'],
+                                                     sample_size=app.config['OCR_ADAPTIVE_SAMPLE'], classify=classify,
+                                                     block=app.config['MATCH_BLOCKING'])
+            ocr_table = ocr_board_cells(
+                rectified_image, cells,
+                workers=app.config['OCR_WORKERS'], executor=app.config['OCR_EXECUTOR'],
+                progress=report_progress, empty=empty, staged=reader, adaptive=adaptive_reader,
+                # Offline recognizer over the player database's names (no Tesseract)
+                vocab=get_vocabulary_reader(players) if DEFAULT_OCR_MODE == 'vocab' else None
+            )
+            session_data['board_ocr'] = {
+                'key': ocr_key, 'rectified_image': rectified_image, 'cells': cells, 'ocr_table': ocr_table
+            }
+
+        # Phase 2: order-dependent reconciliation over the collected OCR results
         # Track which cell holds which player identity, and whether that assignment came from an exact last-name match
         assignments_by_identity = {}  # identity -> { 'cell_index': int, 'exact': bool }
         identity_by_cell = {}  # cell_index -> identity
 
+        # Classify all cell colors with one lookup-table pass
+        cell_colors = calibrator.detect_positions([bundle['hsv'] for bundle in ocr_table])
+
+        # OCR hypotheses per cell: ROI, whole-cell, and whole-cell with first/last swapped
+        hypotheses = []
         for i, (row, col, x, y, w, h) in enumerate(cells):
-            cell_img = rectified_image[y:y+h, x:x+w]
-            
-            # Run both OCR strategies and pick the better during reconciliation
-            ocr_result_roi = read_cell(cell_img)
-            from ocr_cell import read_cell_whole
-            ocr_result_whole = read_cell_whole(cell_img)
-            
-            # Override color detection with custom calibrator
-            # Get the dominant color HSV from the cell image
-            from ocr_cell import dominant_nonwhite_hsv
-            hsv = dominant_nonwhite_hsv(cell_img)
-            
             # Use custom calibrator to detect position from color (Original cell)
-            position, confidence = calibrator.detect_position_from_color(hsv)
+            position, confidence = cell_colors[i]
             color_pos = position if confidence > 0.3 else None
+
+            # Both OCR strategies were run in phase 1; pick the better during reconciliation
+            ocr_result_roi = dict(ocr_table[i]['roi'] or {})
+            # Staged and adaptive reads leave a strategy unset for cells settled without it
+            ocr_result_whole = dict(ocr_table[i]['whole'] or {})
             ocr_result_roi['color_pos'] = color_pos
             ocr_result_whole['color_pos'] = color_pos
-            
-            # Run reconciliation for both and choose the higher score
-            result_roi = reconcile_cell_with_position(
-                ocr_result_roi, row, col, used_players, players, confidence_threshold=45.0
-            )
-            # Whole-cell OCR: also try swapping first/last if that improves the score
-            result_whole = reconcile_cell_with_position(
-                ocr_result_whole, row, col, used_players, players, confidence_threshold=45.0
-            )
             swapped_whole = dict(ocr_result_whole)
             swapped_whole['ocr_first'], swapped_whole['ocr_last'] = (
                 ocr_result_whole.get('ocr_last', ''), ocr_result_whole.get('ocr_first', '')
             )
-            swapped_whole['color_pos'] = color_pos
-            result_whole_swapped = reconcile_cell_with_position(
-                swapped_whole, row, col, used_players, players, confidence_threshold=45.0
-            )
-            # If swapped yields higher match_score, use it as the whole result and update ocr_result_whole
-            if (result_whole_swapped and result_whole_swapped.get('match_score', 0) > (result_whole or {}).get('match_score', 0)):
-                result_whole = result_whole_swapped
-                ocr_result_whole = swapped_whole
-
-            # Pick better result (by match_score), prefer ROI on tie
-            if (result_whole and result_whole.get('match_score', 0) > (result_roi or {}).get('match_score', 0)):
-                result = result_whole
-                chosen_source = 'whole'
+            hypotheses.extend([(ocr_result_roi, row, col), (ocr_result_whole, row, col), (swapped_whole, row, col)])
+
+        # Score every hypothesis against every player once; per-cell matching becomes row lookups
+        score_matrix = ScoreMatrix(players, hypotheses, draft_table=draft_table,
+                                   previous=previous_ocr.get('score_matrix') if reuse_ocr else None,
+                                   block=app.config['MATCH_BLOCKING'])
+        session_data['board_ocr']['score_matrix'] = score_matrix
+        cell_rows = [range(3 * i, 3 * i + 3) for i in range(len(cells))]
+        assignment = None
+        if app.config['ASSIGNMENT'] == 'global':
+            assignment = solve_assignment(score_matrix, cell_rows, confidence_threshold=confidence_threshold)
+
+        for i, (row, col, x, y, w, h) in enumerate(cells):
+            cell_img = rectified_image[y:y+h, x:x+w]
+            
+            ocr_result_roi, ocr_result_whole, swapped_whole = (hyp[0] for hyp in hypotheses[3 * i:3 * i + 3])
+
+            if ocr_table[i].get('empty'):
+                # No sticker: nothing to read or match, and the cell must not take a player
+                result = empty_cell_result(row, col, teams=team_count)
+                debug_ocr.append({'row': row, 'col': col, 'chosen': 'empty', 'roi': {}, 'whole': {}, 'top3': []})
+                results.append(result)
+                chosen_ocrs.append(ocr_result_roi)
+                continue
+
+            if assignment is None:
+                roi_scores, whole_scores, swapped_scores = (score_matrix.row(r) for r in range(3 * i, 3 * i + 3))
+                # Run reconciliation for both and choose the higher score; each scan also yields
+                # the top-3 suggestions and exact last-name hits for its hypothesis
+                result_roi, scan_roi = reconcile_cell_scan(
+                    ocr_result_roi, row, col, used_players, players, confidence_threshold=confidence_threshold, scores=roi_scores,
+                    draft_table=draft_table
+                )
+                # Whole-cell OCR: also try swapping first/last if that improves the score
+                result_whole, scan_whole = reconcile_cell_scan(
+                    ocr_result_whole, row, col, used_players, players, confidence_threshold=confidence_threshold, scores=whole_scores,
+                    draft_table=draft_table
+                )
+                result_whole_swapped, scan_swapped = reconcile_cell_scan(
+                    swapped_whole, row, col, used_players, players, confidence_threshold=confidence_threshold, scores=swapped_scores,
+                    draft_table=draft_table
+                )
+                # If swapped yields higher match_score, use it as the whole result and update ocr_result_whole
+                if (result_whole_swapped and result_whole_swapped.get('match_score', 0) > (result_whole or {}).get('match_score', 0)):
+                    result_whole = result_whole_swapped
+                    ocr_result_whole = swapped_whole
+                    scan_whole = scan_swapped
+
+                # Pick better result (by match_score), prefer ROI on tie
+                if (result_whole and result_whole.get('match_score', 0) > (result_roi or {}).get('match_score', 0)):
+                    result = result_whole
+                    chosen_source = 'whole'
+                else:
+                    result = result_roi
+                    chosen_source = 'roi'
             else:
-                result = result_roi
-                chosen_source = 'roi'
+                # The global solve already chose this cell's hypothesis and player: no greedy
+                # scans, only the chosen hypothesis' top-3 suggestions are looked up
+                hyp, result = assignment.hypotheses[i], assignment.results[i]
+                r = 3 * i + hyp
+                top = score_matrix.scan(r, used_players, 0, 3)[1] if hypotheses[r][0].get('ocr_last') else []
+                scan_roi = scan_whole = CandidateScan(None, top, [])
+                if hyp == 0:
+                    result_roi, result_whole, chosen_source = result, None, 'roi'
+                else:
+                    result_roi, result_whole, chosen_source = None, result, 'whole'
+                    ocr_result_whole = hypotheses[r][0]
 
             # Collect debug comparison info for this cell
             # Include top-3 candidate suggestions (filtered by used players and color)
             try:
-                chosen_ocr = (ocr_result_whole if result is result_whole else ocr_result_roi)
-                top3 = top_n_matches_with_position(
-                    chosen_ocr.get('ocr_last') or '',
-                    row, col, used_players, players, color_pos,
-                    ocr_results=chosen_ocr, include_used=True, n=3
-                )
+                chosen_scan = (scan_whole if result is result_whole else scan_roi)
+                top3 = chosen_scan.top
                 top3_list = [
                     {
                         'name': cand_player.full,
@@ -530,20 +658,15 @@ def process_board():
             # Exact last-name override and reassignment logic
             try:
                 chosen_ocr = (ocr_result_whole if result is result_whole else ocr_result_roi)
-                ocr_last_norm = normalize_name(chosen_ocr.get('ocr_last', '') or '')
+                chosen_scan = (scan_whole if result is result_whole else scan_roi)
                 exact_candidates = []
-                if ocr_last_norm:
-                    exact_pool = top_n_matches_with_position(
-                        chosen_ocr.get('ocr_last') or '',
-                        row, col, used_players, players, color_pos,
-                        ocr_results=chosen_ocr, include_used=True, n=5
-                    )
-                    for (cand_score, cand_player, cand_rank, bd) in exact_pool:
-                        if normalize_name(cand_player.last) == ocr_last_norm:
-                            exact_candidates.append((cand_score, cand_player, cand_rank, bd))
+                # Exact-name locks are already hard constraints of the global solve
+                if assignment is None:
+                    # Exact last-name hits among the top 5 (including used players)
+                    exact_candidates = list(chosen_scan.exact)
 
                 def build_result_for(player_obj, score_val, rank_val, breakdown_dict):
-                    expected_pick_local = grid_to_draft_pick(row, col)
+                    expected_pick_local = grid_to_draft_pick(row, col, cols=team_count)
                     return {
                         'row': row,
                         'col': col,
@@ -601,40 +724,32 @@ def process_board():
                         identity_by_cell[i] = cand_id
                         assignments_by_identity[cand_id] = {'cell_index': i, 'exact': True}
 
-                        # Recompute displaced cell j without the taken player (exclude even if not hard-locked)
+                        # Recompute displaced cell j without the taken player (exclude even if not hard-locked);
+                        # its OCR hypotheses and score rows come from this run's tables, nothing is re-read
                         try:
                             (prev_row, prev_col, px, py, pw, ph) = cells[prev_idx]
-                            prev_img = rectified_image[py:py+ph, px:px+pw]
-
-                            prev_roi = read_cell(prev_img)
-                            prev_whole = read_cell_whole(prev_img)
-
-                            # Re-detect color position consistently
-                            prev_hsv = dominant_nonwhite_hsv(prev_img)
-                            prev_pos, prev_conf = calibrator.detect_position_from_color(prev_hsv)
-                            prev_color_pos = prev_pos if prev_conf > 0.3 else None
-                            prev_roi['color_pos'] = prev_color_pos
-                            prev_whole['color_pos'] = prev_color_pos
+                            prev_roi, prev_whole, prev_swapped = (hyp[0] for hyp in hypotheses[3 * prev_idx:3 * prev_idx + 3])
+                            prev_roi_scores, prev_whole_scores, prev_swapped_scores = (
+                                score_matrix.row(r) for r in range(3 * prev_idx, 3 * prev_idx + 3)
+                            )
 
                             # Build a temporary used set that includes the taken identity
                             prev_used = set(used_players)
                             prev_used.add(cand_id)
 
                             prev_result_roi = reconcile_cell_with_position(
-                                prev_roi, prev_row, prev_col, prev_used, players, confidence_threshold=45.0
+                                prev_roi, prev_row, prev_col, prev_used, players, confidence_threshold=confidence_threshold,
+                                scores=prev_roi_scores, draft_table=draft_table
                             )
                             prev_result_whole = reconcile_cell_with_position(
-                                prev_whole, prev_row, prev_col, prev_used, players, confidence_threshold=45.0
+                                prev_whole, prev_row, prev_col, prev_used, players, confidence_threshold=confidence_threshold,
+                                scores=prev_whole_scores, draft_table=draft_table
                             )
 
-                            # Try swapped whole as before
-                            prev_swapped = dict(prev_whole)
-                            prev_swapped['ocr_first'], prev_swapped['ocr_last'] = (
-                                prev_whole.get('ocr_last', ''), prev_whole.get('ocr_first', '')
-                            )
-                            prev_swapped['color_pos'] = prev_color_pos
+                            # Try swapped whole, with the same used set (the taken player excluded) as the others
                             prev_result_whole_swapped = reconcile_cell_with_position(
-                                prev_swapped, prev_row, prev_col, used_players, players, confidence_threshold=45.0
+                                prev_swapped, prev_row, prev_col, prev_used, players, confidence_threshold=confidence_threshold,
+                                scores=prev_swapped_scores, draft_table=draft_table
                             )
                             if (prev_result_whole_swapped and prev_result_whole_swapped.get('match_score', 0) > (prev_result_whole or {}).get('match_score', 0)):
                                 prev_result_whole = prev_result_whole_swapped
@@ -649,6 +764,7 @@ def process_board():
                                 prev_chosen_ocr = prev_roi
 
                             results[prev_idx] = new_prev_result
+                            chosen_ocrs[prev_idx] = prev_chosen_ocr
 
                             # Update assignment mapping for previous cell based on its new result
                             if new_prev_result and new_prev_result.get('use_match'):
@@ -733,54 +849,16 @@ def process_board():
                     )
                     used_players.add(used_id)
 
+            # Use the OCR result source that produced the chosen result for display
+            chosen_ocr = ocr_result_whole if result is result_whole else ocr_result_roi
             # Check if this cell needs manual correction (low confidence or no match)
-            if not result or not result.get('use_match', False) or result.get('match_score', 0) < 45.0:
-                # Save cell image for manual correction
-                cell_filename = f'cell_r{row}_c{col}.png'
-                cell_path = os.path.join(app.config['OUTPUT_FOLDER'], 'results', 'cells', cell_filename)
-                os.makedirs(os.path.dirname(cell_path), exist_ok=True)
-
-                # Save the image
-                cv2.imwrite(cell_path, cell_img)
-
-                # Add to unrecognized cells list
-                suggested_player = None
-                if result and result.get('best_candidate'):
-                    cand = result['best_candidate']
-                    suggested_player = {
-                        'name': cand.get('full_name', ''),
-                        'position': cand.get('pos', ''),
-                        'team': cand.get('team', ''),
-                        'confidence': result.get('best_candidate_confidence', 0),
-                        'is_db': True
-                    }
-
-                # Use the OCR result source that produced the chosen result for display
-                chosen_ocr = ocr_result_whole if result is result_whole else ocr_result_roi
-
-                unrecognized_cells.append({
-                    'index': i,
-                    'row': row,
-                    'col': col,
-                    'cell_image': f'/cell_image/{cell_filename}',
-                    'ocr_text': f"{chosen_ocr.get('ocr_first', '')} {chosen_ocr.get('ocr_last', '')}".strip(),
-                    'detected_position': chosen_ocr.get('color_pos'),
-                    'confidence': result.get('match_score', 0) if result else 0,
-                    'suggested_player': suggested_player
-                })
+            if needs_manual_correction(result, confidence_threshold):
+                unrecognized_cells.append(unrecognized_cell_entry(i, row, col, result, chosen_ocr, cell_img))
 
             results.append(result)
-            
-            # Log progress
-            progress = (i + 1) / total_cells * 100
-            print(f"Processing cell {i+1}/{total_cells} ({progress:.1f}%)")
-            
-            # Store progress in session for frontend to check
-            session_data['processing_progress'] = {
-                'current': i + 1,
-                'total': total_cells,
-                'percentage': progress
-            }
+            chosen_ocrs.append(chosen_ocr)
+        
+        print(f"Reconciled {total_cells} cells")
         
         # Generate outputs
         output_dir = os.path.join(app.config['OUTPUT_FOLDER'], 'results')
@@ -828,7 +906,7 @@ def process_board():
         processed_results = []
         team_count = session_data.get('team_count', 10)
         for i, result in enumerate(results):
-            if result and 'last' in result:
+            if result and 'last' in result and not result.get('empty'):
                 row_val = result.get('row', 0)
                 col_val = result.get('col', 0)
                 pick_num = grid_to_draft_pick(row_val, col_val, cols=team_count)
@@ -854,6 +932,8 @@ def process_board():
             } for (r, c, x, y, w, h) in cells
         ]
         session_data['debug_ocr'] = debug_ocr
+        # Hypotheses and score rows for incremental re-reconciliation after manual corrections
+        session_data['board_state'] = BoardState(score_matrix, cell_rows, results, chosen_ocrs, confidence_threshold=confidence_threshold)
         session_data['overlay_ready'] = overlay_ready
         # Save rectified path for later overlay regeneration
         session_data['rectified_path'] = os.path.join(app.config['OUTPUT_FOLDER'], 'rectified.png')
@@ -865,10 +945,14 @@ def process_board():
             'total_cells': len(cells),
             'successful_matches': len(processed_results),
             'unrecognized_count': len(unrecognized_cells),
+            'empty_count': sum(1 for r in results if r and r.get('empty')),
+            'ocr_tiers': tier_counts(ocr_table) if staged else None,
+            'ocr_strategy': strategy_stats(ocr_table) if adaptive else None,
             'success_rate': f"{len(processed_results)/len(cells)*100:.1f}%",
             'colorProfiles': session_data.get('color_profiles', {}),
             'debug_ocr': debug_ocr,
-            'cell_rois': session_data['cell_rois']
+            'cell_rois': session_data['cell_rois'],
+            'ocr_cache': ocr_engine.cache_stats()
         })
         
     except Exception as e:
@@ -982,7 +1066,7 @@ def debug_cell_image(row: int, col: int, mode: str):
 def get_player_names():
     """Get list of all player names for type-ahead filtering"""
     try:
-        players = load_players("../data/top500_playernames.csv")
+        players = get_player_db(app.config['PLAYERS_CSV']).get()
         player_names = [f"{player.first} {player.last}".strip() for player in players]
         return jsonify({
             'success': True,
@@ -1006,13 +1090,8 @@ def update_manual_correction():
             return jsonify({'error': 'Missing cell_index or player_name'}), 400
 
         # Find the player in the database
-        players = load_players("../data/top500_playernames.csv")
-        selected_player = None
-        for player in players:
-            full_name = f"{player.first} {player.last}".strip()
-            if full_name.lower() == player_name.lower():
-                selected_player = player
-                break
+        players = get_player_db(app.config['PLAYERS_CSV']).get()
+        selected_player = players.find_by_name(player_name)
 
         if not selected_player:
             return jsonify({'error': 'Player not found in database'}), 400
@@ -1047,11 +1126,19 @@ def update_manual_correction():
                 'raw_ocr': session_data.get('debug_ocr', [{}])[cell_index] if cell_index < len(session_data.get('debug_ocr', [])) else {}
             }
 
+            # Re-reconcile only the cells that competed for the corrected or freed player
+            updated_cells = []
+            board_state = session_data.get('board_state')
+            if board_state is not None and len(board_state.results) == len(full_results):
+                updated_cells = board_state.correct(cell_index, full_results[cell_index])
+                for j in updated_cells:
+                    full_results[j] = board_state.results[j]
+
             # Rebuild processed_results for table view from full_results
             processed_results = []
             team_count = session_data.get('team_count', 10)
             for r in full_results:
-                if r and 'last' in r:
+                if r and 'last' in r and not r.get('empty'):
                     pick_num = grid_to_draft_pick(r.get('row', 0), r.get('col', 0), cols=team_count)
                     processed_results.append({
                         'pick': pick_num,
@@ -1068,11 +1155,29 @@ def update_manual_correction():
             session_data['full_results'] = full_results
             session_data['results'] = processed_results
 
-            # Remove from unrecognized cells if it exists
+            # Remove from unrecognized cells if it exists; re-reconciled cells join or leave the queue
             unrecognized_cells = session_data.get('unrecognized_cells', [])
             session_data['unrecognized_cells'] = [
-                cell for cell in unrecognized_cells if cell['index'] != cell_index
+                cell for cell in unrecognized_cells if cell['index'] != cell_index and cell['index'] not in updated_cells
             ]
+            if updated_cells:
+                queued = {cell['index'] for cell in unrecognized_cells}
+                rectified_image = None
+                for j in updated_cells:
+                    if needs_manual_correction(full_results[j], board_state.confidence_threshold):
+                        roi = rois[j]
+                        cell_img = None
+                        if j not in queued:
+                            # Newly unmatched: its cell image was never saved
+                            rectified_path = session_data.get('rectified_path')
+                            if rectified_image is None and rectified_path and os.path.exists(rectified_path):
+                                rectified_image = cv2.imread(rectified_path)
+                            if rectified_image is not None:
+                                cell_img = rectified_image[roi['y']:roi['y'] + roi['h'], roi['x']:roi['x'] + roi['w']]
+                        session_data['unrecognized_cells'].append(unrecognized_cell_entry(
+                            j, roi['row'], roi['col'], full_results[j], board_state.chosen_ocr[j], cell_img
+                        ))
+                session_data['unrecognized_cells'].sort(key=lambda cell: cell['index'])
 
             # If no more unrecognized cells remain, regenerate overlay now
             if not session_data['unrecognized_cells']:
@@ -1106,6 +1211,8 @@ def update_manual_correction():
             return jsonify({
                 'success': True,
                 'message': f'Updated cell {cell_index + 1} with {selected_player.full}',
+                'updated_cells': updated_cells,
+                'unrecognized_cells': session_data['unrecognized_cells'],
                 'overlay_ready': session_data.get('overlay_ready', False)
             })
         else:
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the board pipeline hot spots.
+
+Usage:
+    python benchmark.py colors [--image PATH] [--megapixels 12]
+    python benchmark.py lookup [--sizes 500 2000 10000] [--queries 300]
+    python benchmark.py vocab [--cells 150]
+"""
+
+import sys
+import os
+import argparse
+import contextlib
+import io
+import random
+import time
+import tracemalloc
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import cv2
+import numpy as np
+
+
+def measure(label, fn, *args, **kwargs):
+    """Run fn once, printing wall time and peak traced memory."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:28s} {elapsed:8.3f}s  peak {peak / 2**20:8.1f} MiB")
+    return result
+
+
+def synthetic_board(megapixels: float, rows: int = 16, cols: int = 10, seed: int = 0) -> np.ndarray:
+    """White board with colored, noisy cells in six position hues."""
+    rng = np.random.default_rng(seed)
+    height = int(np.sqrt(megapixels * 1e6 * 3 / 4))
+    width = int(height * 4 / 3)
+    board = np.full((height, width, 3), 255, dtype=np.uint8)
+    palette = [(0, 140, 255), (40, 70, 120), (200, 120, 40), (60, 60, 220), (150, 150, 150), (60, 160, 60)]
+    cell_h, cell_w = height // rows, width // cols
+    for r in range(rows):
+        for c in range(cols):
+            color = np.array(palette[rng.integers(len(palette))], dtype=np.int16)
+            y, x = r * cell_h, c * cell_w
+            noise = rng.integers(-12, 13, (cell_h - 8, cell_w - 8, 3), dtype=np.int16)
+            board[y + 4:y + cell_h - 4, x + 4:x + cell_w - 4] = np.clip(color + noise, 0, 255)
+    return board
+
+
+def bench_colors(args):
+    from color_clustering import cluster_image_colors, cluster_cell_colors
+    from ocr_cell import dominant_hsv_for_cells
+
+    if args.image:
+        img_bgr = cv2.imread(args.image)
+        if img_bgr is None:
+            sys.exit(f"Could not load {args.image}")
+    else:
+        img_bgr = synthetic_board(args.megapixels)
+    height, width = img_bgr.shape[:2]
+    print(f"Auto color fallback on {width}x{height} ({width * height / 1e6:.1f} MP)")
+
+    def sklearn_full_image():
+        from sklearn.cluster import KMeans
+        hsv_flat = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2HSV).reshape(-1, 3)
+        mask = (hsv_flat[:, 1] >= 40) & (hsv_flat[:, 2] >= 60)
+        filtered = hsv_flat[mask]
+        if filtered.shape[0] < 1000:
+            filtered = hsv_flat
+        kmeans = KMeans(n_clusters=6, n_init=10, random_state=42)
+        labels = kmeans.fit_predict(filtered)
+        return kmeans.cluster_centers_, np.bincount(labels, minlength=6)
+
+    rows, cols = 16, 10
+    cell_h, cell_w = height // rows, width // cols
+    cells = [(r, c, c * cell_w, r * cell_h, cell_w, cell_h) for r in range(rows) for c in range(cols)]
+    cell_hsvs = dominant_hsv_for_cells(img_bgr, cells)
+
+    results = {}
+    if not args.skip_sklearn:
+        try:
+            results['sklearn KMeans (full image)'] = measure('sklearn KMeans (full image)', sklearn_full_image)
+        except ImportError:
+            print("  sklearn not installed; skipping baseline")
+    results['histogram k-means'] = measure('histogram k-means', cluster_image_colors, img_bgr, k=6)
+    results['cell dominant k-means'] = measure('cell dominant k-means', cluster_cell_colors, cell_hsvs, k=6)
+
+    for label, (centers, counts) in results.items():
+        order = np.argsort(counts, kind='stable')[::-1]
+        summary = ', '.join(f"({h:.0f},{s:.0f},{v:.0f})" for h, s, v in centers[order])
+        print(f"  {label}: {summary}")
+
+
+def synthetic_players(base, size: int, seed: int = 0):
+    """base players followed by generated ones (syllable last names) up to size."""
+    from reconcile import Player
+    rng = random.Random(seed)
+    syllables = ['BAR', 'KO', 'LIN', 'SON', 'MA', 'TER', 'DE', 'VON', 'RICH', 'ARDS', 'WIL', 'LI',
+                 'AMS', 'JO', 'NES', 'CAR', 'MC', 'KAY', 'HOL', 'STEIN', 'ER', 'O', 'GAN', 'TON']
+    players = list(base)[:size]
+    while len(players) < size:
+        template = base[rng.randrange(len(base))]
+        last = ''.join(rng.choice(syllables) for _ in range(rng.randint(2, 3))).title()
+        players.append(Player(template.first, last, template.team, template.pos, template.bye, False))
+    return players
+
+
+def garble(text: str, rng: random.Random) -> str:
+    """Up to two OCR-style character substitutions/deletions."""
+    chars = list(text.upper())
+    for _ in range(rng.randint(0, 2)):
+        if len(chars) < 3:
+            break
+        k = rng.randrange(len(chars))
+        if rng.random() < 0.5:
+            chars[k] = rng.choice('ILO1E')
+        else:
+            del chars[k]
+    return ''.join(chars)
+
+
+def bench_lookup(args):
+    from reconcile import PlayerIndex, load_players, best_match_with_position, player_identity
+
+    base = list(load_players(args.csv))
+    rng = random.Random(1)
+    queries = []
+    for _ in range(args.queries):
+        p = base[rng.randrange(min(300, len(base)))]
+        ocr = {'ocr_last': garble(p.last, rng), 'ocr_first': garble(p.first, rng),
+               'ocr_team': p.team if rng.random() < 0.6 else '', 'ocr_bye': p.bye, 'color_pos': p.pos}
+        queries.append((ocr, rng.randrange(16), rng.randrange(10), player_identity(p)))
+
+    print(f"best_match_with_position over {args.queries} garbled queries (per-query latency)")
+    print(f"  {'players':>8s} {'index build':>12s} {'full scan':>10s} {'prune':>10s} {'block':>10s} "
+          f"{'block size':>10s} {'block = full':>12s}")
+    for size in args.sizes:
+        start = time.perf_counter()
+        index = PlayerIndex(synthetic_players(base, size))
+        build = time.perf_counter() - start
+
+        def run(**kwargs):
+            best = []
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                for ocr, row, col, _ in queries:
+                    best.append(best_match_with_position(ocr['ocr_last'], row, col, set(), index,
+                                                         ocr['color_pos'], ocr, **kwargs)[1])
+                elapsed = time.perf_counter() - start
+            return elapsed / len(queries), best
+
+        full_t, full = run()
+        prune_t, _ = run(prune=True)
+        block_t, blocked = run(block=True)
+        block_size = sum(len(index.block(ocr['ocr_last'], ocr['color_pos'])) for ocr, *_ in queries) / len(queries)
+        agree = sum(a == b for a, b in zip(full, blocked)) / len(queries)
+        print(f"  {size:8d} {build:11.2f}s {full_t * 1e3:8.2f}ms {prune_t * 1e3:8.2f}ms {block_t * 1e3:8.2f}ms "
+              f"{block_size:10.1f} {agree:11.1%}")
+
+
+def synthetic_sticker(player, font: int, rng: np.random.Generator, size=(200, 100)) -> np.ndarray:
+    """Blurred, noisy white-on-blue draft sticker laid out like the ROI boxes."""
+    width, height = size
+    img = np.full((height, width, 3), (200, 120, 40), dtype=np.uint8)
+
+    def put(text, x, y, scale, thickness):
+        cv2.putText(img, text, (int(x), int(y)), font, scale, (255, 255, 255), thickness, cv2.LINE_AA)
+
+    put(player.pos, 0.03 * width, 0.22 * height, 0.6, 1)
+    put(f"BYE {player.bye}", 0.65 * width, 0.22 * height, 0.5, 1)
+    last = player.last.upper()
+    (w, _), _ = cv2.getTextSize(last, font, 1.0, 2)
+    scale = min(1.0, 0.75 * width / w)
+    put(last, (width - w * scale) / 2, 0.62 * height, scale, 2)
+    put(player.team, 0.03 * width, 0.92 * height, 0.6, 1)
+    put(player.first.upper(), 0.65 * width, 0.92 * height, 0.4, 1)
+    img = cv2.GaussianBlur(img, (3, 3), 0).astype(np.int16)
+    return np.clip(img + rng.integers(-15, 16, img.shape), 0, 255).astype(np.uint8)
+
+
+def bench_vocab(args):
+    from reconcile import load_players, normalize_name
+    from vocab_ocr import ClosedVocabularyReader
+    from ocr_cell import read_cell
+
+    index = load_players(args.csv)
+    start = time.perf_counter()
+    reader = ClosedVocabularyReader(index)
+    print(f"ClosedVocabularyReader build ({len(index)} players): {time.perf_counter() - start:.2f}s")
+
+    # Sticker fonts include two the vocabulary is not rendered in
+    fonts = {'simplex': cv2.FONT_HERSHEY_SIMPLEX, 'complex': cv2.FONT_HERSHEY_COMPLEX,
+             'plain': cv2.FONT_HERSHEY_PLAIN}
+    rng = random.Random(2)
+    noise = np.random.default_rng(2)
+    cells = []
+    for name, font in fonts.items():
+        for _ in range(args.cells):
+            player = index[rng.randrange(min(300, len(index)))]
+            cells.append((name, player, synthetic_sticker(player, font, noise)))
+
+    def run(read):
+        hits = {name: [0, 0] for name in fonts}
+        start = time.perf_counter()
+        for name, player, img in cells:
+            result = read(img)
+            hits[name][0] += normalize_name(result.get('ocr_last', '')) == normalize_name(player.last)
+            hits[name][1] += normalize_name(player.last) in result.get('vocab_candidates', [normalize_name(result.get('ocr_last', ''))])
+        return hits, len(cells) / (time.perf_counter() - start)
+
+    print(f"Last-name accuracy over {args.cells} synthetic stickers per font")
+    print(f"  {'reader':12s} " + ' '.join(f"{name + ' top1/top5':>20s}" for name in fonts) + f" {'cells/s':>9s}")
+    for label, read in (('vocab', reader.read), ('read_cell', read_cell)):
+        try:
+            hits, rate = run(read)
+        except Exception as e:
+            print(f"  {label:12s} skipped ({type(e).__name__}: {e})")
+            continue
+        print(f"  {label:12s} " + ' '.join(f"{h[0] / args.cells:9.1%} / {h[1] / args.cells:6.1%}   "
+                                         for h in hits.values()) + f" {rate:9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest='bench', required=True)
+
+    colors = sub.add_parser('colors', help='auto color detection fallback clustering')
+    colors.add_argument('--image', help='Cropped board image (default: synthetic board)')
+    colors.add_argument('--megapixels', type=float, default=12.0, help='Synthetic board size')
+    colors.add_argument('--skip-sklearn', action='store_true', help='Skip the full-image sklearn baseline')
+    colors.set_defaults(run=bench_colors)
+
+    lookup = sub.add_parser('lookup', help='player matching latency versus database size')
+    lookup.add_argument('--csv', default=os.path.join(os.path.dirname(__file__), '..', 'data', 'top500_playernames.csv'),
+                        help='Player CSV used as the head of each synthetic database')
+    lookup.add_argument('--sizes', type=int, nargs='+', default=[500, 2000, 10000], help='Database sizes')
+    lookup.add_argument('--queries', type=int, default=300, help='Garbled OCR queries per size')
+    lookup.set_defaults(run=bench_lookup)
+
+    vocab = sub.add_parser('vocab', help='closed-vocabulary recognizer versus read_cell')
+    vocab.add_argument('--csv', default=os.path.join(os.path.dirname(__file__), '..', 'data', 'top500_playernames.csv'),
+                       help='Player database the vocabulary is built from')
+    vocab.add_argument('--cells', type=int, default=150, help='Synthetic stickers per font')
+    vocab.set_defaults(run=bench_vocab)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,9 +8,10 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from preprocess import normalize_board
-from grid import cells_from_rectified
-from ocr_cell import read_cell
-from reconcile import load_players, reconcile_cell_with_position
+from grid import cells_from_rectified, detect_empty_cells
+from pipeline import ocr_board_cells
+from reconcile import load_players, reconcile_cell_with_position, empty_cell_result
+from score_matrix import ScoreMatrix
 from emit import emit_all_outputs
 
 def run_full_board():
@@ -31,21 +32,33 @@ def run_full_board():
     print("\n3. Extracting grid cells...")
     cells = cells_from_rectified(rectified_image, output_dir="../outputs/full_board_out")
     print(f"Extracted {len(cells)} cells")
+    empty = detect_empty_cells(rectified_image, cells)
+    print(f"Empty cells (skipped): {sum(empty)}")
     
-    # Step 4: Process all cells with color filtering
-    print("\n4. Processing cells with color-filtered matching...")
+    # Step 4: OCR all cells in parallel (ROI strategy with color detection)
+    print("\n4. Running OCR on all cells...")
+    def report_progress(done, total):
+        if done % 20 == 0 or done == total:
+            print(f"  OCR {done}/{total} cells")
+    ocr_table = ocr_board_cells(rectified_image, cells, whole=False, progress=report_progress, empty=empty)
+    
+    # Step 5: Reconcile cells in draft order with color filtering
+    print("\n5. Reconciling cells with color-filtered matching...")
     results = []
     used_players = set()
+    # Score all cells against all players at once; each cell is then a row lookup
+    score_matrix = ScoreMatrix(players, [(ocr_table[i]['roi'], row, col) for i, (row, col, *_) in enumerate(cells)])
     
     for i, (row, col, x, y, w, h) in enumerate(cells):
-        cell_img = rectified_image[y:y+h, x:x+w]
-        
-        # Run OCR with color detection
-        ocr_result = read_cell(cell_img)
+        ocr_result = ocr_table[i]['roi']
+        if empty[i]:
+            results.append(empty_cell_result(row, col))
+            continue
         
         # Run reconciliation with color filtering
         result = reconcile_cell_with_position(
-            ocr_result, row, col, used_players, players, confidence_threshold=40.0
+            ocr_result, row, col, used_players, players, confidence_threshold=40.0,
+            scores=score_matrix.row(i)
         )
         
         if result and result.get('use_match'):
@@ -67,15 +80,15 @@ def run_full_board():
         if i % 20 == 0:
             print(f"  Processed {i+1}/{len(cells)} cells")
     
-    # Step 5: Generate all outputs
-    print("\n5. Generating outputs...")
+    # Step 6: Generate all outputs
+    print("\n6. Generating outputs...")
     emit_all_outputs(results, rectified_image, cells, "../outputs/full_board_out")
     
-    # Step 6: Analyze results
-    print("\n6. Final Results Analysis:")
+    # Step 7: Analyze results
+    print("\n7. Final Results Analysis:")
     print("-" * 40)
     
-    successful_matches = sum(1 for r in results if r and 'last' in r)
+    successful_matches = sum(1 for r in results if r and 'last' in r and not r.get('empty'))
     low_confidence = sum(1 for r in results if r and r.get('confidence', 0) < 70.0)
     errors = sum(1 for r in results if not r or 'error' in r)
     
@@ -86,10 +99,10 @@ def run_full_board():
     print(f"Success rate: {successful_matches/len(cells)*100:.1f}%")
     
     # Position distribution
-    print(f"\n7. Position Distribution:")
+    print(f"\n8. Position Distribution:")
     position_counts = {}
     for result in results:
-        if result and 'pos' in result:
+        if result and 'pos' in result and not result.get('empty'):
             pos = result['pos']
             position_counts[pos] = position_counts.get(pos, 0) + 1
     
@@ -97,10 +110,10 @@ def run_full_board():
         print(f"  {pos}: {count} players")
     
     # Show top matches
-    print(f"\n8. Top Draft Picks:")
+    print(f"\n9. Top Draft Picks:")
     top_picks = []
     for i, result in enumerate(results):
-        if result and 'last' in result:
+        if result and 'last' in result and not result.get('empty'):
             pick_num = i + 1
             player_name = result.get('full_name', 'Unknown')
             position = result.get('pos', 'Unknown')
@@ -0,0 +1,128 @@
+import numpy as np
+from dataclasses import dataclass
+from scipy.optimize import linear_sum_assignment
+from typing import List, Optional, Sequence
+from reconcile import normalize_name, build_reconcile_result
+from score_matrix import ScoreMatrix
+
+# Cost of a forbidden (below-threshold or out-of-pool) cell/player pair
+FORBIDDEN = 1e9
+
+
+@dataclass
+class BoardAssignment:
+    """Globally optimal cell -> player assignment (one entry per cell)."""
+    hypotheses: List[int]          # chosen hypothesis, as a position in the cell's hypothesis rows
+    players: List[Optional[int]]   # assigned player index, None if the cell keeps its OCR values
+    locked: List[bool]             # assignment came from an exact last-name lock
+    results: List[dict]            # reconciled result dicts, as reconcile_cell_with_position builds them
+
+
+def _exact_lock(matrix: ScoreMatrix, rows: Sequence[int], top_n: int):
+    """Best (score, row position, player) whose normalized last name equals the OCR'd one."""
+    best = None
+    for h, r in enumerate(rows):
+        last = normalize_name((matrix.hypotheses[r][0] or {}).get('ocr_last', '') or '')
+        if not last:
+            continue
+        for score, player, rank, _ in matrix.ranked(r, set(), include_used=True, n=top_n):
+            if matrix.index.norm_last[rank - 1] == last and (best is None or score > best[0]):
+                best = (score, h, rank - 1)
+    return best
+
+
+def solve_assignment(matrix: ScoreMatrix, cell_rows: Sequence[Sequence[int]],
+                     confidence_threshold: float = 45.0, exact_locks: bool = True,
+                     exact_top_n: int = 5) -> BoardAssignment:
+    """
+    Assign players to cells by one Hungarian solve over the score matrix instead of
+    the order-dependent greedy pass with exact-name steals.
+
+    Each cell scores a player with its best hypothesis (ROI preferred on ties).
+    Exact last-name matches among a hypothesis' top exact_top_n candidates are hard
+    locks (the higher-scoring cell wins a contested player). The remaining cells are
+    solved with linear_sum_assignment maximizing the total score above
+    confidence_threshold; one dummy column per cell stands for "keep the OCR values",
+    so every player is used at most once and no cell is forced below the threshold.
+
+    Args:
+        matrix: ScoreMatrix over all hypotheses
+        cell_rows: For each cell, its hypothesis rows in matrix (e.g. ROI, whole, swapped)
+        confidence_threshold: Minimum score for a (non-locked) match
+        exact_locks: Lock exact last-name matches before solving
+        exact_top_n: Candidates per hypothesis searched for exact matches
+
+    Returns:
+        BoardAssignment aligned with cell_rows
+    """
+    n_cells, n_players = len(cell_rows), len(matrix.index)
+    # best[c, p]: best hypothesis score of cell c for player p (-inf outside its pools)
+    best = np.full((n_cells, n_players), -np.inf)
+    best_hyp = np.zeros((n_cells, n_players), dtype=np.int64)
+    for c, rows in enumerate(cell_rows):
+        for h, r in enumerate(rows):
+            scores = np.where(matrix.candidate_mask(r), matrix.total[r], -np.inf)
+            better = scores > best[c]
+            best[c][better] = scores[better]
+            best_hyp[c][better] = h
+
+    assigned: List[Optional[int]] = [None] * n_cells
+    locked = [False] * n_cells
+    if exact_locks:
+        claims = []
+        for c, rows in enumerate(cell_rows):
+            lock = _exact_lock(matrix, rows, exact_top_n)
+            if lock is not None:
+                claims.append((-lock[0], c, lock[2], lock[1]))
+        taken = set()
+        for _, c, p, h in sorted(claims):
+            if p not in taken:
+                taken.add(p)
+                assigned[c], locked[c] = p, True
+                best_hyp[c, p] = h
+
+    free_cells = [c for c in range(n_cells) if assigned[c] is None]
+    free_players = np.setdiff1d(np.arange(n_players), [p for p in assigned if p is not None])
+    if free_cells and len(free_players):
+        sub = best[np.ix_(free_cells, free_players)]
+        # Gain over leaving the cell unmatched; a tiny bonus prefers matching at exactly the threshold
+        cost = np.where(sub >= confidence_threshold, -(sub - confidence_threshold) - 1e-9, FORBIDDEN)
+        cost = np.hstack([cost, np.zeros((len(free_cells), len(free_cells)))])
+        cell_idx, col_idx = linear_sum_assignment(cost)
+        for k, j in zip(cell_idx.tolist(), col_idx.tolist()):
+            if j < len(free_players) and cost[k, j] < FORBIDDEN:
+                assigned[free_cells[k]] = int(free_players[j])
+
+    taken_players = {p for p in assigned if p is not None}
+    hypotheses, results = [], []
+    for c, rows in enumerate(cell_rows):
+        p = assigned[c]
+        if p is not None:
+            h = int(best_hyp[c, p])
+            r = rows[h]
+            ocr_results, row, col = matrix.hypotheses[r]
+            score, player, rank, breakdown = matrix.candidate(r, p)
+            result = build_reconcile_result(ocr_results, row, col, score, player, rank, breakdown, True,
+                                            teams=matrix.teams)
+            if locked[c]:
+                result['override'] = 'exact_lastname'
+        else:
+            # Unmatched: keep the OCR values, suggest the best player nobody was assigned
+            scores = best[c].copy()
+            scores[list(taken_players)] = -np.inf
+            if np.isfinite(scores).any():
+                q = int(np.argmax(scores))
+                h = int(best_hyp[c, q])
+                r = rows[h]
+                score, player, rank, breakdown = matrix.candidate(r, q)
+            else:
+                h, r = 0, rows[0]
+                score, player, rank, breakdown = 0.0, matrix.index[0], 0, {}
+            ocr_results, row, col = matrix.hypotheses[r]
+            # Any free player at or above the threshold would have been assigned by the solver
+            result = build_reconcile_result(ocr_results, row, col, score, player, rank, breakdown, False,
+                                            teams=matrix.teams)
+        hypotheses.append(h)
+        results.append(result)
+
+    return BoardAssignment(hypotheses=hypotheses, players=assigned, locked=locked, results=results)
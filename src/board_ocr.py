@@ -0,0 +1,142 @@
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+import ocr_engine
+from ocr_cell import (neutral_otsu, cell_roi_boxes, build_roi_result, filter_whitelist,
+                      parse_whole_tokens, ROI_NAMES, ROI_WHITELISTS)
+
+# A recognized word relative to its cell: (x, y, w, h, text)
+Word = Tuple[int, int, int, int, str]
+
+
+def board_strips(cells: List[tuple], strip_rows: Optional[int] = None) -> List[List[int]]:
+    """
+    Group cell indices into horizontal strips of strip_rows grid rows
+    (None = the whole board as one strip).
+    """
+    rows = sorted({c[0] for c in cells})
+    per_strip = len(rows) if not strip_rows else max(1, strip_rows)
+    strips = []
+    for k in range(0, len(rows), per_strip):
+        strip_set = set(rows[k:k + per_strip])
+        strips.append([i for i, c in enumerate(cells) if c[0] in strip_set])
+    return strips
+
+
+def strip_words(rectified_image: np.ndarray, cells: List[tuple],
+                indices: Sequence[int]) -> Dict[int, List[Word]]:
+    """
+    OCR one strip of the board in a single image_to_data pass and assign each
+    recognized word to the cell containing its center.
+
+    Each cell is binarized on its own (same enhancer as read_cell) and pasted into
+    a strip-sized plane, so word boxes map straight back to board coordinates.
+
+    Returns:
+        Dictionary of cell index -> list of words relative to that cell
+    """
+    boxes = np.array([cells[i][2:] for i in indices], dtype=np.int64)  # x, y, w, h
+    y0 = int(boxes[:, 1].min())
+    y1 = int((boxes[:, 1] + boxes[:, 3]).max())
+    plane = np.full((y1 - y0, rectified_image.shape[1]), 255, np.uint8)
+    for (x, y, w, h) in boxes:
+        plane[y - y0:y - y0 + h, x:x + w] = neutral_otsu(rectified_image[y:y+h, x:x+w], invert=True)
+
+    # Sparse-text mode: the board is a grid of short, scattered labels
+    data = ocr_engine.image_to_data(plane, psm=11)
+
+    words: Dict[int, List[Word]] = {i: [] for i in indices}
+    for text, left, top, width, height in zip(data.get('text', []), data.get('left', []),
+                                              data.get('top', []), data.get('width', []),
+                                              data.get('height', [])):
+        if not text or not text.strip():
+            continue
+        cx = left + width / 2.0
+        cy = top + y0 + height / 2.0
+        inside = ((boxes[:, 0] <= cx) & (cx < boxes[:, 0] + boxes[:, 2]) &
+                  (boxes[:, 1] <= cy) & (cy < boxes[:, 1] + boxes[:, 3]))
+        if not inside.any():
+            continue
+        k = int(np.argmax(inside))
+        x, y = boxes[k, 0], boxes[k, 1]
+        words[indices[k]].append((int(left - x), int(top + y0 - y), int(width), int(height), text.strip()))
+    return words
+
+
+def assign_roi(word: Word, rois: Dict[str, Tuple[int, int, int, int]]) -> str:
+    """ROI containing the word center, or the nearest ROI when it falls in a gap."""
+    x, y, w, h, _ = word
+    cx, cy = x + w / 2.0, y + h / 2.0
+    best, best_dist = None, None
+    for name, (rx, ry, rw, rh) in rois.items():
+        dx = max(rx - cx, 0.0, cx - (rx + rw))
+        dy = max(ry - cy, 0.0, cy - (ry + rh))
+        dist = dx * dx + dy * dy
+        if best_dist is None or dist < best_dist:
+            best, best_dist = name, dist
+    return best
+
+
+def reading_order(words: List[Word]) -> List[Word]:
+    """
+    Words in reading order: grouped into lines by overlapping vertical ranges
+    (top to bottom), then left to right within each line. Words on one printed
+    line may differ in height or sit a few pixels off the baseline.
+    """
+    lines: List[List[Word]] = []
+    band = None  # (top, bottom) of the current line
+    for word in sorted(words, key=lambda wd: (wd[1] + wd[3] / 2.0, wd[0])):
+        top, bottom = word[1], word[1] + word[3]
+        cy = (top + bottom) / 2.0
+        if band is not None and (band[0] <= cy <= band[1] or top <= (band[0] + band[1]) / 2.0 <= bottom):
+            lines[-1].append(word)
+            band = (min(band[0], top), max(band[1], bottom))
+        else:
+            lines.append([word])
+            band = (top, bottom)
+    return [word for line in lines for word in sorted(line, key=lambda wd: wd[0])]
+
+
+def words_to_roi_result(words: List[Word], cell_img: np.ndarray, hsv=None) -> Dict:
+    """Build the read_cell dict for one cell from its board-level words."""
+    H, W = cell_img.shape[:2]
+    rois = cell_roi_boxes(H, W)
+    by_roi = {name: [] for name in ROI_NAMES}
+    for word in words:
+        by_roi[assign_roi(word, rois)].append(word)
+
+    texts = {}
+    for name, roi_words in by_roi.items():
+        text = " ".join(wd[4] for wd in reading_order(roi_words))
+        texts[name] = filter_whitelist(text, ROI_WHITELISTS.get(name))
+    return build_roi_result(texts, cell_img, hsv)
+
+
+def words_to_whole_result(words: List[Word]) -> Dict:
+    """Build the read_cell_whole dict for one cell from its board-level words (reading order)."""
+    return parse_whole_tokens([wd[4] for wd in reading_order(words)])
+
+
+def read_board(rectified_image: np.ndarray, cells: List[tuple],
+               strip_rows: Optional[int] = None, hsvs=None) -> List[Dict]:
+    """
+    Board-level OCR: one image_to_data pass over the whole rectified board (or over
+    strips of strip_rows rows) instead of six OCR calls per cell.
+
+    Args:
+        rectified_image: Rectified board image
+        cells: List of cell ROIs (row, col, x, y, w, h) from cells_from_rectified
+        strip_rows: Grid rows per OCR pass (None = whole board)
+        hsvs: Optional precomputed dominant HSVs aligned with cells
+
+    Returns:
+        List of read_cell-format dictionaries aligned with cells
+    """
+    words: Dict[int, List[Word]] = {}
+    for indices in board_strips(cells, strip_rows):
+        words.update(strip_words(rectified_image, cells, indices))
+
+    results = []
+    for i, (_, _, x, y, w, h) in enumerate(cells):
+        hsv = hsvs[i] if hsvs is not None else None
+        results.append(words_to_roi_result(words[i], rectified_image[y:y+h, x:x+w], hsv))
+    return results
@@ -0,0 +1,127 @@
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Set
+from reconcile import build_reconcile_result, player_identity, reconcile_cell_scan
+from score_matrix import ScoreMatrix
+
+# Candidates per hypothesis (best and runner-up, used or not) whose change re-scores a cell
+CONTENDERS = 2
+
+
+def result_identity(result: Optional[dict]) -> Optional[tuple]:
+    """Identity of the player a reconciled cell holds, None if it kept its OCR values."""
+    if not result or not result.get('use_match'):
+        return None
+    return (result.get('first'), result.get('last'), result.get('team'), result.get('pos'),
+            result.get('bye') if result.get('bye') is not None else 0)
+
+
+class BoardState:
+    """
+    Reconciled board kept alive between requests: the score matrix over every cell
+    hypothesis, the current per-cell results and who holds which player.
+
+    A manual correction re-scores only the cells contending for the corrected or
+    freed player (the player is one of a hypothesis' best two candidates) or
+    holding it, and keeps propagating while re-scored cells change players. No
+    OCR runs; re-scoring is a lookup in the stored score rows.
+    """
+
+    def __init__(self, matrix: ScoreMatrix, cell_rows: Sequence[Sequence[int]], results: List[dict],
+                 chosen_ocr: List[dict], confidence_threshold: float = 45.0):
+        self.matrix = matrix
+        self.cell_rows = [list(rows) for rows in cell_rows]
+        self.results = list(results)
+        self.chosen_ocr = list(chosen_ocr)
+        self.confidence_threshold = confidence_threshold
+        self.manual: Set[int] = set()
+
+        self.holders: Dict[tuple, Set[int]] = {}
+        for c, result in enumerate(self.results):
+            self._hold(c, result_identity(result))
+
+        index = matrix.index
+        self.contenders: Dict[tuple, Set[int]] = {}
+        for c, rows in enumerate(self.cell_rows):
+            for r in rows:
+                mask = matrix.candidate_mask(r)
+                if not mask.any():
+                    continue
+                top = np.argsort(-np.where(mask, matrix.total[r], -np.inf), kind='stable')[:CONTENDERS]
+                for i in top[mask[top]].tolist():
+                    self.contenders.setdefault(index.identities[i], set()).add(c)
+
+    def _hold(self, c: int, identity: Optional[tuple]):
+        if identity is not None:
+            self.holders.setdefault(identity, set()).add(c)
+
+    def _release(self, c: int, identity: Optional[tuple]):
+        if identity is not None:
+            cells = self.holders.get(identity)
+            if cells is not None:
+                cells.discard(c)
+                if not cells:
+                    del self.holders[identity]
+
+    def _affected(self, identity: Optional[tuple]) -> Set[int]:
+        if identity is None:
+            return set()
+        return self.contenders.get(identity, set()) | self.holders.get(identity, set())
+
+    def correct(self, cell: int, result: dict) -> List[int]:
+        """
+        Set a manually corrected result for cell and re-reconcile the cells it affects.
+
+        Returns:
+            Indices of the other cells whose results changed (see self.results)
+        """
+        taken = result_identity(result)
+        freed = result_identity(self.results[cell])
+        self._release(cell, freed)
+        self.results[cell] = result
+        self._hold(cell, taken)
+        self.manual.add(cell)
+
+        pending = (self._affected(taken) | self._affected(freed)) - self.manual
+        changed = set()
+        # Each re-score can free one player; the cap guards against cycles
+        budget = 4 * len(self.cell_rows)
+        while pending and budget > 0:
+            budget -= 1
+            c = min(pending)  # draft order, as /process reconciles
+            pending.discard(c)
+            old = result_identity(self.results[c])
+            new_result, ocr = self._rescore(c)
+            new = result_identity(new_result)
+            if new is not None and new == old:
+                continue  # still holds the same player: keep its result
+            if new_result != self.results[c]:
+                self.results[c], self.chosen_ocr[c] = new_result, ocr
+                changed.add(c)
+            if new != old:
+                self._release(c, old)
+                self._hold(c, new)
+                pending |= (self._affected(old) | self._affected(new)) - self.manual - {c}
+        return sorted(changed)
+
+    def _rescore(self, c: int):
+        """Best result of cell c over its hypotheses given the players other cells hold."""
+        used = {identity for identity, cells in self.holders.items() if cells - {c}}
+        best = None
+        for r in self.cell_rows[c]:
+            ocr, row, col = self.matrix.hypotheses[r]
+            result, scan = reconcile_cell_scan(ocr, row, col, used, self.matrix.index,
+                                               self.confidence_threshold, n=0, exact_n=5,
+                                               scores=self.matrix.row(r), draft_table=self.matrix.draft_table)
+            if not result.get('use_match'):
+                # Free exact last-name hit, as /process takes for unmatched cells
+                for score, player, rank, breakdown in scan.exact:
+                    if player_identity(player) not in used:
+                        breakdown = {k: v for k, v in breakdown.items() if k != 'is_used'}
+                        result = build_reconcile_result(ocr, row, col, score, player, rank, breakdown, True,
+                                                        teams=self.matrix.teams)
+                        result['override'] = 'exact_lastname'
+                        break
+            # First hypothesis wins ties (ROI before whole-cell, as in /process)
+            if best is None or result.get('match_score', 0) > best[0].get('match_score', 0):
+                best = (result, ocr)
+        return best
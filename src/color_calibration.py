@@ -4,6 +4,7 @@ import json
 import os
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
+from color_lut import LookupTableClassifier
 
 @dataclass
 class ColorProfile:
@@ -12,8 +13,13 @@ class ColorProfile:
     hsv_ranges: List[Tuple[Tuple[int, int, int], Tuple[int, int, int]]]  # List of (lower, upper) HSV ranges
     confidence: float = 1.0
 
-class ColorCalibrator:
-    """Color calibration system for position detection."""
+class ColorCalibrator(LookupTableClassifier):
+    """
+    Color calibration system for position detection.
+    
+    Position detection goes through an HSV lookup table compiled from
+    self.profiles (see color_lut), recompiled whenever the profiles change.
+    """
     
     def __init__(self, calibration_file: str = "color_profiles.json"):
         self.calibration_file = calibration_file
@@ -76,77 +82,6 @@ class ColorCalibrator:
             json.dump(data, f, indent=2)
         print(f"Saved calibrated color profiles to {self.calibration_file}")
     
-    def detect_position_from_color(self, hsv: Tuple[float, float, float]) -> Tuple[str, float]:
-        """
-        Detect position from HSV color using calibrated profiles.
-        
-        Args:
-            hsv: HSV color values (H, S, V)
-        
-        Returns:
-            Tuple of (position, confidence)
-        """
-        h, s, v = hsv
-        best_match = None
-        best_confidence = 0.0
-        
-        for pos, profile in self.profiles.items():
-            for lower, upper in profile.hsv_ranges:
-                # Check if color falls within this range
-                if self._color_in_range(hsv, lower, upper):
-                    confidence = self._calculate_confidence(hsv, lower, upper) * profile.confidence
-                    if confidence > best_confidence:
-                        best_confidence = confidence
-                        best_match = pos
-        
-        return best_match, best_confidence
-    
-    def _color_in_range(self, hsv: Tuple[float, float, float], 
-                       lower: Tuple[int, int, int], 
-                       upper: Tuple[int, int, int]) -> bool:
-        """Check if HSV color is within the given range."""
-        h, s, v = hsv
-        lh, ls, lv = lower
-        uh, us, uv = upper
-        
-        # Handle hue wrap-around (red spans 0-10 and 170-180)
-        if lh > uh:  # Wrap-around case
-            h_in_range = (h >= lh) or (h <= uh)
-        else:
-            h_in_range = lh <= h <= uh
-        
-        return h_in_range and ls <= s <= us and lv <= v <= uv
-    
-    def _calculate_confidence(self, hsv: Tuple[float, float, float], 
-                            lower: Tuple[int, int, int], 
-                            upper: Tuple[int, int, int]) -> float:
-        """Calculate confidence based on how well the color fits the range."""
-        h, s, v = hsv
-        lh, ls, lv = lower
-        uh, us, uv = upper
-        
-        # Calculate distance from center of range
-        h_center = (lh + uh) / 2
-        s_center = (ls + us) / 2
-        v_center = (lv + uv) / 2
-        
-        # Handle hue wrap-around
-        if lh > uh:
-            h_center = ((lh + uh + 180) % 360) / 2
-        
-        h_dist = min(abs(h - h_center), abs(h - h_center + 180), abs(h - h_center - 180))
-        s_dist = abs(s - s_center)
-        v_dist = abs(v - v_center)
-        
-        # Normalize distances
-        h_norm = h_dist / 90.0  # Max hue distance
-        s_norm = s_dist / 255.0  # Max saturation distance
-        v_norm = v_dist / 255.0  # Max value distance
-        
-        # Calculate confidence (higher = better fit)
-        confidence = 1.0 - (h_norm + s_norm + v_norm) / 3.0
-        return max(0.0, confidence)
-    
     def calibrate_from_samples(self, samples: Dict[str, List[Tuple[float, float, float]]]):
         """
         Calibrate color profiles from sample HSV values.
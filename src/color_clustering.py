@@ -0,0 +1,104 @@
+import cv2
+import numpy as np
+from typing import Optional, Tuple
+
+# HSV histogram quantization for pixel clustering (OpenCV HSV: H 0-180, S/V 0-255)
+HIST_H_BIN, HIST_S_BIN, HIST_V_BIN = 2, 8, 8
+HIST_SHAPE = (181 // HIST_H_BIN + 1, 256 // HIST_S_BIN, 256 // HIST_V_BIN)
+
+
+def weighted_kmeans(points: np.ndarray, k: int, weights: Optional[np.ndarray] = None,
+                    max_iter: int = 50, tol: float = 1e-3) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Deterministic weighted k-means with a hard iteration cap.
+
+    Seeding is farthest-point from the heaviest point, so the same input always
+    gives the same clusters. Working memory is O(len(points) * k).
+
+    Args:
+        points: Nx3 samples
+        k: Number of clusters (reduced to the number of distinct points if smaller)
+        weights: Per-point weights (counts); defaults to 1
+        max_iter: Maximum Lloyd iterations
+        tol: Stop when no center moves further than this
+
+    Returns:
+        (centers kx3, cluster weights k)
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    weights = np.ones(len(points)) if weights is None else np.asarray(weights, dtype=np.float64)
+    k = min(k, len(np.unique(points, axis=0)))
+    if k <= 0:
+        return np.empty((0, 3)), np.empty(0)
+
+    centers = [points[np.argmax(weights)]]
+    d2 = ((points - centers[0]) ** 2).sum(axis=1)
+    for _ in range(1, k):
+        centers.append(points[np.argmax(d2 * weights)])
+        d2 = np.minimum(d2, ((points - centers[-1]) ** 2).sum(axis=1))
+    centers = np.array(centers)
+
+    for _ in range(max_iter):
+        labels = ((points[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2).argmin(axis=1)
+        mass = np.bincount(labels, weights=weights, minlength=k)
+        sums = np.stack([np.bincount(labels, weights=weights * points[:, c], minlength=k) for c in range(3)], axis=1)
+        new_centers = np.where(mass[:, None] > 0, sums / np.maximum(mass, 1e-12)[:, None], centers)
+        shift = np.abs(new_centers - centers).max()
+        centers = new_centers
+        if shift <= tol:
+            break
+
+    labels = ((points[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2).argmin(axis=1)
+    return centers, np.bincount(labels, weights=weights, minlength=k)
+
+
+def hsv_histogram(img_bgr: np.ndarray, s_threshold: int = 40, v_threshold: int = 60,
+                  min_pixels: int = 1000, chunk_rows: int = 256) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Quantized HSV histogram of a BGR image, built in row bands so working memory
+    stays bounded by chunk_rows regardless of image size.
+
+    Pixels below the saturation/value thresholds are left out (background, text),
+    unless fewer than min_pixels remain, in which case all pixels are used.
+
+    Returns:
+        (bin centers Mx3, bin counts M) for the non-empty bins
+    """
+    n_bins = int(np.prod(HIST_SHAPE))
+    colored = np.zeros(n_bins, dtype=np.int64)
+    everything = np.zeros(n_bins, dtype=np.int64)
+
+    for y0 in range(0, img_bgr.shape[0], chunk_rows):
+        band = cv2.cvtColor(img_bgr[y0:y0 + chunk_rows], cv2.COLOR_BGR2HSV).reshape(-1, 3)
+        bins = np.ravel_multi_index(
+            (band[:, 0] // HIST_H_BIN, band[:, 1] // HIST_S_BIN, band[:, 2] // HIST_V_BIN), HIST_SHAPE
+        )
+        everything += np.bincount(bins, minlength=n_bins)
+        keep = (band[:, 1] >= s_threshold) & (band[:, 2] >= v_threshold)
+        colored += np.bincount(bins[keep], minlength=n_bins)
+
+    counts = colored if colored.sum() >= min_pixels else everything
+    nonzero = np.flatnonzero(counts)
+    h, s, v = np.unravel_index(nonzero, HIST_SHAPE)
+    centers = np.column_stack([
+        np.minimum(h * HIST_H_BIN + (HIST_H_BIN - 1) / 2, 180),
+        s * HIST_S_BIN + (HIST_S_BIN - 1) / 2,
+        v * HIST_V_BIN + (HIST_V_BIN - 1) / 2,
+    ])
+    return centers, counts[nonzero]
+
+
+def cluster_image_colors(img_bgr: np.ndarray, k: int = 6, max_iter: int = 50) -> Tuple[np.ndarray, np.ndarray]:
+    """Cluster an image's colored pixels via its HSV histogram (at most HIST_SHAPE points)."""
+    centers, counts = hsv_histogram(img_bgr)
+    return weighted_kmeans(centers, k, counts, max_iter=max_iter)
+
+
+def cluster_cell_colors(cell_hsvs, k: int = 6, s_threshold: int = 40, v_threshold: int = 60,
+                        max_iter: int = 50) -> Tuple[np.ndarray, np.ndarray]:
+    """Cluster per-cell dominant HSV colors; cluster weights are cell counts."""
+    cell_hsvs = np.asarray(cell_hsvs, dtype=np.float64).reshape(-1, 3)
+    colored = cell_hsvs[(cell_hsvs[:, 1] >= s_threshold) & (cell_hsvs[:, 2] >= v_threshold)]
+    if len(colored) < k:
+        colored = cell_hsvs
+    return weighted_kmeans(colored, k, max_iter=max_iter)
@@ -0,0 +1,183 @@
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Integer OpenCV HSV colors the table covers: H 0-180 (range bounds may use 180), S/V 0-255
+TABLE_SHAPE = (181, 256, 256)
+
+
+class HSVLookupTable:
+    """
+    HSV -> (position, confidence) classifier compiled once from color profiles.
+
+    The decision is detect_position_from_color's: the in-range profile range
+    with the highest range-fit confidence (times profile confidence), ties to
+    the first, no position at zero confidence. A table over every integer HSV
+    color (TABLE_SHAPE, ~12 MB of int8) stores the winning range, so integer
+    colors inside the table (OpenCV images) take one indexing operation;
+    other colors (e.g. non-integer dominant-color means) are checked against
+    every range directly. Confidences are computed from the winning range and the
+    color itself. Positions and confidences match the per-range check exactly.
+    """
+
+    def __init__(self, profiles: Dict):
+        self.positions: List[str] = list(profiles.keys())
+        ranges = [(k, profile.confidence, lower, upper)
+                  for k, profile in enumerate(profiles.values()) for lower, upper in profile.hsv_ranges]
+        self.owners = np.array([r[0] for r in ranges], dtype=np.int64)
+        self.weights = np.array([r[1] for r in ranges], dtype=np.float64)
+        self.lower = np.array([r[2] for r in ranges], dtype=np.float64).reshape(len(ranges), 3)
+        self.upper = np.array([r[3] for r in ranges], dtype=np.float64).reshape(len(ranges), 3)
+        self.wrap = self.lower[:, 0] > self.upper[:, 0]
+        # Range centers, with hue wrap-around (red spans e.g. 170-10)
+        self.centers = (self.lower + self.upper) / 2
+        self.centers[self.wrap, 0] = ((self.lower[self.wrap, 0] + self.upper[self.wrap, 0] + 180) % 360) / 2
+        self.shape = TABLE_SHAPE
+        self.winner = self._compile()
+
+    def _fit(self, r, h, s, v) -> np.ndarray:
+        """Range-fit confidence (times profile confidence) of ranges r for colors h, s, v."""
+        hc, sc, vc = self.centers[r, 0], self.centers[r, 1], self.centers[r, 2]
+        h_dist = np.minimum(np.minimum(np.abs(h - hc), np.abs(h - hc + 180)), np.abs(h - hc - 180))
+        conf = 1.0 - (h_dist / 90.0 + np.abs(s - sc) / 255.0 + np.abs(v - vc) / 255.0) / 3.0
+        return np.maximum(conf, 0.0) * self.weights[r]
+
+    def _winners(self, h, s, v) -> np.ndarray:
+        """Winning range index (-1 for none) of colors h, s, v, broadcast together."""
+        h, s, v = np.broadcast_arrays(*(np.asarray(c, dtype=np.float64) for c in (h, s, v)))
+        if not len(self.owners):
+            return np.full(h.shape, -1, dtype=np.int64)
+        axis = (-1,) + (1,) * h.ndim
+        r = np.arange(len(self.owners)).reshape(axis)
+        lo = [self.lower[:, c].reshape(axis) for c in range(3)]
+        up = [self.upper[:, c].reshape(axis) for c in range(3)]
+        h_in = np.where(self.wrap.reshape(axis), (h >= lo[0]) | (h <= up[0]), (h >= lo[0]) & (h <= up[0]))
+        inside = h_in & (s >= lo[1]) & (s <= up[1]) & (v >= lo[2]) & (v <= up[2])
+        conf = np.where(inside, self._fit(r, h, s, v), 0.0)
+        # argmax keeps the first range on ties; a zero confidence never wins
+        best = np.argmax(conf, axis=0)
+        return np.where(np.take_along_axis(conf, best[None], axis=0)[0] > 0, best, -1)
+
+    def _compile(self) -> np.ndarray:
+        winner = np.full(self.shape, -1, dtype=np.int8 if len(self.owners) < 128 else np.int16)
+        if not len(self.owners):
+            return winner
+        s = np.arange(self.shape[1], dtype=np.float64)[None, :, None]
+        v = np.arange(self.shape[2], dtype=np.float64)[None, None, :]
+        lower, upper = self.lower[:, :, None, None], self.upper[:, :, None, None]
+        sv_in = (s >= lower[:, 1]) & (s <= upper[:, 1]) & (v >= lower[:, 2]) & (v <= upper[:, 2])
+        hues = np.arange(self.shape[0], dtype=np.float64)[:, None]
+        h_in = np.where(self.wrap, (hues >= self.lower[:, 0]) | (hues <= self.upper[:, 0]),
+                        (hues >= self.lower[:, 0]) & (hues <= self.upper[:, 0]))
+        # One hue slice at a time, over the S x V plane of the ranges containing that hue
+        for h in np.flatnonzero(h_in.any(axis=1)).tolist():
+            active = np.flatnonzero(h_in[h])
+            conf = np.where(sv_in[active], self._fit(active[:, None, None], float(h), s, v), 0.0)
+            best = np.argmax(conf, axis=0)
+            winner[h] = np.where(np.take_along_axis(conf, best[None], axis=0)[0] > 0, active[best], -1)
+        return winner
+
+    def _in_table(self, hsv: np.ndarray) -> np.ndarray:
+        """Mask of the colors (..., 3) that are integers inside the table."""
+        inside = np.all((hsv >= 0) & (hsv < np.array(self.shape)), axis=-1)
+        if np.issubdtype(hsv.dtype, np.integer):
+            return inside
+        return inside & np.all(hsv == np.floor(hsv), axis=-1)
+
+    def lookup_one(self, hsv: Tuple[float, float, float]) -> Tuple[int, float]:
+        """Scalar form of lookup."""
+        h, s, v = (float(c) for c in hsv)
+        if all(c.is_integer() and 0 <= c < n for c, n in zip((h, s, v), self.shape)):
+            r = int(self.winner[int(h), int(s), int(v)])
+        else:
+            r = int(self._winners(h, s, v))
+        if r < 0:
+            return -1, 0.0
+        return int(self.owners[r]), float(self._fit(r, h, s, v))
+
+    def lookup(self, hsv) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Classify any array of HSV colors (..., 3), e.g. an Nx3 array or an HSV image.
+
+        Returns:
+            (position index array, confidence array) of shape hsv.shape[:-1];
+            index -1 means no profile matched
+        """
+        hsv = np.asarray(hsv)
+        tabled = self._in_table(hsv)
+        if tabled.all():
+            r = self.winner[tuple(hsv[..., c].astype(np.intp) for c in range(3))].astype(np.int64)
+        else:
+            r = np.full(hsv.shape[:-1], -1, dtype=np.int64)
+            q = hsv[tabled].astype(np.intp)
+            r[tabled] = self.winner[q[:, 0], q[:, 1], q[:, 2]]
+            rest = hsv[~tabled].astype(np.float64)
+            r[~tabled] = self._winners(rest[:, 0], rest[:, 1], rest[:, 2])
+        matched = r >= 0
+        pos_idx = np.full(r.shape, -1, dtype=np.int64)
+        conf = np.zeros(r.shape)
+        if matched.any():
+            rm, colors = r[matched], hsv[matched].astype(np.float64)
+            pos_idx[matched] = self.owners[rm]
+            conf[matched] = self._fit(rm, colors[:, 0], colors[:, 1], colors[:, 2])
+        return pos_idx, conf
+
+
+class LookupTableClassifier:
+    """
+    Mixin for calibrators with a `profiles` dict: classifies colors through an
+    HSVLookupTable that is recompiled whenever the profiles change.
+    """
+
+    _lut: Optional[HSVLookupTable] = None
+    _lut_signature = None
+
+    def _profiles_signature(self):
+        return tuple(
+            (pos, tuple((tuple(lower), tuple(upper)) for lower, upper in profile.hsv_ranges), profile.confidence)
+            for pos, profile in self.profiles.items()
+        )
+
+    def lookup_table(self) -> HSVLookupTable:
+        """Compiled lookup table for the current profiles."""
+        signature = self._profiles_signature()
+        if self._lut is None or signature != self._lut_signature:
+            self._lut = HSVLookupTable(self.profiles)
+            self._lut_signature = signature
+        return self._lut
+
+    def classify_hsv(self, hsv) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Classify an Nx3 array or a whole HSV image with one indexing operation.
+
+        Returns:
+            (position index array, confidence array); see position_names for the index
+            mapping, -1 means no position
+        """
+        return self.lookup_table().lookup(hsv)
+
+    @property
+    def position_names(self) -> List[str]:
+        return self.lookup_table().positions
+
+    def detect_position_from_color(self, hsv: Tuple[float, float, float]) -> Tuple[str, float]:
+        """
+        Detect position from HSV color using calibrated profiles.
+
+        Args:
+            hsv: HSV color values (H, S, V)
+
+        Returns:
+            Tuple of (position, confidence)
+        """
+        lut = self.lookup_table()
+        i, conf = lut.lookup_one(hsv)
+        return (lut.positions[i], conf) if i >= 0 else (None, 0.0)
+
+    def detect_positions(self, hsv_values: Sequence) -> List[Tuple[Optional[str], float]]:
+        """Batch form of detect_position_from_color for an Nx3 array of HSV colors."""
+        lut = self.lookup_table()
+        pos_idx, conf = lut.lookup(np.asarray(hsv_values, dtype=np.float64).reshape(-1, 3))
+        return [
+            (lut.positions[i] if i >= 0 else None, float(c) if i >= 0 else 0.0)
+            for i, c in zip(pos_idx.tolist(), conf.tolist())
+        ]
@@ -5,39 +5,7 @@ from typing import List, Tuple, Dict
 from manual_color_calibration import ManualColorCalibrator
 from preprocess import normalize_board
 from grid import cells_from_rectified
-from ocr_cell import mean_hsv
-
-def dominant_nonwhite_hsv(cell_img, white_thresh: int = 200):
-    """
-    Get the dominant non-white HSV color from a card image.
-    - Converts to HSV
-    - Masks out near-white pixels (high V, low S)
-    - Finds most common remaining color
-    """
-    hsv = cv2.cvtColor(cell_img, cv2.COLOR_BGR2HSV)
-    
-    # Mask out near-white pixels (Saturation low or Value very high)
-    nonwhite_mask = ~((hsv[:,:,1] < 40) & (hsv[:,:,2] > white_thresh))
-    
-    # Flatten HSV pixels that are non-white
-    pixels = hsv[nonwhite_mask]
-    if len(pixels) == 0:
-        return (0, 0, 0)  # fallback if card is all white
-    
-    # Cluster with k-means to find dominant background
-    pixels = np.float32(pixels)
-    k = 3
-    _, labels, centers = cv2.kmeans(
-        pixels, k, None,
-        (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 10, 1.0),
-        10, cv2.KMEANS_RANDOM_CENTERS
-    )
-    
-    # Choose the cluster with the most members
-    counts = np.bincount(labels.flatten())
-    dominant = centers[np.argmax(counts)]
-    
-    return tuple(map(float, dominant))
+from ocr_cell import mean_hsv, dominant_hsv_for_cells
 
 class ColorVisualizer:
     """Visualize color-based position predictions on the draft board."""
@@ -71,14 +39,15 @@ class ColorVisualizer:
         position_counts = {}
         cell_predictions = []
         
+        # Use dominant non-white color instead of fixed corner sampling (one pass for all cells)
+        cell_hsvs = dominant_hsv_for_cells(rectified_image, cells)
+        cell_colors = self.calibrator.detect_positions(cell_hsvs)
+        
         for i, (row, col, x, y, w, h) in enumerate(cells):
-            cell_img = rectified_image[y:y+h, x:x+w]
-            
-            # Use dominant non-white color instead of fixed corner sampling
-            hsv = dominant_nonwhite_hsv(cell_img)
+            hsv = tuple(map(float, cell_hsvs[i]))
             
             # Predict position
-            predicted_pos, confidence = self.calibrator.detect_position_from_color(hsv)
+            predicted_pos, confidence = cell_colors[i]
             
             # Store prediction
             cell_predictions.append({
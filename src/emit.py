@@ -18,7 +18,7 @@ def write_row_major_text(results: List[Dict], output_path: str = "out/rows.txt")
     # Group by row
     rows = {}
     for result in results:
-        if not result:
+        if not result or result.get('empty'):
             continue
         row = result.get('row')
         if row is None:
@@ -54,7 +54,7 @@ def write_column_major_text(results: List[Dict], output_path: str = "out/cols.tx
     # Group by column
     cols = {}
     for result in results:
-        if not result:
+        if not result or result.get('empty'):
             continue
         col = result.get('col')
         if col is None:
@@ -150,7 +150,7 @@ def write_low_confidence_review(results: List[Dict], threshold: float = 80.0,
     """
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
     
-    low_confidence = [r for r in results if r['match_score'] < threshold]
+    low_confidence = [r for r in results if r['match_score'] < threshold and not r.get('empty')]
     
     if not low_confidence:
         # Create empty file with headers
@@ -227,7 +227,7 @@ def create_overlay_image(rectified_image: np.ndarray, results: List[Dict],
     # Create a mapping from (row, col) to result
     result_map = {}
     for result in results:
-        if not result:
+        if not result or result.get('empty'):
             continue
         r = result.get('row')
         c = result.get('col')
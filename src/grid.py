@@ -3,6 +3,15 @@ import numpy as np
 import os
 from typing import List, Tuple
 
+# Empty-cell pre-classifier (see detect_empty_cells)
+EMPTY_INSET = 0.12       # fraction of the cell trimmed on each side (grid lines, neighbour bleed)
+EMPTY_MAX_INK = 0.05     # max share of non-white (saturated or dark) pixels in an empty cell
+EMPTY_MAX_EDGES = 0.01   # max share of edge pixels, ruled lines removed, in an empty cell
+EMPTY_LINE_WIDTH = 0.3   # horizontal edge runs this long (fraction of cell width) are ruled lines
+EMPTY_LINE_HEIGHT = 1.0  # vertical edge runs this long (fraction of cell height) are ruled lines
+# On the 10x14 sample board, blank cells reach 2.8% ink and 0.4% line-free edges,
+# stickers have at least 63% ink and 5.8% edges
+
 def cells_from_rectified(img, rows=16, cols=10, output_dir="out"):
     """
     Split the rectified board into a grid of cells using precise integer
@@ -142,3 +151,56 @@ def cells_from_boundaries(img, row_boundaries, col_boundaries, output_dir="out")
             cells.append((r, c, x, y, w, h))
     
     return cells
+
+def detect_empty_cells(img, cells, inset: float = EMPTY_INSET, max_ink: float = EMPTY_MAX_INK,
+                       max_edges: float = EMPTY_MAX_EDGES) -> List[bool]:
+    """
+    Flag cells with no sticker so OCR and matching can skip them.
+    
+    A cell is empty when its inner part is nearly all white and has almost no
+    edges: blank paper. Ruled board lines are not counted as edges: edge runs
+    longer than EMPTY_LINE_WIDTH of a cell horizontally or EMPTY_LINE_HEIGHT
+    vertically are opened out of the edge mask first. Any colored or
+    written-on cell is kept, so a sticker is never skipped. Ink and edge masks
+    are computed once for the board and summed per cell through integral images.
+    
+    Args:
+        img: Rectified board image (BGR)
+        cells: List of cell ROIs (row, col, x, y, w, h)
+        inset: Fraction of each side ignored
+        max_ink: Largest non-white pixel share of an empty cell
+        max_edges: Largest edge pixel share of an empty cell
+    
+    Returns:
+        List of booleans aligned with cells (True = empty)
+    """
+    hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
+    ink = ((hsv[:, :, 1] > 60) | (hsv[:, :, 2] < 150)).astype(np.uint8)
+    edges = (cv2.Canny(hsv[:, :, 2], 50, 150) > 0).astype(np.uint8)
+    if cells:
+        # Ruled lines: long straight runs of the (slightly thickened) edge mask
+        cell_w = int(np.median([c[4] for c in cells]))
+        cell_h = int(np.median([c[5] for c in cells]))
+        grown = cv2.dilate(edges, np.ones((3, 3), np.uint8))
+        lines = np.zeros_like(edges)
+        for size in ((max(3, int(cell_w * EMPTY_LINE_WIDTH)), 1), (1, max(3, int(cell_h * EMPTY_LINE_HEIGHT)))):
+            lines |= cv2.morphologyEx(grown, cv2.MORPH_OPEN, cv2.getStructuringElement(cv2.MORPH_RECT, size))
+        edges &= 1 - cv2.dilate(lines, np.ones((3, 3), np.uint8))
+    ink_sum = cv2.integral(ink)
+    edge_sum = cv2.integral(edges)
+
+    def area_sum(integral, x0, y0, x1, y1):
+        return integral[y1, x1] - integral[y0, x1] - integral[y1, x0] + integral[y0, x0]
+
+    empty = []
+    for (_, _, x, y, w, h) in cells:
+        dx, dy = int(w * inset), int(h * inset)
+        x0, y0, x1, y1 = x + dx, y + dy, x + w - dx, y + h - dy
+        area = (x1 - x0) * (y1 - y0)
+        if area <= 0:
+            empty.append(True)
+            continue
+        ink_share = area_sum(ink_sum, x0, y0, x1, y1) / area
+        edge_share = area_sum(edge_sum, x0, y0, x1, y1) / area
+        empty.append(bool(ink_share <= max_ink and edge_share <= max_edges))
+    return empty
@@ -4,6 +4,7 @@ import json
 import os
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
+from color_lut import LookupTableClassifier
 import matplotlib.pyplot as plt
 from pathlib import Path
 
@@ -14,8 +15,63 @@ class ColorProfile:
     hsv_ranges: List[Tuple[Tuple[int, int, int], Tuple[int, int, int]]]
     confidence: float = 1.0
 
-class ManualColorCalibrator:
-    """Manual color calibration using example images."""
+
+# Per-position (H, S, V) tolerances around a single user-picked color
+POSITION_TOLERANCES = {
+    'QB': (20, 50, 50),   # Orange - can be more variable
+    'RB': (25, 60, 60),   # Brown - needs more tolerance
+    'WR': (15, 35, 35),   # Blue - fairly consistent
+    'TE': (20, 45, 45),   # Red - can vary
+    'K': (15, 30, 30),    # Gray - reduce tolerance to prevent catch-all
+    'DST': (15, 40, 40),  # Green - fairly consistent
+}
+DEFAULT_TOLERANCE = (15, 40, 40)
+
+
+def valid_color_pixels(hsv_image: np.ndarray) -> np.ndarray:
+    """Nx3 HSV pixels that are neither very dark, very light nor gray (likely background)."""
+    hsv_flat = hsv_image.reshape(-1, 3)
+    v = hsv_flat[:, 2]
+    return hsv_flat[(v > 30) & (v < 250) & (hsv_flat[:, 1] > 20)]
+
+
+def hsv_range_from_samples(samples, percentiles: Tuple[float, float] = (5, 95)):
+    """
+    HSV range covering an Nx3 array of color samples.
+
+    Percentiles drop outliers, then each channel is padded proportionally to its
+    observed spread with sensible floors (agnostic to which position uses which color).
+
+    Returns:
+        ((h_min, s_min, v_min), (h_max, s_max, v_max)) as ints
+    """
+    samples = np.asarray(samples, dtype=np.float64).reshape(-1, 3)
+    lo, hi = np.percentile(samples, percentiles, axis=0)
+    spread = np.maximum(1, (hi - lo).astype(int))
+    # Proportional pads (percent of spread) with minimum absolute pads
+    pad = np.maximum([8, 20, 20], (0.20 * spread).astype(int))
+    limits = (180, 255, 255)
+
+    lower = tuple(max(0, int(l - p)) for l, p in zip(lo, pad))
+    upper = tuple(min(m, int(u + p)) for u, p, m in zip(hi, pad, limits))
+    return lower, upper
+
+
+def hsv_range_around(position: str, hsv: Tuple[float, float, float]):
+    """HSV range around a single picked color using the position's tolerance."""
+    h, s, v = hsv
+    h_tol, s_tol, v_tol = POSITION_TOLERANCES.get(position, DEFAULT_TOLERANCE)
+    return ((max(0, h - h_tol), max(0, s - s_tol), max(0, v - v_tol)),
+            (min(180, h + h_tol), min(255, s + s_tol), min(255, v + v_tol)))
+
+
+class ManualColorCalibrator(LookupTableClassifier):
+    """
+    Manual color calibration using example images.
+    
+    Position detection goes through an HSV lookup table compiled from
+    self.profiles (see color_lut), recompiled whenever the profiles change.
+    """
     
     def __init__(self, examples_dir: str = "examples/sample_data/positional_color_examples"):
         self.examples_dir = examples_dir
@@ -29,142 +85,40 @@ class ManualColorCalibrator:
     
     def _analyze_position_image(self, position: str, image_path: str):
         """Analyze a single position example image."""
-        # Load image
-        image = cv2.imread(image_path)
-        if image is None:
-            print(f"Error: Could not load {image_path}")
-            return
-        
-        # Convert to HSV
-        hsv_image = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-        
-        # Extract all HSV values
-        hsv_values = []
-        for y in range(hsv_image.shape[0]):
-            for x in range(hsv_image.shape[1]):
-                h, s, v = hsv_image[y, x]
-                # Filter out very dark or very light pixels (likely background)
-                if v > 30 and v < 250 and s > 20:
-                    hsv_values.append((h, s, v))
-        
-        if not hsv_values:
-            print(f"No valid color samples found in {image_path}")
+        return self.analyze_position_images(position, [image_path])
+
+    def analyze_position_images(self, position: str, image_paths: List[str]):
+        """Build one position profile from the valid color pixels of all example images."""
+        samples = []
+        for image_path in image_paths:
+            image = cv2.imread(image_path)
+            if image is None:
+                print(f"Error: Could not load {image_path}")
+                continue
+            samples.append(valid_color_pixels(cv2.cvtColor(image, cv2.COLOR_BGR2HSV)))
+
+        hsv_values = np.concatenate(samples) if samples else np.empty((0, 3), dtype=np.uint8)
+        if len(hsv_values) == 0:
+            print(f"No valid color samples found in {', '.join(image_paths)}")
             return
-        
-        # Calculate statistics
-        h_values = [h for h, s, v in hsv_values]
-        s_values = [s for h, s, v in hsv_values]
-        v_values = [v for h, s, v in hsv_values]
-        
-        # Calculate ranges with percentiles to handle outliers
-        h_min, h_max = np.percentile(h_values, [5, 95])
-        s_min, s_max = np.percentile(s_values, [5, 95])
-        v_min, v_max = np.percentile(v_values, [5, 95])
-        
-        # Add data-driven tolerance (agnostic to which position uses which color)
-        # Expand ranges proportionally to observed spread with sensible floors.
-        h_spread = max(1, int(h_max - h_min))
-        s_spread = max(1, int(s_max - s_min))
-        v_spread = max(1, int(v_max - v_min))
 
-        # Proportional pads (percent of spread) with minimum absolute pads
-        h_pad = max(8, int(0.20 * h_spread))   # hue range 0-180
-        s_pad = max(20, int(0.20 * s_spread))  # saturation 0-255
-        v_pad = max(20, int(0.20 * v_spread))  # value 0-255
+        (h_min, s_min, v_min), (h_max, s_max, v_max) = hsv_range_from_samples(hsv_values, (5, 95))
 
-        h_min = max(0, int(h_min - h_pad))
-        h_max = min(180, int(h_max + h_pad))
-        s_min = max(0, int(s_min - s_pad))
-        s_max = min(255, int(s_max + s_pad))
-        v_min = max(0, int(v_min - v_pad))
-        v_max = min(255, int(v_max + v_pad))
-        
         # Store the profile
         self.profiles[position] = ColorProfile(
             position=position,
             hsv_ranges=[((h_min, s_min, v_min), (h_max, s_max, v_max))]
         )
-        
+
         # Store samples for visualization
         self.color_samples[position] = hsv_values
-        
+
         print(f"  {position} color range:")
         print(f"    Hue: {h_min}-{h_max}")
         print(f"    Saturation: {s_min}-{s_max}")
         print(f"    Value: {v_min}-{v_max}")
         print(f"    Sample count: {len(hsv_values)}")
-    
-    def detect_position_from_color(self, hsv: Tuple[float, float, float]) -> Tuple[str, float]:
-        """
-        Detect position from HSV color using calibrated profiles.
-        
-        Args:
-            hsv: HSV color values (H, S, V)
-        
-        Returns:
-            Tuple of (position, confidence)
-        """
-        h, s, v = hsv
-        best_match = None
-        best_confidence = 0.0
-        
-        for pos, profile in self.profiles.items():
-            for lower, upper in profile.hsv_ranges:
-                # Check if color falls within this range
-                if self._color_in_range(hsv, lower, upper):
-                    confidence = self._calculate_confidence(hsv, lower, upper) * profile.confidence
-                    if confidence > best_confidence:
-                        best_confidence = confidence
-                        best_match = pos
-        
-        return best_match, best_confidence
-    
-    def _color_in_range(self, hsv: Tuple[float, float, float], 
-                       lower: Tuple[int, int, int], 
-                       upper: Tuple[int, int, int]) -> bool:
-        """Check if HSV color is within the given range."""
-        h, s, v = hsv
-        lh, ls, lv = lower
-        uh, us, uv = upper
-        
-        # Handle hue wrap-around (red spans 0-10 and 170-180)
-        if lh > uh:  # Wrap-around case
-            h_in_range = (h >= lh) or (h <= uh)
-        else:
-            h_in_range = lh <= h <= uh
-        
-        return h_in_range and ls <= s <= us and lv <= v <= uv
-    
-    def _calculate_confidence(self, hsv: Tuple[float, float, float], 
-                            lower: Tuple[int, int, int], 
-                            upper: Tuple[int, int, int]) -> float:
-        """Calculate confidence based on how well the color fits the range."""
-        h, s, v = hsv
-        lh, ls, lv = lower
-        uh, us, uv = upper
-        
-        # Calculate distance from center of range
-        h_center = (lh + uh) / 2
-        s_center = (ls + us) / 2
-        v_center = (lv + uv) / 2
-        
-        # Handle hue wrap-around
-        if lh > uh:
-            h_center = ((lh + uh + 180) % 360) / 2
-        
-        h_dist = min(abs(h - h_center), abs(h - h_center + 180), abs(h - h_center - 180))
-        s_dist = abs(s - s_center)
-        v_dist = abs(v - v_center)
-        
-        # Normalize distances
-        h_norm = h_dist / 90.0  # Max hue distance
-        s_norm = s_dist / 255.0  # Max saturation distance
-        v_norm = v_dist / 255.0  # Max value distance
-        
-        # Calculate confidence (higher = better fit)
-        confidence = 1.0 - (h_norm + s_norm + v_norm) / 3.0
-        return max(0.0, confidence)
-    
+
     def save_profiles(self, output_file: str = "manual_color_profiles.json"):
         """Save the calibrated profiles to a file."""
         data = {}
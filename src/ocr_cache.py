@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+
+
+class OCRCache:
+    """
+    Content-addressed OCR result cache.
+
+    Keys hash the exact image buffer handed to Tesseract (the preprocessed ROI)
+    together with the OCR config, so identical crops skip the engine entirely.
+    A bounded in-memory LRU tier sits in front of an optional on-disk tier that
+    survives restarts and is shared between worker processes.
+    """
+
+    def __init__(self, max_entries: int = 4096, disk_dir: Optional[str] = None):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self._mem: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(img: np.ndarray, kind: str, psm: int, whitelist: Optional[str], backend: str) -> str:
+        """Hash of the image bytes, shape and dtype plus the OCR call config."""
+        arr = np.ascontiguousarray(img)
+        h = hashlib.blake2b(digest_size=20)
+        h.update(f"{kind}|{psm}|{whitelist or ''}|{backend}|{arr.shape}|{arr.dtype}".encode())
+        h.update(arr.data)
+        return h.hexdigest()
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key[:2], key + '.json')
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            if key in self._mem:
+                self._mem.move_to_end(key)
+                self.hits += 1
+                return self._mem[key]
+
+        if self.disk_dir:
+            path = self._disk_path(key)
+            try:
+                with open(path, 'r') as f:
+                    value = json.load(f)
+            except (OSError, ValueError):
+                value = None
+            if value is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                self._remember(key, value)
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, value: Any):
+        self._remember(key, value)
+        if self.disk_dir:
+            path = self._disk_path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Atomic write so concurrent readers never see a partial file
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(value, f)
+                os.replace(tmp, path)
+            except OSError:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+
+    def _remember(self, key: str, value: Any):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._mem[key] = value
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.max_entries:
+                self._mem.popitem(last=False)
+
+    def counts(self) -> Tuple[int, int, int]:
+        """(hits, disk_hits, misses) so far."""
+        with self._lock:
+            return self.hits, self.disk_hits, self.misses
+
+    def add_counts(self, hits: int, disk_hits: int, misses: int):
+        """Merge lookups made by another process's copy of this cache (process-pool workers)."""
+        with self._lock:
+            self.hits += hits
+            self.disk_hits += disk_hits
+            self.misses += misses
+
+    def clear(self):
+        """Drop the in-memory tier and reset counters (the disk tier is kept)."""
+        with self._lock:
+            self._mem.clear()
+            self.hits = self.disk_hits = self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'entries': len(self._mem),
+                'max_entries': self.max_entries,
+                'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
@@ -1,9 +1,42 @@
 import cv2
 import numpy as np
-import pytesseract
 import re
 import os
+import threading
 from typing import Dict, Tuple, Optional
+import ocr_engine
+
+# Where read_cell binarizes: 'roi' (each ROI crop enhanced on its own, the default)
+# or 'cell' (once per cell, ROIs are views of the cell plane; opt-in until its
+# accuracy has been compared on the sample boards)
+ROI_BINARIZE = os.environ.get('OCR_ROI_BINARIZE', 'roi')
+
+# Structuring element for the open/erode steps, shared by every binarization
+_MORPH_KERNEL = np.ones((2, 2), np.uint8)
+_clahe_local = threading.local()
+
+def _clahe() -> "cv2.CLAHE":
+    """CLAHE(2.2, 20x20) for this thread (CLAHE objects keep state, so not shared across threads)."""
+    clahe = getattr(_clahe_local, 'clahe', None)
+    if clahe is None:
+        clahe = _clahe_local.clahe = cv2.createCLAHE(clipLimit=2.2, tileGridSize=(20, 20))
+    return clahe
+
+def enhance_gray(img_bgr: np.ndarray) -> np.ndarray:
+    """BGR→gray → CLAHE → blur(3x3) → unsharp(1.3,-0.3): the enhanced plane neutral_otsu thresholds."""
+    gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY) if img_bgr.ndim == 3 else img_bgr
+    norm = _clahe().apply(gray)
+    blurred = cv2.GaussianBlur(norm, (3, 3), 0)
+    return cv2.addWeighted(norm, 1.3, blurred, -0.3, 0)
+
+def binarize_enhanced(sharp: np.ndarray, *, invert: bool = True, antimerge: bool = False) -> np.ndarray:
+    """Otsu(threshold, invert) → open(2x2,1) → optional erosion(2x2,1) of an enhance_gray plane."""
+    thresh_flag = cv2.THRESH_BINARY_INV if invert else cv2.THRESH_BINARY
+    _, binary = cv2.threshold(sharp, 0, 255, thresh_flag | cv2.THRESH_OTSU)
+    binary = cv2.morphologyEx(binary, cv2.MORPH_OPEN, _MORPH_KERNEL, iterations=1)
+    if antimerge:
+        binary = cv2.erode(binary, _MORPH_KERNEL, iterations=1)  # gently separate touching glyphs
+    return binary
 
 def neutral_otsu(img_bgr: np.ndarray, *, invert: bool = True, antimerge: bool = False, return_bgr: bool = False) -> np.ndarray:
     """
@@ -14,41 +47,56 @@ def neutral_otsu(img_bgr: np.ndarray, *, invert: bool = True, antimerge: bool =
     """
     h, w = img_bgr.shape[:2]
 
-    gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
-    clahe = cv2.createCLAHE(clipLimit=2.2, tileGridSize=(20, 20))
-    norm = clahe.apply(gray)
-    blurred = cv2.GaussianBlur(norm, (3, 3), 0)
-    sharp = cv2.addWeighted(norm, 1.3, blurred, -0.3, 0)
+    binary = binarize_enhanced(enhance_gray(img_bgr), invert=invert, antimerge=antimerge)
 
-    thresh_flag = cv2.THRESH_BINARY_INV if invert else cv2.THRESH_BINARY
-    _, binary = cv2.threshold(sharp, 0, 255, thresh_flag | cv2.THRESH_OTSU)
+    assert binary.shape[:2] == (h, w), "Size changed unexpectedly"
 
-    k = np.ones((2, 2), np.uint8)
-    binary = cv2.morphologyEx(binary, cv2.MORPH_OPEN, k, iterations=1)
+    return cv2.cvtColor(binary, cv2.COLOR_GRAY2BGR) if return_bgr else binary
 
-    if antimerge:
-        binary = cv2.erode(binary, k, iterations=1)  # gently separate touching glyphs
+class CellPlanes:
+    """
+    OCR planes of one cell, computed once and shared by every OCR consumer.
 
-    assert binary.shape[:2] == (h, w), "Size changed unexpectedly"
+    The enhanced grayscale plane is built on construction; binarized planes are
+    built on first use per (invert, antimerge) variant. ROI accessors return
+    numpy views into these planes, so read_cell's five ROIs and
+    read_cell_whole's full cell cost one enhancement and one threshold.
+    """
 
-    return cv2.cvtColor(binary, cv2.COLOR_GRAY2BGR) if return_bgr else binary
+    def __init__(self, cell_img: np.ndarray):
+        self.cell_img = cell_img
+        self.gray = enhance_gray(cell_img)
+        self._binary: Dict[Tuple[bool, bool], np.ndarray] = {}
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.gray.shape[:2]
+
+    def binary(self, invert: bool = True, antimerge: bool = False) -> np.ndarray:
+        """Binarized cell (neutral_otsu of the whole cell)."""
+        key = (invert, antimerge)
+        if key not in self._binary:
+            self._binary[key] = binarize_enhanced(self.gray, invert=invert, antimerge=antimerge)
+        return self._binary[key]
+
+    def roi(self, box: Tuple[int, int, int, int], invert: bool = True, antimerge: bool = False) -> np.ndarray:
+        """View of the binarized cell inside box (x, y, w, h)."""
+        x, y, w, h = box
+        return self.binary(invert, antimerge)[y:y+h, x:x+w]
 
 def ocr(img, psm=7, whitelist=None):
     """
-    Perform OCR on an image.
+    Perform OCR on an image via the active OCR engine (see ocr_engine).
     
     Args:
-        img: Input image
+        img: Input image (numpy array, passed to the engine without temp files)
         psm: Page segmentation mode
         whitelist: Allowed characters
     
     Returns:
         OCR text result
     """
-    cfg = f'--psm {psm}'
-    if whitelist:
-        cfg += f' -c tessedit_char_whitelist="{whitelist}"'
-    return pytesseract.image_to_string(img, config=cfg).strip()
+    return ocr_engine.image_to_string(img, psm=psm, whitelist=whitelist)
 
 def mean_hsv(img, rect):
     """
@@ -65,36 +113,100 @@ def mean_hsv(img, rect):
     hsv = cv2.cvtColor(img[y:y+h, x:x+w], cv2.COLOR_BGR2HSV)
     return hsv.reshape(-1, 3).mean(axis=0)  # H,S,V floats
 
-def dominant_nonwhite_hsv(cell_img, white_thresh: int = 200):
-    """
-    Get the dominant non-white HSV color from a card image.
-    - Converts to HSV
-    - Masks out near-white pixels (high V, low S)
-    - Finds most common remaining color
+# Quantization of the dominant-color histogram (OpenCV HSV: H 0-179, S 0-255)
+HUE_BIN = 5    # hue units per bin (36 bins)
+SAT_BIN = 16   # saturation units per bin (16 bins)
+
+def dominant_hsv_from_hsv(hsv: np.ndarray, rects, white_thresh: int = 200) -> np.ndarray:
     """
-    hsv = cv2.cvtColor(cell_img, cv2.COLOR_BGR2HSV)
-    
-    # Mask out near-white pixels (Saturation low or Value very high)
-    nonwhite_mask = ~((hsv[:,:,1] < 40) & (hsv[:,:,2] > white_thresh))
+    Dominant non-white HSV color of every rectangle of an HSV image in one NumPy pass.
+    - Masks out near-white pixels (low S and high V)
+    - Builds a per-rectangle quantized H-S histogram (3x3 smoothed, hue wraps around)
+    - Returns the circular-mean H and mean S, V of the pixels around the histogram mode
+    Deterministic replacement for per-cell k-means.
     
-    # Flatten HSV pixels that are non-white
-    pixels = hsv[nonwhite_mask]
-    if len(pixels) == 0:
-        return (0, 0, 0)  # fallback if card is all white
+    Args:
+        hsv: HSV image
+        rects: List of (x, y, w, h)
+        white_thresh: V above which low-saturation pixels count as white
     
-    # Cluster with k-means to find dominant background
-    pixels = np.float32(pixels)
-    k = 2  # Reduced from 3 - simpler clustering for clearer dominant color
-    _, labels, centers = cv2.kmeans(
-        pixels, k, None,
-        (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 10, 1.0),
-        10, cv2.KMEANS_RANDOM_CENTERS
-    )
+    Returns:
+        Array of shape (len(rects), 3); (0, 0, 0) for rectangles with no non-white pixels
+    """
+    n = len(rects)
+    h_bins, s_bins = 180 // HUE_BIN, 256 // SAT_BIN
+    n_bins = h_bins * s_bins
+    if n == 0:
+        return np.zeros((0, 3), np.float64)
+    
+    labels = np.full(hsv.shape[:2], -1, np.int32)
+    for k, (x, y, w, h) in enumerate(rects):
+        labels[y:y+h, x:x+w] = k
+    labels = labels.reshape(-1)
+    
+    flat = hsv.reshape(-1, 3)
+    H, S, V = flat[:, 0], flat[:, 1], flat[:, 2]
+    hue_lut = np.minimum(np.arange(256) // HUE_BIN, h_bins - 1).astype(np.int32)
+    code = hue_lut[H] * s_bins + (S // SAT_BIN).astype(np.int32)
+    
+    # Mask out near-white pixels (Saturation low and Value very high)
+    idx = np.flatnonzero((labels >= 0) & ((S >= 40) | (V <= white_thresh)))
+    lab = labels[idx]
+    joint = lab * n_bins + code[idx]
+    counts = np.bincount(joint, minlength=n * n_bins).reshape(n, h_bins, s_bins)
+    
+    # 3x3 smoothing so the mode is not split across bin edges (hue is circular)
+    smooth = np.zeros_like(counts)
+    padded = np.pad(counts, ((0, 0), (0, 0), (1, 1)))
+    for dh in (-1, 0, 1):
+        rolled = np.roll(padded, dh, axis=1)
+        for ds in (0, 1, 2):
+            smooth += rolled[:, :, ds:ds + s_bins]
+    mode = smooth.reshape(n, -1).argmax(axis=1)
+    mode_h, mode_s = mode // s_bins, mode % s_bins
+    
+    # Pixels in the mode bin or its neighbours, via a per-(cell, bin) membership table
+    dhb = (np.arange(h_bins)[None, :] - mode_h[:, None] + h_bins // 2) % h_bins - h_bins // 2
+    dsb = np.arange(s_bins)[None, :] - mode_s[:, None]
+    member = ((np.abs(dhb) <= 1)[:, :, None] & (np.abs(dsb) <= 1)[:, None, :]).reshape(-1)
+    sel = member[joint]
+    sel_idx, sel_lab = idx[sel], lab[sel]
+    cnt = np.bincount(sel_lab, minlength=n).astype(np.float64)
+    safe = np.maximum(cnt, 1.0)
+    
+    # Circular hue mean relative to the mode bin center
+    center = (mode_h + 0.5) * HUE_BIN
+    dh = (H[sel_idx] - center[sel_lab] + 90.0) % 180.0 - 90.0
+    h_mean = (center + np.bincount(sel_lab, weights=dh, minlength=n) / safe) % 180.0
+    s_mean = np.bincount(sel_lab, weights=S[sel_idx], minlength=n) / safe
+    v_mean = np.bincount(sel_lab, weights=V[sel_idx], minlength=n) / safe
+    
+    out = np.stack([h_mean, s_mean, v_mean], axis=1)
+    out[cnt == 0] = 0.0  # fallback if card is all white
+    return out
+
+def dominant_hsv_for_cells(board_img, cells, white_thresh: int = 200) -> np.ndarray:
+    """
+    Dominant non-white HSV of every cell with a single board-wide HSV conversion.
     
-    # Choose the cluster with the most members
-    counts = np.bincount(labels.flatten())
-    dominant = centers[np.argmax(counts)]
+    Args:
+        board_img: Board image (BGR)
+        cells: List of cell ROIs (row, col, x, y, w, h)
     
+    Returns:
+        Array of shape (n_cells, 3)
+    """
+    hsv = cv2.cvtColor(board_img, cv2.COLOR_BGR2HSV)
+    return dominant_hsv_from_hsv(hsv, [c[2:] for c in cells], white_thresh)
+
+def dominant_nonwhite_hsv(cell_img, white_thresh: int = 200):
+    """
+    Get the dominant non-white HSV color from a card image
+    (single-cell form of dominant_hsv_from_hsv).
+    """
+    hsv = cv2.cvtColor(cell_img, cv2.COLOR_BGR2HSV)
+    H, W = hsv.shape[:2]
+    dominant = dominant_hsv_from_hsv(hsv, [(0, 0, W, H)], white_thresh)[0]
     return tuple(map(float, dominant))
 
 # Global calibrator instance to avoid re-analyzing images
@@ -152,80 +264,195 @@ def pos_from_color(hsv):
         
         return None
 
-def read_cell(cell_img):
+# ROI order used for composites, and the per-ROI character whitelists used by read_cell
+ROI_NAMES = ('pos', 'bye', 'lastname', 'team', 'firstname')
+ROI_WHITELISTS = {'pos': "QBWRTEDSTK", 'bye': "BYE 0123456789"}
+
+def cell_roi_boxes(H: int, W: int) -> Dict[str, Tuple[int, int, int, int]]:
     """
-    Read a single cell/sticker with ROI strategy.
-    
-    Args:
-        cell_img: Cell image
+    ROI geometry for a cell of size H x W.
     
     Returns:
-        Dictionary with OCR results and color-based position
+        Dictionary of ROI name -> (x, y, w, h) relative to the cell
     """
-    H, W = cell_img.shape[:2]
-    
     # Define ROI dimensions
     top_h = int(0.25 * H)
     bot_h = int(0.25 * H)
     side_w = int(0.35 * W)
     
     # Define ROIs: (x, y, w, h)
-    rois = {
+    return {
         'pos': (0, 0, side_w, top_h),
         'bye': (W - side_w, 0, side_w, top_h),
         'lastname': (int(0.10 * W), int(0.30 * H), int(0.80 * W), int(0.40 * H)),
         'team': (0, H - bot_h, side_w, bot_h),
         'firstname': (W - side_w, H - bot_h, side_w, bot_h),
     }
-    
-    def crop(roi):
-        x, y, w, h = roi
-        return cell_img[y:y+h, x:x+w]
-    
-    # Standard pipeline with neutral Otsu per-ROI
-    pos_text = ocr(neutral_otsu(crop(rois['pos']), invert=True, antimerge=False, return_bgr=False), psm=7, whitelist="QBWRTEDSTK")
-    bye_text = ocr(neutral_otsu(crop(rois['bye']), invert=True, antimerge=False, return_bgr=False), psm=7, whitelist="BYE 0123456789")
-    last_text = ocr(neutral_otsu(crop(rois['lastname']), invert=True, antimerge=False, return_bgr=False), psm=7)
-    team_text = ocr(neutral_otsu(crop(rois['team']), invert=True, antimerge=False, return_bgr=False), psm=7)
-    first_text = ocr(neutral_otsu(crop(rois['firstname']), invert=True, antimerge=False, return_bgr=False), psm=7)
-    
-    # Extract bye digits
-    bye_digits = None
-    m = re.search(r'(\d{1,2})', bye_text.replace(" ", ""))
-    if m:
-        bye_digits = int(m.group(1))
-    
+
+def _parse_bye(bye_text: str) -> Optional[int]:
+    """Extract bye week digits from ROI text."""
+    m = re.search(r'(\d{1,2})', (bye_text or '').replace(" ", ""))
+    return int(m.group(1)) if m else None
+
+def build_roi_result(texts: Dict[str, str], cell_img, hsv=None) -> Dict:
+    """Assemble the read_cell output dict from per-ROI texts."""
     # Get color-based position from dominant non-white color
-    hsv_pos = dominant_nonwhite_hsv(cell_img)
+    hsv_pos = hsv if hsv is not None else dominant_nonwhite_hsv(cell_img)
     color_pos = pos_from_color(hsv_pos)
     
     return {
-        'ocr_pos': pos_text,
+        'ocr_pos': texts['pos'],
         'color_pos': color_pos,
-        'ocr_bye': bye_digits,
-        'ocr_last': last_text,
-        'ocr_team': team_text,
-        'ocr_first': first_text
+        'ocr_bye': _parse_bye(texts['bye']),
+        'ocr_last': texts['lastname'],
+        'ocr_team': texts['team'],
+        'ocr_first': texts['firstname']
     }
 
-def read_cell_whole(cell_img: np.ndarray) -> Dict:
+def roi_binaries(cell_img, planes: Optional[CellPlanes] = None, binarize: Optional[str] = None,
+                 names=ROI_NAMES, invert: bool = True, antimerge: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Binarized ROIs of a cell, keyed by ROI name.
+    
+    Args:
+        cell_img: Cell image
+        planes: Precomputed CellPlanes of the cell (built if None and binarizing per cell)
+        binarize: 'cell' (ROIs are views of the binarized cell) or 'roi'
+                  (neutral_otsu per ROI crop); default ROI_BINARIZE
+        names: ROIs to return (default all, in ROI_NAMES order)
+        invert, antimerge: neutral_otsu options
+    """
+    H, W = cell_img.shape[:2]
+    rois = cell_roi_boxes(H, W)
+    if (binarize or ROI_BINARIZE) == 'roi':
+        binaries = {}
+        for name in names:
+            x, y, w, h = rois[name]
+            binaries[name] = neutral_otsu(cell_img[y:y+h, x:x+w], invert=invert, antimerge=antimerge)
+        return binaries
+    planes = planes if planes is not None else CellPlanes(cell_img)
+    return {name: planes.roi(rois[name], invert, antimerge) for name in names}
+
+def read_rois(cell_img, names=ROI_NAMES, planes: Optional[CellPlanes] = None,
+              invert: bool = True, antimerge: bool = False) -> Dict[str, str]:
+    """OCR text of the given ROIs (one single-line pass each, with the ROI whitelists)."""
+    binaries = roi_binaries(cell_img, planes, names=names, invert=invert, antimerge=antimerge)
+    return {name: ocr(binaries[name], psm=7, whitelist=ROI_WHITELISTS.get(name)) for name in names}
+
+def read_cell(cell_img, hsv=None, planes: Optional[CellPlanes] = None):
+    """
+    Read a single cell/sticker with ROI strategy.
+    
+    Args:
+        cell_img: Cell image
+        hsv: Precomputed dominant non-white HSV of the cell (computed if None)
+        planes: Precomputed CellPlanes of the cell, e.g. shared with read_cell_whole
+    
+    Returns:
+        Dictionary with OCR results and color-based position
+    """
+    return build_roi_result(read_rois(cell_img, planes=planes), cell_img, hsv)
+
+def filter_whitelist(text: str, whitelist: Optional[str]) -> str:
+    """
+    Post-filter OCR text to a character whitelist (replaces tessedit_char_whitelist).
+    Text is upper-cased first, since the whitelists are upper case and Tesseract's
+    own whitelist mapped lowercase reads like "qb" onto them rather than dropping them.
+    """
+    if not whitelist:
+        return text
+    allowed = set(whitelist)
+    return "".join(ch for ch in text.upper() if ch in allowed).strip()
+
+def read_cells_composite(cell_imgs, hsvs=None, cells_per_page: int = 20, gap: int = 12):
+    """
+    Batched ROI strategy: tile the binarized ROIs of many cells into composite pages,
+    one ROI per band separated by blank rows, and run a single image_to_data pass per page.
+    Word boxes are mapped back to their source ROI by vertical position.
+    
+    Args:
+        cell_imgs: List of cell images
+        hsvs: Optional list of precomputed dominant HSVs aligned with cell_imgs
+        cells_per_page: Number of cells tiled into one composite page
+        gap: Blank separator height (and side padding) in pixels
+    
+    Returns:
+        List of dictionaries in the read_cell format
+    """
+    results = []
+    for start in range(0, len(cell_imgs), max(1, cells_per_page)):
+        page_cells = cell_imgs[start:start + cells_per_page]
+        
+        # Binarize every ROI and lay them out as horizontal bands
+        tiles = []  # (cell_offset, roi_name, binary)
+        for k, cell_img in enumerate(page_cells):
+            for name, binary in roi_binaries(cell_img).items():
+                tiles.append((k, name, binary))
+        
+        page_w = max(t[2].shape[1] for t in tiles) + 2 * gap
+        page_h = gap + sum(t[2].shape[0] + gap for t in tiles)
+        page = np.full((page_h, page_w), 255, np.uint8)
+        band_tops = []
+        y0 = gap
+        for _, _, binary in tiles:
+            h, w = binary.shape[:2]
+            page[y0:y0+h, gap:gap+w] = binary
+            band_tops.append(y0)
+            y0 += h + gap
+        
+        # One OCR pass for the whole page; assign words to bands by vertical center
+        data = ocr_engine.image_to_data(page, psm=4)
+        words = [[] for _ in tiles]
+        for text, left, top, height in zip(data.get('text', []), data.get('left', []),
+                                           data.get('top', []), data.get('height', [])):
+            if not text or not text.strip():
+                continue
+            band = int(np.searchsorted(band_tops, top + height / 2.0, side='right')) - 1
+            if band >= 0:
+                words[band].append((left, text.strip()))
+        
+        texts = [{} for _ in page_cells]
+        for (k, name, _), band_words in zip(tiles, words):
+            # Each band holds a single text line: order words left to right
+            band_words.sort()
+            text = " ".join(w for _, w in band_words)
+            texts[k][name] = filter_whitelist(text, ROI_WHITELISTS.get(name))
+        
+        for k, cell_img in enumerate(page_cells):
+            hsv = hsvs[start + k] if hsvs is not None else None
+            results.append(build_roi_result(texts[k], cell_img, hsv))
+    return results
+
+def read_cell_composite(cell_img, hsv=None):
+    """Single-cell composite read: the five ROIs in one OCR call (see read_cells_composite)."""
+    return read_cells_composite([cell_img], None if hsv is None else [hsv])[0]
+
+def read_cell_whole(cell_img: np.ndarray, planes: Optional[CellPlanes] = None) -> Dict:
     """
     Whole-cell OCR approach: run OCR once on entire preprocessed cell
     and parse expected fields from the combined text/tokens.
     Color/HSV should be computed on the original image outside this function.
+    planes: Precomputed CellPlanes of the cell, e.g. shared with read_cell.
     """
     # Preprocess for OCR
-    cell_ocr = neutral_otsu(cell_img, invert=True, antimerge=False, return_bgr=False)
+    planes = planes if planes is not None else CellPlanes(cell_img)
+    cell_ocr = planes.binary(invert=True, antimerge=False)
 
     # Use Tesseract to get tokens with confidences
     try:
-        from pytesseract import Output
-        data = pytesseract.image_to_data(cell_ocr, config='--psm 6', output_type=Output.DICT)
+        data = ocr_engine.image_to_data(cell_ocr, psm=6)
         texts = [t.strip() for t in data.get('text', []) if t and t.strip()]
     except Exception:
         # Fallback to simple OCR if detailed data not available
         texts = [ocr(cell_ocr, psm=6)]
 
+    return parse_whole_tokens(texts)
+
+def parse_whole_tokens(texts) -> Dict:
+    """
+    Parse whole-cell OCR tokens into the read_cell_whole fields
+    (position, bye, team and first/last name candidates).
+    """
     all_text = " ".join(texts)
 
     # Parse BYE
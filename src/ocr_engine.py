@@ -0,0 +1,217 @@
+"""
+Pluggable OCR backends.
+
+Every pytesseract call forks a `tesseract` process, writes a temp image and
+reloads the traineddata. The tesserocr backend instead keeps one warm
+PyTessBaseAPI per worker thread and feeds it numpy buffers directly.
+Backend selection: OCR_BACKEND=auto|tesserocr|pytesseract (auto prefers tesserocr).
+Results are memoized in an OCRCache (OCR_CACHE_SIZE entries, optional OCR_CACHE_DIR).
+Process-pool workers each hold a copy of the cache whose memory tier dies with the
+pool, so only OCR_CACHE_DIR carries results across boards there; their lookup
+counters are merged back into the parent's (see merge_cache_counts).
+"""
+import os
+import threading
+import numpy as np
+import pytesseract
+from typing import Callable, Dict, Optional
+from ocr_cache import OCRCache
+
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+DATA_KEYS = ('level', 'page_num', 'block_num', 'par_num', 'line_num', 'word_num',
+             'left', 'top', 'width', 'height', 'conf', 'text')
+
+
+class PytesseractBackend:
+    """Subprocess-per-call backend (original behaviour)."""
+    name = 'pytesseract'
+
+    def _config(self, psm: int, whitelist: Optional[str]) -> str:
+        cfg = f'--psm {psm}'
+        if whitelist:
+            cfg += f' -c tessedit_char_whitelist="{whitelist}"'
+        return cfg
+
+    def image_to_string(self, img: np.ndarray, psm: int = 7, whitelist: Optional[str] = None) -> str:
+        return pytesseract.image_to_string(img, config=self._config(psm, whitelist)).strip()
+
+    def image_to_data(self, img: np.ndarray, psm: int = 6, whitelist: Optional[str] = None) -> Dict[str, list]:
+        return pytesseract.image_to_data(img, config=self._config(psm, whitelist),
+                                         output_type=pytesseract.Output.DICT)
+
+
+class TesserocrBackend:
+    """Long-lived in-process Tesseract engine fed straight from numpy buffers."""
+    name = 'tesserocr'
+
+    def __init__(self, lang: str = 'eng'):
+        if tesserocr is None:
+            raise ImportError("tesserocr is not installed")
+        kwargs = {'lang': lang}
+        tessdata = os.environ.get('TESSDATA_PREFIX')
+        if tessdata:
+            kwargs['path'] = tessdata
+        self.api = tesserocr.PyTessBaseAPI(**kwargs)
+
+    def _set_image(self, img: np.ndarray, psm: int, whitelist: Optional[str]):
+        if img.ndim == 3:
+            # Tesseract expects RGB ordering for 3-channel buffers
+            img = img[:, :, ::-1]
+        img = np.ascontiguousarray(img, dtype=np.uint8)
+        h, w = img.shape[:2]
+        bpp = 1 if img.ndim == 2 else img.shape[2]
+
+        self.api.SetPageSegMode(psm)
+        self.api.SetVariable('tessedit_char_whitelist', whitelist or '')
+        self.api.SetImageBytes(img.tobytes(), w, h, bpp, w * bpp)
+
+    def image_to_string(self, img: np.ndarray, psm: int = 7, whitelist: Optional[str] = None) -> str:
+        self._set_image(img, psm, whitelist)
+        return (self.api.GetUTF8Text() or '').strip()
+
+    def image_to_data(self, img: np.ndarray, psm: int = 6, whitelist: Optional[str] = None) -> Dict[str, list]:
+        """Word-level results in the same layout as pytesseract's Output.DICT."""
+        self._set_image(img, psm, whitelist)
+        self.api.Recognize()
+
+        data = {k: [] for k in DATA_KEYS}
+        it = self.api.GetIterator()
+        if it is None:
+            return data
+
+        RIL = tesserocr.RIL
+        block = par = line = word = 0
+        for r in tesserocr.iterate_level(it, RIL.WORD):
+            if r.IsAtBeginningOf(RIL.BLOCK):
+                block, par, line = block + 1, 0, 0
+            if r.IsAtBeginningOf(RIL.PARA):
+                par, line = par + 1, 0
+            if r.IsAtBeginningOf(RIL.TEXTLINE):
+                line, word = line + 1, 0
+            word += 1
+
+            text = r.GetUTF8Text(RIL.WORD)
+            box = r.BoundingBox(RIL.WORD)
+            if text is None or box is None:
+                continue
+            x1, y1, x2, y2 = box
+            data['level'].append(5)
+            data['page_num'].append(1)
+            data['block_num'].append(block)
+            data['par_num'].append(par)
+            data['line_num'].append(line)
+            data['word_num'].append(word)
+            data['left'].append(x1)
+            data['top'].append(y1)
+            data['width'].append(x2 - x1)
+            data['height'].append(y2 - y1)
+            data['conf'].append(r.Confidence(RIL.WORD))
+            data['text'].append(text)
+        return data
+
+
+_BACKENDS: Dict[str, Callable[[], object]] = {
+    'pytesseract': PytesseractBackend,
+    'tesserocr': TesserocrBackend,
+}
+
+_backend_name = os.environ.get('OCR_BACKEND', 'auto')
+_generation = 0
+_local = threading.local()
+
+
+def register_backend(name: str, factory: Callable[[], object]):
+    """Register an OCR backend factory exposing image_to_string/image_to_data."""
+    _BACKENDS[name] = factory
+
+
+def set_backend(name: str):
+    """Switch backend for all workers; engines are recreated lazily per thread."""
+    global _backend_name, _generation
+    if name != 'auto' and name not in _BACKENDS:
+        raise ValueError(f"Unknown OCR backend: {name}")
+    _backend_name = name
+    _generation += 1
+
+
+def _create_engine():
+    if _backend_name == 'auto':
+        if tesserocr is not None:
+            try:
+                return TesserocrBackend()
+            except Exception as e:
+                print(f"[ocr_engine] tesserocr unavailable ({e}); falling back to pytesseract")
+        return PytesseractBackend()
+    return _BACKENDS[_backend_name]()
+
+
+def get_engine():
+    """Return this worker's warm OCR engine, creating it on first use."""
+    engine = getattr(_local, 'engine', None)
+    if engine is None or getattr(_local, 'generation', None) != _generation:
+        engine = _create_engine()
+        _local.engine = engine
+        _local.generation = _generation
+    return engine
+
+
+def _make_cache() -> Optional[OCRCache]:
+    size = int(os.environ.get('OCR_CACHE_SIZE', 4096))
+    disk_dir = os.environ.get('OCR_CACHE_DIR') or None
+    if size <= 0 and not disk_dir:
+        return None
+    return OCRCache(max_entries=size, disk_dir=disk_dir)
+
+
+_cache = _make_cache()
+
+
+def configure_cache(max_entries: int = 4096, disk_dir: Optional[str] = None):
+    """Replace the OCR result cache; max_entries=0 without disk_dir disables caching."""
+    global _cache
+    _cache = OCRCache(max_entries, disk_dir) if (max_entries > 0 or disk_dir) else None
+
+
+def get_cache() -> Optional[OCRCache]:
+    return _cache
+
+
+def cache_stats() -> Dict:
+    return _cache.stats() if _cache is not None else {'enabled': False}
+
+
+def cache_counts() -> Optional[tuple]:
+    """(hits, disk_hits, misses) of this process's cache, None if caching is off."""
+    return _cache.counts() if _cache is not None else None
+
+
+def merge_cache_counts(counts: Optional[tuple]):
+    """Add a worker process's cache_counts() delta to this process's counters."""
+    if _cache is not None and counts:
+        _cache.add_counts(*counts)
+
+
+def _cached(kind: str, img: np.ndarray, psm: int, whitelist: Optional[str], run: Callable):
+    engine = get_engine()
+    if _cache is None:
+        return run(engine)
+    key = OCRCache.make_key(img, kind, psm, whitelist, getattr(engine, 'name', type(engine).__name__))
+    value = _cache.get(key)
+    if value is None:
+        value = run(engine)
+        _cache.put(key, value)
+    return value
+
+
+def image_to_string(img: np.ndarray, psm: int = 7, whitelist: Optional[str] = None) -> str:
+    return _cached('string', img, psm, whitelist,
+                   lambda engine: engine.image_to_string(img, psm=psm, whitelist=whitelist))
+
+
+def image_to_data(img: np.ndarray, psm: int = 6, whitelist: Optional[str] = None) -> Dict[str, list]:
+    return _cached('data', img, psm, whitelist,
+                   lambda engine: engine.image_to_data(img, psm=psm, whitelist=whitelist))
@@ -0,0 +1,241 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from functools import partial
+from typing import Callable, Dict, List, Optional, Sequence
+import numpy as np
+import ocr_engine
+from ocr_cell import (CellPlanes, read_cell, read_cell_whole, read_cells_composite, dominant_nonwhite_hsv,
+                      dominant_hsv_for_cells, parse_whole_tokens)
+from board_ocr import board_strips, strip_words, words_to_roi_result, words_to_whole_result
+from staged_ocr import AdaptiveCellReader, StagedCellReader
+from vocab_ocr import ClosedVocabularyReader
+
+# Worker pool defaults; overridable per call
+DEFAULT_WORKERS = int(os.environ.get('OCR_WORKERS', os.cpu_count() or 1))
+DEFAULT_EXECUTOR = os.environ.get('OCR_EXECUTOR', 'thread')  # 'thread' or 'process'
+DEFAULT_OCR_MODE = os.environ.get('OCR_MODE', 'separate')  # 'separate', 'composite', 'board', 'staged', 'adaptive' or 'vocab'
+
+
+def ocr_cell_bundle(cell_img: np.ndarray, whole: bool = True, roi: bool = True, hsv=None) -> Dict:
+    """
+    Run every per-cell step that does not depend on other cells.
+
+    Args:
+        cell_img: Cell image (BGR)
+        whole: Also run the whole-cell OCR strategy
+        roi: Run the per-ROI strategy (skipped when ROIs are read in composite pages or board passes)
+        hsv: Precomputed dominant HSV (computed from the cell if None)
+
+    Returns:
+        {'roi': read_cell dict or None, 'whole': read_cell_whole dict or None, 'hsv': dominant HSV}
+    """
+    if hsv is None:
+        hsv = dominant_nonwhite_hsv(cell_img)
+    # One enhancement/threshold pass shared by the ROI and whole-cell readers
+    planes = CellPlanes(cell_img) if (roi or whole) else None
+    return {
+        'roi': read_cell(cell_img, hsv=hsv, planes=planes) if roi else None,
+        'whole': read_cell_whole(cell_img, planes=planes) if whole else None,
+        'hsv': hsv,
+    }
+
+
+def _run_tasks(task: Callable, items: List, workers: int, executor: str,
+               progress: Optional[Callable[[int, int], None]] = None) -> List:
+    """Map task over items in a thread/process pool, preserving order."""
+    total = len(items)
+    if workers <= 1 or total <= 1:
+        out = []
+        for i, item in enumerate(items):
+            out.append(task(item))
+            if progress:
+                progress(i + 1, total)
+        return out
+
+    process = executor == 'process'
+    pool_cls = ProcessPoolExecutor if process else ThreadPoolExecutor
+    out: List = [None] * total
+    with pool_cls(max_workers=min(workers, total)) as pool:
+        # Process workers report their OCR cache lookups back with each result
+        futures = {pool.submit(partial(_counted, task) if process else task, item): i
+                   for i, item in enumerate(items)}
+        for done, fut in enumerate(as_completed(futures), start=1):
+            if process:
+                out[futures[fut]], counts = fut.result()
+                ocr_engine.merge_cache_counts(counts)
+            else:
+                out[futures[fut]] = fut.result()
+            if progress:
+                progress(done, total)
+    return out
+
+
+def _counted(task: Callable, item):
+    """task(item) plus the change in this process's OCR cache counters."""
+    before = ocr_engine.cache_counts()
+    value = task(item)
+    after = ocr_engine.cache_counts()
+    return value, (tuple(a - b for a, b in zip(after, before)) if before and after else None)
+
+
+def ocr_board_cells(rectified_image: np.ndarray, cells: List[tuple],
+                    whole: bool = True, workers: Optional[int] = None,
+                    executor: Optional[str] = None,
+                    progress: Optional[Callable[[int, int], None]] = None,
+                    ocr_mode: Optional[str] = None, cells_per_page: int = 20,
+                    strip_rows: Optional[int] = 4, empty: Optional[Sequence[bool]] = None,
+                    staged: Optional[StagedCellReader] = None,
+                    adaptive: Optional[AdaptiveCellReader] = None,
+                    vocab: Optional[ClosedVocabularyReader] = None) -> List[Dict]:
+    """
+    OCR phase for a whole board: run ocr_cell_bundle on every cell in a worker pool.
+    Reconciliation is order-dependent (used_players) and runs afterwards over this table.
+
+    Args:
+        rectified_image: Rectified board image
+        cells: List of cell ROIs (row, col, x, y, w, h)
+        whole: Also run the whole-cell OCR strategy
+        workers: Pool size (default OCR_WORKERS env or CPU count); 1 runs inline
+        executor: 'thread' (default, OCR/OpenCV release the GIL) or 'process'
+        progress: Optional callback(done, total)
+        ocr_mode: 'separate' (one OCR call per ROI), 'composite' (ROIs of
+                  cells_per_page cells tiled into one OCR page) or 'board'
+                  (one OCR pass per strip of strip_rows rows, words assigned to
+                  cells/ROIs; also provides the whole-cell dicts), 'staged'
+                  (staged reader: more OCR only while the match is ambiguous),
+                  'adaptive' (both strategies on a sample, then the dominant one) or
+                  'vocab' (no Tesseract: ROIs matched against rendered player names)
+        cells_per_page: Cells per composite page
+        strip_rows: Grid rows per board-mode OCR pass (None = whole board)
+        empty: Optional flags aligned with cells (see grid.detect_empty_cells); empty
+               cells are not OCR'd and get blank OCR dicts and 'empty': True
+        staged: StagedCellReader for 'staged' mode (given a reader, 'staged' is the default);
+                bundles also carry the 'tier' the cell stopped at
+        adaptive: AdaptiveCellReader for 'adaptive' mode (given a reader, 'adaptive' is the
+                  default); sampled bundles are marked 'sample', see staged_ocr.strategy_stats
+        vocab: ClosedVocabularyReader for 'vocab' mode (given a reader, 'vocab' is the default);
+               no whole-cell dicts are produced
+
+    Returns:
+        List of bundles aligned with cells
+    """
+    workers = DEFAULT_WORKERS if workers is None else workers
+    executor = executor or DEFAULT_EXECUTOR
+    ocr_mode = ocr_mode or ('staged' if staged is not None else
+                            'adaptive' if adaptive is not None else
+                            'vocab' if vocab is not None else DEFAULT_OCR_MODE)
+    if ocr_mode == 'staged' and staged is None:
+        raise ValueError("ocr_mode 'staged' needs a StagedCellReader")
+    if ocr_mode == 'adaptive' and adaptive is None:
+        raise ValueError("ocr_mode 'adaptive' needs an AdaptiveCellReader")
+    if ocr_mode == 'vocab' and vocab is None:
+        raise ValueError("ocr_mode 'vocab' needs a ClosedVocabularyReader")
+    crops = [rectified_image[y:y+h, x:x+w] for (_, _, x, y, w, h) in cells]
+    # Dominant colors for all cells in one board-wide pass
+    hsvs = [tuple(map(float, hsv)) for hsv in dominant_hsv_for_cells(rectified_image, cells)]
+    items = list(zip(crops, hsvs))
+    # Empty cells get blank bundles up front; only the filled ones are OCR'd
+    table: List[Optional[Dict]] = [
+        empty_bundle(hsv, whole=whole) if empty is not None and empty[i] else None
+        for i, hsv in enumerate(hsvs)
+    ]
+    filled = [i for i, bundle in enumerate(table) if bundle is None]
+
+    if ocr_mode == 'board':
+        filled_set = set(filled)
+        strips = [[i for i in strip if i in filled_set] for strip in board_strips(cells, strip_rows)]
+        strip_task = partial(strip_words, rectified_image, cells)
+        words = {}
+        for strip in _run_tasks(strip_task, [s for s in strips if s], workers, executor, progress):
+            words.update(strip)
+        for i in filled:
+            table[i] = {
+                'roi': words_to_roi_result(words[i], crops[i], hsvs[i]),
+                'whole': words_to_whole_result(words[i]) if whole else None,
+                'hsv': hsvs[i],
+            }
+        return table
+
+    if ocr_mode == 'staged':
+        colors = staged.classify([hsvs[i] for i in filled])
+        items = [(crops[i], cells[i][0], cells[i][1], hsvs[i], color) for i, color in zip(filled, colors)]
+        for i, bundle in zip(filled, _run_tasks(partial(_staged_item, staged), items, workers, executor, progress)):
+            table[i] = bundle
+        return table
+
+    if ocr_mode == 'vocab':
+        for i, bundle in zip(filled, _run_tasks(partial(_vocab_item, vocab), [items[i] for i in filled],
+                                                workers, executor, progress)):
+            table[i] = bundle
+        return table
+
+    if ocr_mode == 'adaptive':
+        colors = adaptive.classify([hsvs[i] for i in filled])
+        items = {i: (crops[i], cells[i][0], cells[i][1], hsvs[i], color) for i, color in zip(filled, colors)}
+        # Calibration sample with both strategies, then the rest with the dominant one
+        sample = [filled[k] for k in adaptive.sample(len(filled))]
+        sample_progress = (lambda done, total: progress(done, len(filled))) if progress else None
+        sample_task = partial(_adaptive_item, adaptive, ('roi', 'whole'))
+        for i, bundle in zip(sample, _run_tasks(sample_task, [items[i] for i in sample], workers, executor,
+                                                sample_progress)):
+            bundle['sample'] = True
+            table[i] = bundle
+        dominant = adaptive.choose([table[i] for i in sample])
+        rest = [i for i in filled if table[i] is None]
+        rest_progress = (lambda done, total: progress(len(sample) + done, len(filled))) if progress else None
+        rest_task = partial(_adaptive_item, adaptive, (dominant,) if dominant else ('roi', 'whole'))
+        for i, bundle in zip(rest, _run_tasks(rest_task, [items[i] for i in rest], workers, executor,
+                                              rest_progress)):
+            table[i] = bundle
+        return table
+
+    composite = ocr_mode == 'composite'
+    task = partial(_bundle_item, whole=whole, roi=not composite)
+    for i, bundle in zip(filled, _run_tasks(task, [items[i] for i in filled], workers, executor, progress)):
+        table[i] = bundle
+
+    if composite:
+        pages = [
+            ([crops[i] for i in filled[k:k + cells_per_page]], [hsvs[i] for i in filled[k:k + cells_per_page]])
+            for k in range(0, len(filled), cells_per_page)
+        ]
+        page_results = _run_tasks(_read_composite_page, pages, workers, executor)
+        roi_results = [r for page in page_results for r in page]
+        for i, roi_result in zip(filled, roi_results):
+            table[i]['roi'] = roi_result
+    return table
+
+
+def empty_bundle(hsv, whole: bool = True) -> Dict:
+    """ocr_cell_bundle-shaped entry for an empty cell: blank OCR fields, no OCR run."""
+    return {
+        'roi': {'ocr_pos': '', 'color_pos': None, 'ocr_bye': None, 'ocr_last': '', 'ocr_team': '', 'ocr_first': ''},
+        'whole': parse_whole_tokens([]) if whole else None,
+        'hsv': hsv,
+        'empty': True,
+    }
+
+
+def _bundle_item(item, whole: bool, roi: bool) -> Dict:
+    cell_img, hsv = item
+    return ocr_cell_bundle(cell_img, whole=whole, roi=roi, hsv=hsv)
+
+
+def _staged_item(reader, item) -> Dict:
+    cell_img, row, col, hsv, color_pos = item
+    return reader.read(cell_img, row, col, hsv, color_pos)
+
+
+def _vocab_item(reader, item) -> Dict:
+    cell_img, hsv = item
+    return {'roi': reader.read(cell_img, hsv), 'whole': None, 'hsv': hsv}
+
+
+def _adaptive_item(reader, plan, item) -> Dict:
+    cell_img, row, col, hsv, color_pos = item
+    return reader.read(cell_img, row, col, hsv, color_pos, plan)
+
+
+def _read_composite_page(page) -> List[Dict]:
+    page_cells, hsvs = page
+    return read_cells_composite(page_cells, hsvs, cells_per_page=len(page_cells))
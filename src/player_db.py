@@ -0,0 +1,129 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from typing import Dict, Optional, Tuple
+from reconcile import Player, PlayerIndex, load_players
+
+SNAPSHOT_VERSION = 1
+
+
+def _file_hash(path: str) -> str:
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class PlayerDatabase:
+    """
+    Process-wide player index, loaded once and shared by every request.
+
+    get() only stats the CSV: an unchanged (mtime, size) returns the current
+    index; a changed one is confirmed by content hash before reloading. Reloads
+    build a new immutable PlayerIndex and swap the reference atomically, so
+    requests holding the previous index finish undisturbed. A pickle snapshot
+    next to the CSV (<csv>.players.pkl) skips CSV parsing on cold start.
+    """
+
+    def __init__(self, csv_path: str, snapshot_path: Optional[str] = None):
+        self.csv_path = csv_path
+        self.snapshot_path = snapshot_path or csv_path + '.players.pkl'
+        self._lock = threading.Lock()
+        self._index: Optional[PlayerIndex] = None
+        self._stat: Optional[Tuple[int, int]] = None
+        self._hash: Optional[str] = None
+        self.reloads = 0
+
+    def _current_stat(self) -> Tuple[int, int]:
+        st = os.stat(self.csv_path)
+        return st.st_mtime_ns, st.st_size
+
+    def get(self) -> PlayerIndex:
+        """Current player index, reloading first if the CSV content changed."""
+        stat = self._current_stat()
+        index = self._index
+        if index is not None and stat == self._stat:
+            return index
+        with self._lock:
+            if self._index is None or stat != self._stat:
+                self._refresh(stat)
+            return self._index
+
+    def _refresh(self, stat: Tuple[int, int]):
+        if self._index is None:
+            snapshot = self._read_snapshot()
+            if snapshot is not None and snapshot['stat'] == stat:
+                self._swap(PlayerIndex(Player(*p) for p in snapshot['players']), stat, snapshot['hash'])
+                return
+
+        digest = _file_hash(self.csv_path)
+        if self._index is not None and digest == self._hash:
+            # Touched but unchanged
+            self._stat = stat
+            return
+
+        snapshot = self._read_snapshot() if self._index is None else None
+        if snapshot is not None and snapshot['hash'] == digest:
+            index = PlayerIndex(Player(*p) for p in snapshot['players'])
+        elif self._index is None:
+            index = load_players(self.csv_path)
+        else:
+            try:
+                index = load_players(self.csv_path)
+            except (OSError, ValueError, KeyError) as e:
+                # Keep serving the previous index; retry once the file changes again
+                print(f"[player_db] reload of {self.csv_path} failed ({e}); keeping previous players")
+                self._stat = stat
+                return
+        self._swap(index, stat, digest)
+        self._write_snapshot(index, stat, digest)
+
+    def _swap(self, index: PlayerIndex, stat: Tuple[int, int], digest: str):
+        self._index, self._stat, self._hash = index, stat, digest
+        self.reloads += 1
+
+    def _read_snapshot(self) -> Optional[Dict]:
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                snapshot = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return None
+        if not isinstance(snapshot, dict) or snapshot.get('version') != SNAPSHOT_VERSION:
+            return None
+        return snapshot
+
+    def _write_snapshot(self, index: PlayerIndex, stat: Tuple[int, int], digest: str):
+        snapshot = {
+            'version': SNAPSHOT_VERSION,
+            'stat': stat,
+            'hash': digest,
+            'players': [(p.first, p.last, p.team, p.pos, p.bye, p.is_dst) for p in index],
+        }
+        try:
+            # Atomic write so concurrent readers never see a partial snapshot
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.snapshot_path) or '.', suffix='.tmp')
+        except OSError:
+            return  # read-only data directory: run without a snapshot
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.snapshot_path)
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+
+_databases: Dict[str, PlayerDatabase] = {}
+_databases_lock = threading.Lock()
+
+
+def get_player_db(csv_path: str) -> PlayerDatabase:
+    """Shared PlayerDatabase for csv_path."""
+    key = os.path.abspath(csv_path)
+    with _databases_lock:
+        if key not in _databases:
+            _databases[key] = PlayerDatabase(csv_path)
+        return _databases[key]
@@ -1,8 +1,15 @@
-import pandas as pd
+import csv
+import os
 import re
+import heapq
+import numpy as np
+from collections.abc import Sequence
 from dataclasses import dataclass
+from types import MappingProxyType
 from rapidfuzz import fuzz
-from typing import List, Tuple, Optional
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, Iterable, List, NamedTuple, Tuple, Optional
 from ocr_cell import normalize_team, clean_pos_text
 import math  # at the top with your other imports
 
@@ -29,7 +36,7 @@ def player_identity(p: Player) -> Tuple[str, str, str, str, int]:
     """
     return (p.first, p.last, p.team, p.pos, p.bye)
 
-def load_players(csv_path: str) -> List[Player]:
+def load_players(csv_path: str) -> "PlayerIndex":
     """
     Load players from CSV into canonical lookup table.
     
@@ -37,18 +44,19 @@ def load_players(csv_path: str) -> List[Player]:
         csv_path: Path to the CSV file
     
     Returns:
-        List of Player objects
+        PlayerIndex over the Player objects (in CSV/ADP order)
     """
-    df = pd.read_csv(csv_path)
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
     players = []
     
-    for _, row in df.iterrows():
-        player_name = str(row.get('PLAYER NAME', ''))
-        team = str(row.get('TEAM', '')).upper()
-        pos = str(row.get('POS', '')).upper()
+    for row in rows:
+        player_name = row.get('PLAYER NAME') or ''
+        team = (row.get('TEAM') or '').upper()
+        pos = (row.get('POS') or '').upper()
         
         # Handle bye week - can be '-' for free agents
-        bye_week_str = str(row.get('BYE WEEK', '0'))
+        bye_week_str = (row.get('BYE WEEK') or '0').strip()
         if bye_week_str == '-' or bye_week_str == '':
             bye_week = 0  # Default for free agents
         else:
@@ -84,7 +92,7 @@ def load_players(csv_path: str) -> List[Player]:
                 is_dst=False
             ))
     
-    return players
+    return PlayerIndex(players)
 
 def normalize_name(s: str) -> str:
     """
@@ -108,6 +116,184 @@ def normalize_name(s: str) -> str:
     
     return s.strip()
 
+POSITIONS = ('QB', 'RB', 'WR', 'TE', 'K', 'DST')
+
+
+def _frozen(values, dtype) -> np.ndarray:
+    arr = np.asarray(values, dtype=dtype)
+    arr.setflags(write=False)
+    return arr
+
+
+_NO_INDICES = _frozen([], np.intp)
+
+
+# Share of an OCR'd last name's trigrams a player must have to be in its block,
+# and the most players kept (those sharing the most trigrams)
+BLOCK_MIN_SHARE = 1 / 3
+BLOCK_LIMIT = 64
+# Whether the production matchers (ScoreMatrix, staged/adaptive readers) score only the block
+MATCH_BLOCKING = os.environ.get('MATCH_BLOCKING', '0') == '1'
+
+
+def last_name_trigrams(name: str) -> set:
+    """Trigrams of a normalized name, padded so short names and word edges count."""
+    padded = f" {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)} if name else set()
+
+
+def _token_set_key(s: str) -> str:
+    """Sorted, de-duplicated tokens of s, as token_set_ratio compares them."""
+    return " ".join(sorted(set(s.split())))
+
+
+def _char_counts(s: str) -> np.ndarray:
+    # latin-1 with replacement keeps one byte per character; merging other characters
+    # into '?' can only raise the overlap, so ceilings stay upper bounds
+    return np.bincount(np.frombuffer(s.encode('latin-1', 'replace'), dtype=np.uint8), minlength=256)
+
+
+class _TokenIndex:
+    """Token map, token-set lengths and character counts of a name column, for token_set_ratio ceilings."""
+
+    def __init__(self, names: Sequence):
+        keys = [_token_set_key(name) for name in names]
+        self.lengths = _frozen([len(key) for key in keys], np.float64)
+        self.char_counts = _frozen(np.array([_char_counts(key) for key in keys]).reshape(len(keys), 256), np.uint16)
+        by_token: Dict[str, List[int]] = {}
+        for i, name in enumerate(names):
+            for token in set(name.split()):
+                by_token.setdefault(token, []).append(i)
+        self.by_token = MappingProxyType({token: _frozen(ix, np.intp) for token, ix in by_token.items()})
+
+    def ceiling(self, guess: str, cand: np.ndarray) -> np.ndarray:
+        """
+        Upper bound of fuzz.token_set_ratio(guess, name) for the names at cand.
+
+        Names sharing a token with guess may score 100. Otherwise the ratio is the
+        Indel similarity of the two token-set strings, and their longest common
+        subsequence is at most the overlap of their character counts.
+        """
+        key = _token_set_key(guess)
+        if not key:
+            return np.zeros(len(cand))
+        counts = _char_counts(key)
+        chars = np.flatnonzero(counts)
+        overlap = np.minimum(self.char_counts[np.ix_(cand, chars)], counts[chars]).sum(axis=1)
+        lengths = self.lengths[cand]
+        ceiling = np.where(lengths > 0, 200.0 * overlap / (lengths + len(key)), 0.0)
+        shared = np.zeros(len(self.lengths), dtype=bool)
+        for token in key.split():
+            shared[self.by_token.get(token, _NO_INDICES)] = True
+        return np.where(shared[cand], 100.0, ceiling)
+
+
+class PlayerIndex(Sequence):
+    """
+    Immutable, precomputed player lookup structure.
+
+    Behaves like the read-only list of players (CSV/ADP order) and adds
+    everything the matchers would otherwise recompute per call:
+    normalized names, identities, ADP ranks (1-based CSV order), per-position
+    candidate index arrays, an exact normalized-last-name map, a trigram
+    inverted index over normalized last names and a case-insensitive
+    full-name map.
+    """
+
+    def __init__(self, players: Iterable[Player]):
+        self._players: Tuple[Player, ...] = tuple(players)
+        self.norm_last: Tuple[str, ...] = tuple(normalize_name(p.last) for p in self._players)
+        self.norm_first: Tuple[str, ...] = tuple(normalize_name(p.first) for p in self._players)
+        self.teams: Tuple[str, ...] = tuple(p.team.upper() for p in self._players)
+        self.team_array = _frozen(self.teams, object)
+        self.positions = _frozen([p.pos for p in self._players], object)
+        self.byes = _frozen([p.bye for p in self._players], np.int64)
+        self.identities: Tuple[tuple, ...] = tuple(player_identity(p) for p in self._players)
+        self.last_tokens = _TokenIndex(self.norm_last)
+        self.first_tokens = _TokenIndex(self.norm_first)
+        self.ranks = _frozen(np.arange(1, len(self._players) + 1), np.int64)
+        self.all_indices = _frozen(np.arange(len(self._players)), np.intp)
+
+        by_position: Dict[str, List[int]] = {pos: [] for pos in POSITIONS}
+        exact_last: Dict[str, List[int]] = {}
+        for i, p in enumerate(self._players):
+            by_position.setdefault(p.pos, []).append(i)
+            exact_last.setdefault(self.norm_last[i], []).append(i)
+        self.by_position = MappingProxyType({pos: _frozen(ix, np.intp) for pos, ix in by_position.items()})
+        self.exact_last = MappingProxyType({name: tuple(ix) for name, ix in exact_last.items()})
+        by_trigram: Dict[str, List[int]] = {}
+        for i, name in enumerate(self.norm_last):
+            for gram in last_name_trigrams(name):
+                by_trigram.setdefault(gram, []).append(i)
+        self.last_trigrams = MappingProxyType({gram: _frozen(ix, np.intp) for gram, ix in by_trigram.items()})
+        by_full_name: Dict[str, int] = {}
+        for i, p in enumerate(self._players):
+            by_full_name.setdefault(f"{p.first} {p.last}".strip().lower(), i)
+        self.by_full_name = MappingProxyType(by_full_name)
+
+    def __len__(self) -> int:
+        return len(self._players)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return list(self._players[i])
+        return self._players[i]
+
+    def __iter__(self):
+        return iter(self._players)
+
+    def __repr__(self) -> str:
+        return f"PlayerIndex({len(self._players)} players)"
+
+    def __reduce__(self):
+        # MappingProxyType views don't pickle; process workers rebuild the index from the players
+        return (PlayerIndex, (self._players,))
+
+    def candidates(self, position: Optional[str] = None) -> np.ndarray:
+        """Indices of the players at position (all players if position is None or unknown)."""
+        if position and position in POSITIONS:
+            return self.by_position[position]
+        return self.all_indices
+
+    def find_by_name(self, full_name: str) -> Optional[Player]:
+        """First player whose "FIRST LAST" equals full_name, case-insensitively."""
+        i = self.by_full_name.get(full_name.strip().lower())
+        return None if i is None else self._players[i]
+
+    def exact_last_matches(self, last: str) -> Tuple[int, ...]:
+        """Indices of players whose normalized last name equals normalize_name(last)."""
+        return self.exact_last.get(normalize_name(last), ())
+
+    def block(self, last_guess: str, position: Optional[str] = None,
+              min_share: float = BLOCK_MIN_SHARE, limit: int = BLOCK_LIMIT) -> np.ndarray:
+        """
+        Candidates at position (as candidates()) whose normalized last name shares at
+        least min_share of last_guess's trigrams (any trigram if none does), at most
+        limit of them (most shared trigrams first, then ADP order), returned in ADP
+        order. Empty if no name shares a trigram.
+        """
+        grams = last_name_trigrams(normalize_name(last_guess))
+        pool = self.candidates(position)
+        if not grams:
+            return pool[:0]
+        shared = np.zeros(len(self._players), dtype=np.int32)
+        for gram in grams:
+            shared[self.last_trigrams.get(gram, _NO_INDICES)] += 1
+        counts = shared[pool]
+        keep = counts >= max(1, math.ceil(min_share * len(grams)))
+        if not keep.any():
+            keep = counts > 0
+        blocked, counts = pool[keep], counts[keep]
+        if len(blocked) > limit:
+            blocked = np.sort(blocked[np.argsort(-counts, kind='stable')[:limit]])
+        return blocked
+
+
+def as_player_index(players) -> PlayerIndex:
+    """Return players as a PlayerIndex, indexing a plain list on the fly."""
+    return players if isinstance(players, PlayerIndex) else PlayerIndex(players)
+
+
 def grid_to_draft_pick(row: int, col: int, cols: int = 10) -> int:
     """
     Convert grid position to draft pick number using snake draft logic.
@@ -167,6 +353,9 @@ def draft_pick_to_grid(pick: int, cols: int = 10) -> tuple:
 
 
 
+DRAFT_SIGMA_ALPHA, DRAFT_SIGMA_BETA = 2.0, 0.1  # tweakable knobs
+
+
 def calculate_draft_likelihood(player_rank: int, draft_pick: int) -> float:
     """
     Likelihood score (0–100) that a player with given rank is drafted at draft_pick.
@@ -176,8 +365,7 @@ def calculate_draft_likelihood(player_rank: int, draft_pick: int) -> float:
         player_rank = 1
 
     # sigma grows with rank (players later in ADP have wider variance)
-    alpha, beta = 2.0, 0.1  # tweakable knobs
-    sigma = alpha + beta * player_rank
+    sigma = DRAFT_SIGMA_ALPHA + DRAFT_SIGMA_BETA * player_rank
 
     # Gaussian-shaped score centered at rank
     z = (draft_pick - player_rank) / sigma
@@ -186,19 +374,135 @@ def calculate_draft_likelihood(player_rank: int, draft_pick: int) -> float:
     return 100.0 * score
 
 
-def best_match_with_position(last_guess: str, row: int, col: int, 
-                           used_players: set, players: List[Player], 
-                           color_position: str = None, ocr_results: dict = None) -> Tuple[float, Player, int, dict]:
+def draft_likelihood_array(player_ranks: np.ndarray, draft_pick: int) -> np.ndarray:
+    """calculate_draft_likelihood over an array of ranks (equal up to float rounding)."""
+    ranks = np.maximum(np.asarray(player_ranks, dtype=np.float64), 1.0)
+    z = (draft_pick - ranks) / (DRAFT_SIGMA_ALPHA + DRAFT_SIGMA_BETA * ranks)
+    return 100.0 * np.exp(-0.5 * z * z)
+
+
+class DraftLikelihoodTable:
     """
-    Enhanced analytical matching using multi-factor confidence scoring.
-    Returns (score, best_player, best_rank, breakdown).
+    Draft-likelihood score component (calculate_draft_likelihood * 0.2) for every
+    pick x ADP rank of one board format, computed once per format.
+
+    Carries the team count so expected picks follow the board's snake order.
     """
-    index_map = {id(p): i for i, p in enumerate(players)}
 
-    if not last_guess:
-        return 0.0, players[0], 0, {}
-    
-    expected_pick = grid_to_draft_pick(row, col)
+    def __init__(self, teams: int, rounds: int, n_ranks: int):
+        self.teams = teams
+        self.rounds = rounds
+        self.n_ranks = n_ranks
+        self.component = np.array([
+            [calculate_draft_likelihood(rank, pick) * 0.2 for rank in range(1, n_ranks + 1)]
+            for pick in range(1, teams * rounds + 1)
+        ]).reshape(teams * rounds, n_ranks)
+        self.component.setflags(write=False)
+        self._rows: Dict[Tuple[int, int], List[float]] = {}
+
+    def expected_pick(self, row: int, col: int) -> int:
+        return grid_to_draft_pick(row, col, cols=self.teams)
+
+    def row(self, pick: int, n_ranks: int) -> np.ndarray:
+        """Component for ranks 1..n_ranks at pick (computed directly outside the table)."""
+        if 1 <= pick <= len(self.component) and n_ranks <= self.n_ranks:
+            return self.component[pick - 1, :n_ranks]
+        return np.array([calculate_draft_likelihood(rank, pick) * 0.2 for rank in range(1, n_ranks + 1)])
+
+    def row_list(self, pick: int, n_ranks: int) -> List[float]:
+        """row() as Python floats, cached per pick for the scalar scorer."""
+        key = (pick, n_ranks)
+        values = self._rows.get(key)
+        if values is None:
+            values = self._rows[key] = self.row(pick, n_ranks).tolist()
+        return values
+
+
+@lru_cache(maxsize=16)
+def get_draft_table(teams: int = 10, rounds: int = 16, n_ranks: int = 500) -> DraftLikelihoodTable:
+    """Shared DraftLikelihoodTable per board format (teams x rounds) and database size."""
+    return DraftLikelihoodTable(teams, rounds, n_ranks)
+
+
+def _expected_pick(row: int, col: int, draft_table: Optional[DraftLikelihoodTable]) -> int:
+    return draft_table.expected_pick(row, col) if draft_table is not None else grid_to_draft_pick(row, col)
+
+
+def _heap_cut(heap: List[float], size: int) -> float:
+    """Score a candidate must reach to enter a top-size heap."""
+    if size <= 0:
+        return float('inf')
+    return heap[0] if len(heap) >= size else float('-inf')
+
+
+def _push_bounded(heap: List[float], score: float, size: int) -> float:
+    """Add score to a top-size min-heap; returns the new cut."""
+    if size <= 0:
+        return float('inf')
+    if len(heap) < size:
+        heapq.heappush(heap, score)
+    elif score > heap[0]:
+        heapq.heapreplace(heap, score)
+    return _heap_cut(heap, size)
+
+
+# Slack on pruning bounds, covering rounding differences from the scalar scorer
+PRUNE_BOUND_SLACK = 1e-9
+
+
+def _prune_order(order: List[int], used_players: set, index: PlayerIndex, include_used: bool,
+                 last_guess: str, first_guess: Optional[str], team_guess, bye_guess, color_position,
+                 pos_guess, expected_pick: int) -> Tuple[List[int], List[float], List[float]]:
+    """
+    Candidates sorted by descending score upper bound (ties in ADP order), with the
+    bounds and the last-name ceilings in them. A bound is the candidate's exact
+    team/bye/position/draft components plus the ceilings of its name scores, so no
+    candidate can score above its bound.
+    """
+    cand = np.asarray(order, dtype=np.intp)
+    if not include_used:
+        used = np.fromiter((index.identities[i] in used_players for i in order), dtype=bool, count=len(cand))
+        cand = cand[~used]
+    last_ceiling = index.last_tokens.ceiling(last_guess, cand) * 0.4
+    bound = last_ceiling + PRUNE_BOUND_SLACK
+    if first_guess is not None:
+        bound += index.first_tokens.ceiling(first_guess, cand) * 0.15
+    if team_guess:
+        bound += np.where(index.team_array[cand] == team_guess, 15.0, 0.0)
+    if bye_guess is not None:
+        bound += np.where(index.byes[cand] == bye_guess, 10.0, 0.0)
+    if color_position:
+        bound += np.where(index.positions[cand] == color_position, 15.0, 0.0)
+    if pos_guess:
+        bound += np.where(index.positions[cand] == pos_guess, 10.0, 0.0)
+    bound += draft_likelihood_array(index.ranks[cand], expected_pick) * 0.2
+    by_bound = np.argsort(-bound, kind='stable')
+    return cand[by_bound].tolist(), bound[by_bound].tolist(), last_ceiling[by_bound].tolist()
+
+
+def _score_candidates(last_guess: str, row: int, col: int, used_players: set,
+                      index: PlayerIndex, color_position: str = None, ocr_results: dict = None,
+                      include_used: bool = False, mark_used: bool = False,
+                      sort: bool = True,
+                      draft_table: Optional[DraftLikelihoodTable] = None,
+                      keep: Optional[Tuple[int, int]] = None,
+                      block: bool = False) -> List[Tuple[float, Player, int, dict]]:
+    """
+    Multi-factor score for every candidate of the color-filtered pool, in ADP order
+    or sorted by score if sort (ties keep ADP order). Breakdowns carry 'is_used'
+    when mark_used.
+
+    keep=(k, k_unused) prunes candidates that cannot reach the top k overall nor
+    the top k_unused unused ones: candidates are visited by an upper bound (exact
+    team/bye/position/draft components plus the name-score ceiling) and only those
+    whose bound reaches the current cut-off are fuzzy-scored. The top k / k_unused
+    (ties included) are the same as without pruning; other candidates may be missing.
+
+    block restricts the pool to the last-name trigram block (PlayerIndex.block),
+    falling back to the full pool when the block has no unused candidate.
+    """
+    expected_pick = _expected_pick(row, col, draft_table)
+    draft_row = draft_table.row_list(expected_pick, len(index)) if draft_table is not None else None
 
     # Extract additional OCR data
     ocr_first = ocr_results.get('ocr_first', '') if ocr_results else ''
@@ -206,43 +510,74 @@ def best_match_with_position(last_guess: str, row: int, col: int,
     ocr_bye   = ocr_results.get('ocr_bye')       if ocr_results else None
     ocr_pos   = ocr_results.get('ocr_pos',   '') if ocr_results else ''
 
-    # Filter by color (strong filter)
-    candidate_players = players
-    if color_position and color_position in ['QB', 'RB', 'WR', 'TE', 'K', 'DST']:
-        candidate_players = [p for p in players if p.pos == color_position]
-        print(f"  Color position filter: {color_position} -> {len(candidate_players)} candidates (vs {len(players)} total)")
-
-    cand_scores = []
+    # Per-call constants, hoisted out of the candidate loop
     lg = normalize_name(last_guess)
+    first_guess = normalize_name(ocr_first) if ocr_first and len(ocr_first) > 1 else None
+    team_guess = ocr_team.upper() if ocr_team else None
+    bye_guess = ocr_bye if (ocr_bye is not None and ocr_bye > 0) else None
+    pos_guess = clean_pos_text(ocr_pos) if ocr_pos else None
+    color_filter = color_position if color_position in POSITIONS else None
+
+    players = index._players
+    cand_scores: List[Tuple[float, Player, int, dict]] = []
 
-    for p in candidate_players:
+    pool = index.candidates(color_filter)
+    if block:
+        blocked = index.block(lg, color_filter)
+        if any(index.identities[i] not in used_players for i in blocked.tolist()):
+            pool = blocked
+    order = pool.tolist()
+    if keep is not None:
+        order, bounds, last_ceilings = _prune_order(order, used_players, index, include_used, lg, first_guess,
+                                                    team_guess, bye_guess, color_position, pos_guess,
+                                                    expected_pick)
+        k, k_unused = keep
+        top_all: List[float] = []  # min-heaps of the best scores seen so far
+        top_unused: List[float] = []
+        cut_all, cut_unused = _heap_cut(top_all, k), _heap_cut(top_unused, k_unused)
+
+    for j, i in enumerate(order):
+        if keep is not None:
+            bound = bounds[j]
+            if bound < cut_all and bound < cut_unused:
+                break  # bounds are descending: nothing left can make either cut
+
+        p = players[i]
         # Skip if already used (by unique identity, not just last name)
-        if player_identity(p) in used_players:
+        is_used = index.identities[i] in used_players
+        if is_used and not include_used:
+            continue
+        if keep is not None and is_used and bound < cut_all:
             continue
 
         total_score = 0.0
         score_breakdown = {}
 
         # 1) LASTNAME (0–40)
-        lastname_score = fuzz.token_set_ratio(lg, normalize_name(p.last)) * 0.4
+        lastname_score = fuzz.token_set_ratio(lg, index.norm_last[i]) * 0.4
+        if keep is not None:
+            # Tighten the bound with the actual last-name score before the rest
+            bound += lastname_score - last_ceilings[j]
+            if bound < cut_all and (is_used or bound < cut_unused):
+                continue
         total_score += lastname_score
         score_breakdown['lastname'] = lastname_score
 
         # 2) FIRSTNAME (0–15)
-        if ocr_first and len(ocr_first) > 1:
-            firstname_score = fuzz.token_set_ratio(normalize_name(ocr_first), normalize_name(p.first)) * 0.15
+        if first_guess is not None:
+            firstname_score = fuzz.token_set_ratio(first_guess, index.norm_first[i]) * 0.15
         else:
             firstname_score = 0.0
         total_score += firstname_score
         score_breakdown['firstname'] = firstname_score
 
         # 3) TEAM (0–15)
-        team_score = 15.0 if ocr_team and p.team.upper() == ocr_team.upper() else 0.0
+        team_score = 15.0 if team_guess and index.teams[i] == team_guess else 0.0
         total_score += team_score
         score_breakdown['team'] = team_score
 
         # 4) BYE (0–10)
-        bye_score = 10.0 if (ocr_bye is not None and ocr_bye > 0 and p.bye == ocr_bye) else 0.0
+        bye_score = 10.0 if (bye_guess is not None and p.bye == bye_guess) else 0.0
         total_score += bye_score
         score_breakdown['bye'] = bye_score
 
@@ -252,112 +587,142 @@ def best_match_with_position(last_guess: str, row: int, col: int,
         score_breakdown['color_pos'] = color_score
 
         # 6) OCR POS (0–10)
-        ocr_pos_score = 10.0 if (ocr_pos and clean_pos_text(ocr_pos) == p.pos) else 0.0
+        ocr_pos_score = 10.0 if (pos_guess and pos_guess == p.pos) else 0.0
         total_score += ocr_pos_score
         score_breakdown['ocr_pos'] = ocr_pos_score
 
-        # 7) DRAFT LIKELIHOOD (classic, 0–20) — live-board rank + ±1 window
-        base_idx = index_map[id(p)]
-        eff_rank = base_idx + 1
-        draft_component = calculate_draft_likelihood(eff_rank, expected_pick) * 0.2
+        # 7) DRAFT LIKELIHOOD (classic, 0–20) — ADP rank vs expected pick
+        eff_rank = i + 1
+        if draft_row is not None:
+            draft_component = draft_row[i]
+        else:
+            draft_component = calculate_draft_likelihood(eff_rank, expected_pick) * 0.2
         total_score += draft_component
         score_breakdown['draft_likelihood'] = draft_component
+        if mark_used:
+            score_breakdown['is_used'] = is_used
 
         cand_scores.append((total_score, p, eff_rank, score_breakdown))
+        if keep is not None:
+            if total_score > cut_all:
+                cut_all = _push_bounded(top_all, total_score, k)
+            if not is_used and total_score > cut_unused:
+                cut_unused = _push_bounded(top_unused, total_score, k_unused)
+
+    if keep is not None:
+        cand_scores.sort(key=itemgetter(2))  # back to ADP order
+    if sort:
+        cand_scores.sort(key=lambda x: x[0], reverse=True)
+    return cand_scores
+
+
+class CandidateScan(NamedTuple):
+    """Results of one scoring pass over an OCR hypothesis' candidates."""
+    best: Tuple[float, Player, int, dict]      # best unused match, as best_match_with_position
+    top: List[Tuple[float, Player, int, dict]]  # top n including used players, breakdowns carry 'is_used'
+    exact: List[Tuple[float, Player, int, dict]]  # exact normalized-last-name hits among the top exact_n
+
+
+def scan_candidates(last_guess: str, row: int, col: int,
+                    used_players: set, players: List[Player],
+                    color_position: str = None, ocr_results: dict = None,
+                    n: int = 3, exact_n: int = 5, scores=None,
+                    draft_table: Optional[DraftLikelihoodTable] = None,
+                    prune: bool = False, block: bool = False) -> CandidateScan:
+    """
+    Score every candidate once and derive the best match, the top-N suggestions
+    and the exact last-name hits from that single pass (heap selection, ties in
+    ADP order), instead of separate best/top-N/exact scans.
+    If scores (a ScoreMatrix row for these OCR results) is given, it is a row lookup.
+    draft_table supplies the board's team count and precomputed draft components
+    (default: 10 teams, computed per candidate). prune fuzzy-scores only the
+    candidates whose score upper bound can still make the results (same results).
+    block scores only players sharing last-name trigrams with last_guess (full
+    scan if none is unused); players outside the block are never suggested.
+    """
+    index = as_player_index(players)
+
+    if not last_guess:
+        return CandidateScan((0.0, index[0], 0, {}), [], [])
+    
+    expected_pick = _expected_pick(row, col, draft_table)
 
-    if not cand_scores:
-        return 0.0, players[0], 0, {}
+    if color_position in POSITIONS:
+        print(f"  Color position filter: {color_position} -> {len(index.candidates(color_position))} candidates (vs {len(index)} total)")
 
-    cand_scores.sort(key=lambda x: x[0], reverse=True)
-    best_score, best_player, best_rank, breakdown = cand_scores[0]
+    k = max(n, exact_n, 0)
+    n_unused = 3 if expected_pick <= 25 else 1
+    if scores is not None:
+        unused, top = scores.scan(used_players, n_unused, k)
+    else:
+        cand_scores = _score_candidates(last_guess, row, col, used_players, index, color_position,
+                                        ocr_results, include_used=k > 0, mark_used=True, sort=False,
+                                        draft_table=draft_table, keep=(k, n_unused) if prune else None,
+                                        block=block)
+        unused = heapq.nlargest(n_unused, (c for c in cand_scores if not c[3]['is_used']), key=itemgetter(0))
+        top = heapq.nlargest(k, cand_scores, key=itemgetter(0))
+
+    lg = normalize_name(last_guess)
+    exact = [c for c in top[:exact_n] if lg and index.norm_last[c[2] - 1] == lg]
+
+    if not unused:
+        return CandidateScan((0.0, index[0], 0, {}), top[:n], exact)
+
+    best_score, best_player, best_rank, breakdown = unused[0]
+    breakdown = {key: value for key, value in breakdown.items() if key != 'is_used'}
 
     if expected_pick <= 25:
         print(f"  Pick {expected_pick} - Top 3 candidates:")
-        for i, (score, player, rank, bd) in enumerate(cand_scores[:3]):
+        for i, (score, player, rank, bd) in enumerate(unused[:3]):
             print(f"    {i+1}. {player.full} (#{rank}) - Score: {score:.1f}")
             print(f"       Breakdown: Name={bd['lastname']:.1f}, Team={bd['team']:.1f}, Bye={bd['bye']:.1f}, Color={bd['color_pos']:.1f}, Draft={bd['draft_likelihood']:.1f}")
 
-    return best_score, best_player, best_rank, breakdown
+    return CandidateScan((best_score, best_player, best_rank, breakdown), top[:n], exact)
+
+
+def best_match_with_position(last_guess: str, row: int, col: int, 
+                           used_players: set, players: List[Player], 
+                           color_position: str = None, ocr_results: dict = None,
+                           scores=None, draft_table: Optional[DraftLikelihoodTable] = None,
+                           prune: bool = False, block: bool = False) -> Tuple[float, Player, int, dict]:
+    """
+    Enhanced analytical matching using multi-factor confidence scoring.
+    Returns (score, best_player, best_rank, breakdown).
+    If scores (a ScoreMatrix row for these OCR results) is given, it is a row lookup.
+    """
+    return scan_candidates(last_guess, row, col, used_players, players, color_position, ocr_results,
+                           n=0, exact_n=0, scores=scores, draft_table=draft_table, prune=prune,
+                           block=block).best
     
 def top_n_matches_with_position(last_guess: str, row: int, col: int,
                                 used_players: set, players: List[Player],
                                 color_position: str = None, ocr_results: dict = None,
                                 include_used: bool = False,
-                                n: int = 3) -> List[Tuple[float, Player, int, dict]]:
+                                n: int = 3, scores=None,
+                                draft_table: Optional[DraftLikelihoodTable] = None,
+                                prune: bool = False, block: bool = False) -> List[Tuple[float, Player, int, dict]]:
     """
     Return the top N candidate matches using the same scoring as best_match_with_position.
     Excludes already-used players and optionally filters by detected color position.
+    If scores (a ScoreMatrix row for these OCR results) is given, it is a row lookup.
     """
-    index_map = {id(p): i for i, p in enumerate(players)}
-
     if not last_guess:
         return []
 
-    expected_pick = grid_to_draft_pick(row, col)
-
-    ocr_first = ocr_results.get('ocr_first', '') if ocr_results else ''
-    ocr_team  = ocr_results.get('ocr_team',  '') if ocr_results else ''
-    ocr_bye   = ocr_results.get('ocr_bye')       if ocr_results else None
-    ocr_pos   = ocr_results.get('ocr_pos',   '') if ocr_results else ''
-
-    candidate_players = players
-    if color_position and color_position in ['QB', 'RB', 'WR', 'TE', 'K', 'DST']:
-        candidate_players = [p for p in players if p.pos == color_position]
-
-    cand_scores: List[Tuple[float, Player, int, dict]] = []
-    lg = normalize_name(last_guess)
-
-    for p in candidate_players:
-        is_used = player_identity(p) in used_players
-        if (not include_used) and is_used:
-            continue
-
-        total_score = 0.0
-        score_breakdown = {}
-
-        lastname_score = fuzz.token_set_ratio(lg, normalize_name(p.last)) * 0.4
-        total_score += lastname_score
-        score_breakdown['lastname'] = lastname_score
-
-        if ocr_first and len(ocr_first) > 1:
-            firstname_score = fuzz.token_set_ratio(normalize_name(ocr_first), normalize_name(p.first)) * 0.15
-        else:
-            firstname_score = 0.0
-        total_score += firstname_score
-        score_breakdown['firstname'] = firstname_score
-
-        team_score = 15.0 if ocr_team and p.team.upper() == ocr_team.upper() else 0.0
-        total_score += team_score
-        score_breakdown['team'] = team_score
+    if scores is not None:
+        return scores.ranked(used_players, include_used=include_used, mark_used=True, n=n)
 
-        bye_score = 10.0 if (ocr_bye is not None and ocr_bye > 0 and p.bye == ocr_bye) else 0.0
-        total_score += bye_score
-        score_breakdown['bye'] = bye_score
-
-        color_score = 15.0 if (color_position and p.pos == color_position) else 0.0
-        total_score += color_score
-        score_breakdown['color_pos'] = color_score
-
-        ocr_pos_score = 10.0 if (ocr_pos and clean_pos_text(ocr_pos) == p.pos) else 0.0
-        total_score += ocr_pos_score
-        score_breakdown['ocr_pos'] = ocr_pos_score
-
-        base_idx = index_map[id(p)]
-        eff_rank = base_idx + 1
-        draft_component = calculate_draft_likelihood(eff_rank, expected_pick) * 0.2
-        total_score += draft_component
-        score_breakdown['draft_likelihood'] = draft_component
-        score_breakdown['is_used'] = is_used
-
-        cand_scores.append((total_score, p, eff_rank, score_breakdown))
-
-    cand_scores.sort(key=lambda x: x[0], reverse=True)
+    cand_scores = _score_candidates(last_guess, row, col, used_players, as_player_index(players),
+                                    color_position, ocr_results, include_used=include_used, mark_used=True,
+                                    draft_table=draft_table, keep=(n, 0) if prune else None, block=block)
     return cand_scores[:max(0, n)]
 
 
 def reconcile_cell_with_position(ocr_results: dict, row: int, col: int, 
                                used_players: set, players: List[Player],
-                               confidence_threshold: float = 45.0) -> dict:
+                               confidence_threshold: float = 45.0, scores=None,
+                               draft_table: Optional[DraftLikelihoodTable] = None,
+                               prune: bool = False, block: bool = False) -> dict:
     """
     Reconcile OCR results with player database using draft position logic.
     
@@ -368,10 +733,32 @@ def reconcile_cell_with_position(ocr_results: dict, row: int, col: int,
         used_players: Set of already used player IDs
         players: List of players to match against
         confidence_threshold: Minimum confidence score to accept match
+        scores: Optional ScoreMatrix row precomputed for ocr_results
+        draft_table: Optional DraftLikelihoodTable for the board format (default 10 teams)
+        prune: Skip fuzzy scoring of candidates whose score bound cannot win
+        block: Only score players sharing last-name trigrams with the OCR'd last name
     
     Returns:
         Dictionary with reconciled player data and confidence scores
     """
+    result, _ = reconcile_cell_scan(ocr_results, row, col, used_players, players,
+                                    confidence_threshold, n=0, exact_n=0, scores=scores,
+                                    draft_table=draft_table, prune=prune, block=block)
+    return result
+
+
+def reconcile_cell_scan(ocr_results: dict, row: int, col: int,
+                        used_players: set, players: List[Player],
+                        confidence_threshold: float = 45.0, n: int = 3, exact_n: int = 5,
+                        scores=None, draft_table: Optional[DraftLikelihoodTable] = None,
+                        prune: bool = False, block: bool = False) -> Tuple[dict, CandidateScan]:
+    """
+    reconcile_cell_with_position plus the top-N suggestions and exact last-name
+    hits for the same OCR hypothesis, all from one scan_candidates pass.
+    
+    Returns:
+        (reconciled result dict, CandidateScan)
+    """
     # Extract OCR results
     last_guess = ocr_results.get('ocr_last', '')
     
@@ -379,16 +766,44 @@ def reconcile_cell_with_position(ocr_results: dict, row: int, col: int,
     color_position = ocr_results.get('color_pos')
     
     # Find best match using enhanced analytical approach
-    match_score, best_player, best_rank, breakdown = best_match_with_position(
-        last_guess, row, col, used_players, players, color_position, ocr_results
-    )
-    
-    # Calculate actual draft pick
-    actual_pick = grid_to_draft_pick(row, col)
+    scan = scan_candidates(last_guess, row, col, used_players, players, color_position, ocr_results,
+                           n=n, exact_n=exact_n, scores=scores, draft_table=draft_table, prune=prune,
+                           block=block)
+    match_score, best_player, best_rank, breakdown = scan.best
     
     # Determine if we should use the match
     use_match = match_score >= confidence_threshold
     
+    result = build_reconcile_result(ocr_results, row, col, match_score, best_player, best_rank,
+                                    breakdown, use_match, teams=draft_table.teams if draft_table else 10)
+    return result, scan
+
+
+def build_reconcile_result(ocr_results: dict, row: int, col: int, match_score: float,
+                           best_player: Player, best_rank: int, breakdown: dict,
+                           use_match: bool, teams: int = 10) -> dict:
+    """
+    Build the reconciled cell dict for a scored best candidate.
+    
+    Args:
+        ocr_results: Dictionary with OCR results from read_cell
+        row: Grid row
+        col: Grid column
+        match_score: Score of best_player
+        best_player: Best candidate player
+        best_rank: ADP rank of best_player
+        breakdown: Score breakdown of best_player
+        use_match: Take the player's data (else the raw OCR values are kept)
+        teams: Number of teams (board columns) for the snake-draft pick
+    
+    Returns:
+        Dictionary with reconciled player data and confidence scores
+    """
+    last_guess = ocr_results.get('ocr_last', '')
+    
+    # Calculate actual draft pick
+    actual_pick = grid_to_draft_pick(row, col, cols=teams)
+    
     # Build result
     result = {
         'row': row,
@@ -404,10 +819,10 @@ def reconcile_cell_with_position(ocr_results: dict, row: int, col: int,
         'use_match': use_match,
         'source_last': 'csv' if use_match else 'ocr',
         'conf_last': match_score,
-        'expected_pick': grid_to_draft_pick(row, col),
+        'expected_pick': grid_to_draft_pick(row, col, cols=teams),
         'expected_rank': best_rank,
         'actual_pick': actual_pick,
-        'position_diff': abs(grid_to_draft_pick(row, col) - actual_pick),
+        'position_diff': abs(grid_to_draft_pick(row, col, cols=teams) - actual_pick),
         'raw_ocr': {
             'pos': ocr_results.get('ocr_pos', ''),
             'color_pos': ocr_results.get('color_pos'),
@@ -432,6 +847,40 @@ def reconcile_cell_with_position(ocr_results: dict, row: int, col: int,
     
     return result
 
+def empty_cell_result(row: int, col: int, teams: int = 10) -> dict:
+    """
+    Reconciled dict for a cell with no sticker (see grid.detect_empty_cells).
+    
+    Carries the same keys as build_reconcile_result, with blank values,
+    use_match False and 'empty' True, so outputs and the correction queue
+    can skip it and it never takes a player.
+    """
+    pick = grid_to_draft_pick(row, col, cols=teams)
+    return {
+        'row': row,
+        'col': col,
+        'full_name': '',
+        'first': '',
+        'last': '',
+        'team': '',
+        'pos': None,
+        'bye': None,
+        'is_dst': False,
+        'match_score': 0.0,
+        'use_match': False,
+        'source_last': 'empty',
+        'conf_last': 0.0,
+        'expected_pick': pick,
+        'expected_rank': 0,
+        'actual_pick': pick,
+        'position_diff': 0,
+        'raw_ocr': {'pos': '', 'color_pos': None, 'bye': None, 'last': '', 'team': '', 'first': ''},
+        'best_candidate': None,
+        'best_candidate_confidence': 0.0,
+        'score_breakdown': {},
+        'empty': True
+    }
+
 def handle_dst_special_case(ocr_results: dict, players: List[Player]) -> Optional[dict]:
     """
     Handle special case for DST (Defense/Special Teams).
@@ -459,8 +908,10 @@ def handle_dst_special_case(ocr_results: dict, players: List[Player]) -> Optiona
     # Look for team name in lastname field
     team_name = ocr_results.get('ocr_last', '').upper()
     
-    # Find matching DST in players list
-    for player in players:
+    # Find matching DST in the player index
+    index = as_player_index(players)
+    for i in index.by_position['DST'].tolist():
+        player = index[i]
         if player.is_dst and team_name in player.last:
             return {
                 'row': None,
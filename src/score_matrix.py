@@ -0,0 +1,232 @@
+import numpy as np
+from rapidfuzz import fuzz, process
+from typing import Dict, List, Optional, Sequence, Tuple
+from ocr_cell import clean_pos_text
+from reconcile import (Player, PlayerIndex, POSITIONS, MATCH_BLOCKING, DraftLikelihoodTable, as_player_index,
+                       normalize_name, grid_to_draft_pick, calculate_draft_likelihood)
+
+# Score components in the order best_match_with_position adds them up
+COMPONENTS = ('lastname', 'firstname', 'team', 'bye', 'color_pos', 'ocr_pos', 'draft_likelihood')
+
+
+class ScoreMatrix:
+    """
+    Reconciliation scores of every OCR hypothesis against every player, built once.
+
+    Each hypothesis is an (ocr_results, row, col) triple scored exactly like
+    best_match_with_position: name components come from rapidfuzz cdist, the
+    team/bye/color/OCR-position/draft components from NumPy broadcasts.
+    Per-cell matching then reduces to row lookups (see row()); score
+    breakdowns are only materialized for the candidates that are returned.
+    A DraftLikelihoodTable supplies the board's team count and draft rows.
+    Name scores are taken from previous when it scored the same OCR names
+    against the same PlayerIndex (e.g. a re-run with new color profiles).
+
+    With block (default MATCH_BLOCKING), names are only fuzzy-scored against
+    each hypothesis' last-name trigram block (PlayerIndex.block) and the
+    candidate pools are restricted to it. As in the per-cell matchers, a row
+    falls back to all players (scored on demand) when its block is empty or,
+    in ranked()/scan(), has no unused candidate.
+    """
+
+    def __init__(self, players, hypotheses: Sequence[Tuple[dict, int, int]], workers: int = -1,
+                 draft_table: Optional[DraftLikelihoodTable] = None,
+                 previous: Optional["ScoreMatrix"] = None, block: Optional[bool] = None):
+        self.index: PlayerIndex = as_player_index(players)
+        self.hypotheses = list(hypotheses)
+        self.draft_table = draft_table
+        self.teams = draft_table.teams if draft_table is not None else 10
+        self.workers = workers
+        self.block = MATCH_BLOCKING if block is None else block
+        index = self.index
+        n = len(self.hypotheses)
+
+        ocr = [h[0] or {} for h in self.hypotheses]
+        last_guesses = [normalize_name(o.get('ocr_last', '') or '') for o in ocr]
+        first_guesses = [o.get('ocr_first', '') or '' for o in ocr]
+        team_guesses = [(o.get('ocr_team', '') or '').upper() for o in ocr]
+        bye_guesses = [o.get('ocr_bye') for o in ocr]
+        pos_guesses = [clean_pos_text(o.get('ocr_pos', '')) if o.get('ocr_pos') else None for o in ocr]
+        self.color_positions: List[Optional[str]] = [o.get('color_pos') for o in ocr]
+
+        teams = np.array(index.teams, dtype=object)
+        byes = np.array([p.bye for p in index], dtype=np.int64)
+        positions = np.array([p.pos for p in index], dtype=object)
+
+        self._last_guesses, self._first_guesses = last_guesses, first_guesses
+
+        # Per-row trigram blocks (None: all players); empty blocks fall back right away.
+        # Blocked rows only have their block's names scored until a lookup needs the rest.
+        self.blocks: List[Optional[np.ndarray]] = [None] * n
+        self._fully_scored = set()
+        if self.block:
+            for r, (last, color) in enumerate(zip(last_guesses, self.color_positions)):
+                blocked = index.block(last, color if color in POSITIONS else None)
+                self.blocks[r] = blocked if len(blocked) else None
+
+        # 1) LASTNAME (0–40) and 2) FIRSTNAME (0–15): one cdist call each (per row when blocked)
+        self._name_key = (last_guesses, first_guesses, tuple(None if b is None else b.tobytes() for b in self.blocks))
+        if previous is not None and previous.index is index and previous._name_key == self._name_key:
+            lastname, firstname = previous.components['lastname'], previous.components['firstname']
+            self.blocks, self._fully_scored = list(previous.blocks), set(previous._fully_scored)
+        else:
+            lastname, firstname = np.zeros((n, len(index))), np.zeros((n, len(index)))
+            full = [r for r in range(n) if self.blocks[r] is None]
+            self._score_names(lastname, firstname, full, None)
+            for r in range(n):
+                if self.blocks[r] is not None:
+                    self._score_names(lastname, firstname, [r], self.blocks[r])
+
+        # 3) TEAM, 4) BYE, 5) COLOR POS, 6) OCR POS: equality broadcasts
+        team_col = np.array(team_guesses, dtype=object)[:, None]
+        team = np.where((team_col != '') & (teams[None, :] == team_col), 15.0, 0.0)
+        bye_col = np.array([b if (b is not None and b > 0) else -1 for b in bye_guesses], dtype=np.int64)[:, None]
+        bye = np.where(byes[None, :] == bye_col, 10.0, 0.0)
+        color_col = np.array([c or '' for c in self.color_positions], dtype=object)[:, None]
+        color = np.where(positions[None, :] == color_col, 15.0, 0.0)
+        pos_col = np.array([p or '' for p in pos_guesses], dtype=object)[:, None]
+        ocr_pos = np.where(positions[None, :] == pos_col, 10.0, 0.0)
+
+        # 7) DRAFT LIKELIHOOD (0–20): one ADP-rank row per distinct expected pick
+        picks = [grid_to_draft_pick(row, col, cols=self.teams) for _, row, col in self.hypotheses]
+        ranks = index.ranks.tolist()
+        draft_rows: Dict[int, np.ndarray] = {}
+        for pick in set(picks):
+            if draft_table is not None:
+                draft_rows[pick] = draft_table.row(pick, len(index))
+            else:
+                draft_rows[pick] = np.array([calculate_draft_likelihood(rank, pick) * 0.2 for rank in ranks])
+        draft = np.array([draft_rows[pick] for pick in picks]).reshape(n, len(index))
+
+        self.components: Dict[str, np.ndarray] = dict(zip(COMPONENTS, (
+            lastname, firstname, team, bye, color, ocr_pos, draft)))
+        # Summed in the scalar scorer's order so totals (and ties) match it bit for bit
+        total = np.zeros((n, len(index)))
+        for name in COMPONENTS:
+            total += self.components[name]
+        self.total = total
+
+    def _score_names(self, lastname: np.ndarray, firstname: np.ndarray, rows: List[int],
+                     cols: Optional[np.ndarray]):
+        """Fill the name components of rows for player columns cols (None: all players)."""
+        if not rows:
+            return
+        index = self.index
+        if cols is None:
+            cols = index.all_indices
+            norm_last, norm_first = index.norm_last, index.norm_first
+        else:
+            norm_last = [index.norm_last[i] for i in cols.tolist()]
+            norm_first = [index.norm_first[i] for i in cols.tolist()]
+        lastname[np.ix_(rows, cols)] = process.cdist(
+            [self._last_guesses[r] for r in rows], norm_last, scorer=fuzz.token_set_ratio,
+            dtype=np.float64, workers=self.workers) * 0.4
+        with_first = [r for r in rows if self._first_guesses[r] and len(self._first_guesses[r]) > 1]
+        if with_first:
+            firstname[np.ix_(with_first, cols)] = process.cdist(
+                [normalize_name(self._first_guesses[r]) for r in with_first], norm_first,
+                scorer=fuzz.token_set_ratio, dtype=np.float64, workers=self.workers) * 0.15
+
+    def _score_fully(self, r: int):
+        """Score blocked hypothesis r's names against every player (once)."""
+        if r in self._fully_scored:
+            return
+        lastname, firstname = self.components['lastname'], self.components['firstname']
+        self._score_names(lastname, firstname, [r], None)
+        total = np.zeros(len(self.index))
+        for name in COMPONENTS:
+            total += self.components[name][r]
+        self.total[r] = total
+        self._fully_scored.add(r)
+
+    def _pool(self, r: int, used_players: Optional[set] = None) -> np.ndarray:
+        """
+        Candidate indices of hypothesis r: its color pool, restricted to its block
+        unless the block has no candidate outside used_players (then all of the pool).
+        """
+        index = self.index
+        color = self.color_positions[r]
+        cand = index.candidates(color if color in POSITIONS else None)
+        blocked = self.blocks[r]
+        if blocked is None:
+            return cand
+        if used_players is not None and all(index.identities[i] in used_players for i in blocked.tolist()):
+            self._score_fully(r)
+            return cand
+        return blocked
+
+    def __len__(self) -> int:
+        return len(self.hypotheses)
+
+    def row(self, r: int) -> "ScoreRow":
+        """Scores of hypothesis r, usable as scores= in the reconcile matchers."""
+        return ScoreRow(self, r)
+
+    def ranked(self, r: int, used_players: set, include_used: bool = False,
+               mark_used: bool = False, n: Optional[int] = None) -> List[Tuple[float, Player, int, dict]]:
+        """
+        Candidates of hypothesis r sorted by score (ties keep ADP order), restricted
+        to its color position and to unused players unless include_used.
+
+        Returns:
+            Up to n (score, player, rank, breakdown) tuples
+        """
+        index = self.index
+        cand = self._pool(r, used_players)
+        used = np.fromiter((index.identities[i] in used_players for i in cand.tolist()),
+                           dtype=bool, count=len(cand))
+        if not include_used:
+            cand, used = cand[~used], used[~used]
+
+        order = np.argsort(-self.total[r, cand], kind='stable')
+        if n is not None:
+            order = order[:max(0, n)]
+
+        return [self.candidate(r, int(cand[k]), bool(used[k]) if mark_used else None) for k in order.tolist()]
+
+    def scan(self, r: int, used_players: set, n_unused: int, n: int):
+        """
+        One ordering pass for scan_candidates: the best n_unused unused candidates and
+        the top n candidates including used ones (breakdowns carry 'is_used').
+        """
+        index = self.index
+        cand = self._pool(r, used_players)
+        used = np.fromiter((index.identities[i] in used_players for i in cand.tolist()),
+                           dtype=bool, count=len(cand))
+        order = np.argsort(-self.total[r, cand], kind='stable')
+        unused_order = order[~used[order]][:max(0, n_unused)]
+        unused = [self.candidate(r, int(cand[k]), False) for k in unused_order.tolist()]
+        top = [self.candidate(r, int(cand[k]), bool(used[k])) for k in order[:max(0, n)].tolist()]
+        return unused, top
+
+    def candidate(self, r: int, i: int, is_used: Optional[bool] = None) -> Tuple[float, Player, int, dict]:
+        """(score, player, rank, breakdown) of player i for hypothesis r; adds 'is_used' if given."""
+        breakdown = {name: float(self.components[name][r, i]) for name in COMPONENTS}
+        if is_used is not None:
+            breakdown['is_used'] = is_used
+        return float(self.total[r, i]), self.index[i], i + 1, breakdown
+
+    def candidate_mask(self, r: int) -> np.ndarray:
+        """
+        Boolean mask over players of hypothesis r's candidate pool (color filter and
+        block, non-empty guess). Used-player fallbacks are up to the caller.
+        """
+        mask = np.zeros(len(self.index), dtype=bool)
+        if (self.hypotheses[r][0] or {}).get('ocr_last'):
+            mask[self._pool(r)] = True
+        return mask
+
+
+class ScoreRow:
+    """One hypothesis row of a ScoreMatrix."""
+
+    def __init__(self, matrix: ScoreMatrix, r: int):
+        self.matrix = matrix
+        self.r = r
+
+    def ranked(self, used_players: set, include_used: bool = False,
+               mark_used: bool = False, n: Optional[int] = None) -> List[Tuple[float, Player, int, dict]]:
+        return self.matrix.ranked(self.r, used_players, include_used, mark_used, n)
+
+    def scan(self, used_players: set, n_unused: int, n: int):
+        return self.matrix.scan(self.r, used_players, n_unused, n)
@@ -0,0 +1,261 @@
+import os
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from ocr_cell import (CellPlanes, ROI_NAMES, build_roi_result, pos_from_color, read_cell_whole, read_rois)
+from reconcile import MATCH_BLOCKING, DraftLikelihoodTable, as_player_index, top_n_matches_with_position
+
+# Reader tiers, cheapest first; a cell stops at the first tier whose best match is decisive
+TIERS = ('lastname', 'roi', 'whole', 'alternate')
+# Score lead over the runner-up (same 0-125 scale as match_score) that ends escalation
+DEFAULT_MARGIN = float(os.environ.get('OCR_ESCALATION_MARGIN', 10.0))
+# (invert, antimerge) variants of neutral_otsu tried by the last tier
+ALTERNATE_PREPROCESSING = ((False, False), (True, True))
+
+# Adaptive strategy selection: the two per-cell OCR strategies, cells read with both
+# to pick the board's dominant one, and the win share that makes a strategy dominant
+STRATEGIES = ('roi', 'whole')
+DEFAULT_SAMPLE = int(os.environ.get('OCR_ADAPTIVE_SAMPLE', 20))
+DEFAULT_DOMINANCE = 0.7
+
+
+def _builtin_positions(hsvs: Sequence[tuple]) -> List[Optional[str]]:
+    return [pos_from_color(hsv) for hsv in hsvs]
+
+
+def match_lead(players, ocr_results: dict, row: int, col: int,
+               draft_table: Optional[DraftLikelihoodTable] = None,
+               block: bool = MATCH_BLOCKING) -> Tuple[float, float]:
+    """
+    (best score, lead over the runner-up) of one OCR hypothesis, used players included.
+    block scores only the last-name trigram block (all players if it is empty).
+    """
+    top = top_n_matches_with_position(ocr_results.get('ocr_last', ''), row, col, set(), players,
+                                      ocr_results.get('color_pos'), ocr_results, include_used=True,
+                                      n=2, draft_table=draft_table, prune=True, block=block)
+    if not top:
+        return 0.0, 0.0
+    best = top[0][0]
+    return best, best - (top[1][0] if len(top) > 1 else 0.0)
+
+
+class StagedCellReader:
+    """
+    Cell reader that escalates through OCR tiers only while the match is ambiguous.
+
+    1. lastname:  color position plus the last-name ROI (one OCR call)
+    2. roi:       the other four ROIs (read_cell)
+    3. whole:     whole-cell OCR, also with first/last swapped (read_cell_whole)
+    4. alternate: the ROIs again with the ALTERNATE_PREPROCESSING binarizations
+
+    After each tier the hypotheses read so far are scored against every player
+    (used players included, so the decision does not depend on cell order). The
+    cell stops when the best score reaches confidence_threshold and leads the
+    runner-up by margin; otherwise it escalates. The bundle keeps the best ROI
+    hypothesis as 'roi', the whole-cell dict (None if never read) as 'whole',
+    and the tier it stopped at as 'tier'.
+    """
+
+    def __init__(self, players, draft_table: Optional[DraftLikelihoodTable] = None,
+                 confidence_threshold: float = 45.0, margin: float = DEFAULT_MARGIN,
+                 whole: bool = True,
+                 classify: Optional[Callable[[Sequence[tuple]], List[Optional[str]]]] = None,
+                 block: bool = MATCH_BLOCKING):
+        self.players = as_player_index(players)
+        self.draft_table = draft_table
+        self.confidence_threshold = confidence_threshold
+        self.margin = margin
+        self.whole = whole
+        self.block = block
+        # Color position per dominant HSV, batched (default: the built-in HSV rules)
+        self.classify = classify or _builtin_positions
+
+    def __getstate__(self):
+        # Process workers only read cells; classify (often a closure) stays in the parent
+        # and the PlayerIndex travels as its players tuple, re-indexed on arrival
+        state = dict(self.__dict__)
+        state['classify'] = _builtin_positions
+        state['players'] = tuple(self.players)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.players = as_player_index(self.players)
+
+    def score(self, ocr_results: dict, row: int, col: int) -> Tuple[float, float]:
+        """(best score, lead over the runner-up) of one hypothesis."""
+        return match_lead(self.players, ocr_results, row, col, self.draft_table, self.block)
+
+    def decisive(self, best: float, lead: float) -> bool:
+        return best >= self.confidence_threshold and lead >= self.margin
+
+    def read(self, cell_img: np.ndarray, row: int, col: int, hsv, color_pos: Optional[str]) -> Dict:
+        """Read one cell; returns an ocr_cell_bundle-shaped dict plus 'tier'."""
+        planes = CellPlanes(cell_img)
+        texts = {name: '' for name in ROI_NAMES}
+
+        def roi_result():
+            result = build_roi_result(texts, cell_img, hsv)
+            result['color_pos'] = color_pos
+            return result
+
+        def bundle(roi, whole, tier):
+            return {'roi': roi, 'whole': whole, 'hsv': hsv, 'tier': tier}
+
+        # 1) Last name only
+        texts.update(read_rois(cell_img, ('lastname',), planes))
+        roi = roi_result()
+        best, lead = self.score(roi, row, col)
+        if self.decisive(best, lead):
+            return bundle(roi, None, 'lastname')
+
+        # 2) Remaining ROIs
+        texts.update(read_rois(cell_img, tuple(n for n in ROI_NAMES if n != 'lastname'), planes))
+        roi = roi_result()
+        best, lead = self.score(roi, row, col)
+        if self.decisive(best, lead):
+            return bundle(roi, None, 'roi')
+
+        # 3) Whole cell, as read and with first/last swapped
+        whole = None
+        if self.whole:
+            whole = read_cell_whole(cell_img, planes=planes)
+            whole['color_pos'] = color_pos
+            swapped = dict(whole, ocr_first=whole.get('ocr_last', ''), ocr_last=whole.get('ocr_first', ''))
+            for hypothesis in (whole, swapped):
+                if self.decisive(*self.score(hypothesis, row, col)):
+                    return bundle(roi, whole, 'whole')
+
+        # 4) Alternate binarizations of the ROIs; keep the best-scoring ROI read
+        for invert, antimerge in ALTERNATE_PREPROCESSING:
+            texts = read_rois(cell_img, ROI_NAMES, planes, invert=invert, antimerge=antimerge)
+            alternate = roi_result()
+            alt_best, _ = self.score(alternate, row, col)
+            if alt_best > best:
+                roi, best = alternate, alt_best
+        return bundle(roi, whole, 'alternate')
+
+
+def tier_counts(table: Sequence[Dict]) -> Dict[str, int]:
+    """Number of cells that finished at each reader tier (cells without one are left out)."""
+    counts = Counter(bundle.get('tier') for bundle in table if bundle and bundle.get('tier'))
+    return {tier: counts.get(tier, 0) for tier in TIERS}
+
+
+class AdaptiveCellReader:
+    """
+    Picks the board's dominant OCR strategy (ROI or whole-cell) from a sample.
+
+    Boards from one manufacturer tend to favour one strategy almost everywhere.
+    sample() cells are read with both strategies, timed and scored; choose()
+    returns the strategy that won at least dominance of them (ROI wins ties, as
+    in process_board), or None to keep reading both. The other cells run only
+    the dominant strategy and fall back to both when its best match is below
+    confidence_threshold or leads the runner-up by less than margin.
+
+    Bundles carry 'plan' (strategies planned), 'fallback', per-strategy
+    'scores' and 'seconds', and 'sample'; strategy_stats() summarizes them.
+    """
+
+    def __init__(self, players, draft_table: Optional[DraftLikelihoodTable] = None,
+                 confidence_threshold: float = 45.0, margin: float = DEFAULT_MARGIN,
+                 sample_size: int = DEFAULT_SAMPLE, dominance: float = DEFAULT_DOMINANCE,
+                 classify: Optional[Callable[[Sequence[tuple]], List[Optional[str]]]] = None,
+                 block: bool = MATCH_BLOCKING):
+        self.players = as_player_index(players)
+        self.draft_table = draft_table
+        self.confidence_threshold = confidence_threshold
+        self.margin = margin
+        self.sample_size = sample_size
+        self.dominance = dominance
+        self.block = block
+        self.classify = classify or _builtin_positions
+
+    def __getstate__(self):
+        # As StagedCellReader: classify stays in the parent, players travel as a tuple
+        state = dict(self.__dict__)
+        state['classify'] = _builtin_positions
+        state['players'] = tuple(self.players)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.players = as_player_index(self.players)
+
+    def sample(self, n: int) -> List[int]:
+        """Positions of the calibration cells among n, spread evenly over the board."""
+        k = min(n, max(0, self.sample_size))
+        return sorted(set(np.linspace(0, n - 1, k).round().astype(int).tolist())) if k else []
+
+    def choose(self, bundles: Sequence[Dict]) -> Optional[str]:
+        """Dominant strategy of the sampled bundles, None if neither wins often enough."""
+        wins = Counter(_winner(b) for b in bundles if b.get('scores', {}).keys() >= set(STRATEGIES))
+        total = sum(wins.values())
+        if not total:
+            return None
+        strategy = max(STRATEGIES, key=lambda name: wins[name])  # first (ROI) on ties
+        return strategy if wins[strategy] / total >= self.dominance else None
+
+    def read(self, cell_img: np.ndarray, row: int, col: int, hsv, color_pos: Optional[str],
+             plan: Sequence[str] = STRATEGIES) -> Dict:
+        """Read one cell with the planned strategies (plus the other on a weak match)."""
+        planes = CellPlanes(cell_img)
+        out = {'roi': None, 'whole': None, 'hsv': hsv, 'plan': tuple(plan), 'fallback': False,
+               'scores': {}, 'seconds': {}}
+
+        def run(strategy):
+            start = time.perf_counter()
+            if strategy == 'roi':
+                result = build_roi_result(read_rois(cell_img, planes=planes), cell_img, hsv)
+                result['color_pos'] = color_pos
+                hypotheses = [result]
+            else:
+                result = read_cell_whole(cell_img, planes=planes)
+                result['color_pos'] = color_pos
+                swapped = dict(result, ocr_first=result.get('ocr_last', ''), ocr_last=result.get('ocr_first', ''))
+                hypotheses = [result, swapped]
+            out['seconds'][strategy] = time.perf_counter() - start
+            out[strategy] = result
+            return max((match_lead(self.players, h, row, col, self.draft_table, self.block) for h in hypotheses),
+                       key=lambda score: score[0])
+
+        for strategy in plan:
+            best, lead = run(strategy)
+            out['scores'][strategy] = best
+        if len(plan) == 1 and not (best >= self.confidence_threshold and lead >= self.margin):
+            other = next(s for s in STRATEGIES if s not in plan)
+            out['scores'][other] = run(other)[0]
+            out['fallback'] = True
+        return out
+
+
+def _winner(bundle: Dict) -> str:
+    scores = bundle['scores']
+    return 'whole' if scores['whole'] > scores['roi'] else 'roi'
+
+
+def strategy_stats(table: Sequence[Dict]) -> Dict:
+    """
+    Summary of an adaptive run: sample win counts and rates, mean seconds per
+    cell of each strategy, the dominant strategy (None if both were kept) and
+    how many cells ran one strategy or fell back to both.
+    """
+    bundles = [b for b in table if b and 'plan' in b]
+    sample = [b for b in bundles if b.get('sample')]
+    wins = Counter(_winner(b) for b in sample)
+    rest = [b for b in bundles if not b.get('sample')]
+    single = [b for b in rest if len(b['plan']) == 1]
+    seconds = {}
+    for name in STRATEGIES:
+        times = [b['seconds'][name] for b in bundles if name in b['seconds']]
+        seconds[name] = float(np.mean(times)) if times else None
+    return {
+        'sample_cells': len(sample),
+        'wins': {name: wins.get(name, 0) for name in STRATEGIES},
+        'win_rate': {name: (wins.get(name, 0) / len(sample) if sample else None) for name in STRATEGIES},
+        'seconds_per_cell': seconds,
+        'dominant': single[0]['plan'][0] if single else None,
+        'single_strategy_cells': sum(1 for b in single if not b['fallback']),
+        'fallback_cells': sum(1 for b in single if b['fallback']),
+    }
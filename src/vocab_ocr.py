@@ -0,0 +1,163 @@
+import cv2
+import numpy as np
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+from ocr_cell import build_roi_result, cell_roi_boxes
+from reconcile import POSITIONS, PlayerIndex, as_player_index
+
+# Hershey fonts and stroke weights every vocabulary entry is rendered in
+RENDER_FONTS = (cv2.FONT_HERSHEY_SIMPLEX, cv2.FONT_HERSHEY_DUPLEX, cv2.FONT_HERSHEY_TRIPLEX)
+RENDER_THICKNESS = (1, 2)
+# Feature tile (width, height) that renderings and ROI ink are resized to
+FEATURE_SIZE = (64, 16)
+# Correlation penalty per unit of |log aspect ratio| between ROI ink and a rendering
+ASPECT_WEIGHT = 0.15
+# Ink components smaller than this share of the largest one are treated as specks
+MIN_COMPONENT_SHARE = 0.05
+# Best correlation below which a field is left empty
+MIN_MATCH_SCORE = 0.2
+
+
+def ink_features(binary: np.ndarray) -> Optional[Tuple[np.ndarray, float]]:
+    """
+    Feature vector of the ink (dark pixels) of a black-on-white binary image.
+
+    The ink's bounding box (specks ignored) is resized to FEATURE_SIZE and
+    normalized to zero mean and unit length, so a dot product of two vectors
+    is their normalized correlation.
+
+    Returns:
+        (float32 vector, aspect ratio of the ink box) or None without ink
+    """
+    ink = (binary < 128).astype(np.uint8)
+    n, _, stats, _ = cv2.connectedComponentsWithStats(ink, connectivity=8)
+    if n <= 1:
+        return None
+    areas = stats[1:, cv2.CC_STAT_AREA]
+    keep = stats[1:][areas >= max(2, MIN_COMPONENT_SHARE * areas.max())]
+    x0 = keep[:, cv2.CC_STAT_LEFT].min()
+    y0 = keep[:, cv2.CC_STAT_TOP].min()
+    x1 = (keep[:, cv2.CC_STAT_LEFT] + keep[:, cv2.CC_STAT_WIDTH]).max()
+    y1 = (keep[:, cv2.CC_STAT_TOP] + keep[:, cv2.CC_STAT_HEIGHT]).max()
+    crop = ink[y0:y1, x0:x1].astype(np.float32)
+    tile = cv2.resize(crop, FEATURE_SIZE, interpolation=cv2.INTER_AREA).ravel()
+    tile -= tile.mean()
+    norm = np.linalg.norm(tile)
+    if norm == 0:
+        return None
+    return tile / norm, (x1 - x0) / (y1 - y0)
+
+
+def text_binary(gray: np.ndarray) -> np.ndarray:
+    """
+    Black-on-white binary of a grayscale text crop: blur(3x3) → Otsu, with the
+    class covering most of the crop's border taken as background, so light and
+    dark text come out the same way.
+    """
+    blurred = cv2.GaussianBlur(gray, (3, 3), 0)
+    _, binary = cv2.threshold(blurred, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    border = np.concatenate([binary[0], binary[-1], binary[:, 0], binary[:, -1]])
+    if (border == 0).mean() > 0.5:
+        binary = 255 - binary
+    return binary
+
+
+def render_word(text: str, font: int, thickness: int, scale: float = 1.0, pad: int = 4) -> np.ndarray:
+    """text drawn black on white with cv2.putText, binarized."""
+    (w, h), baseline = cv2.getTextSize(text, font, scale, thickness)
+    img = np.full((h + baseline + 2 * pad, w + 2 * pad), 255, np.uint8)
+    cv2.putText(img, text, (pad, pad + h), font, scale, 0, thickness, cv2.LINE_AA)
+    return np.where(img < 128, 0, 255).astype(np.uint8)
+
+
+class VocabularyRecognizer:
+    """
+    Recognizes words from a fixed vocabulary without OCR.
+
+    Every word, plus any other printed spellings of it (e.g. "ETIENNE JR."
+    for "ETIENNE"), is rendered in RENDER_FONTS x RENDER_THICKNESS and
+    indexed as ink_features vectors; a binarized image is matched by
+    normalized correlation against all renderings at once (one matrix-vector
+    product), minus an aspect-ratio penalty, keeping each word's best rendering.
+    """
+
+    def __init__(self, words: Sequence[str], fonts: Sequence[int] = RENDER_FONTS,
+                 thicknesses: Sequence[int] = RENDER_THICKNESS,
+                 spellings: Optional[Dict[str, Sequence[str]]] = None):
+        self.words: Tuple[str, ...] = tuple(dict.fromkeys(w for w in words if w))
+        spellings = spellings or {}
+        features, aspects, owners = [], [], []
+        for k, word in enumerate(self.words):
+            for text in dict.fromkeys([word, *spellings.get(word, ())]):
+                for font in fonts:
+                    for thickness in thicknesses:
+                        feature = ink_features(render_word(text, font, thickness))
+                        if feature is not None:
+                            features.append(feature[0])
+                            aspects.append(feature[1])
+                            owners.append(k)
+        self.features = np.array(features, dtype=np.float32).reshape(len(features), -1)
+        self.log_aspects = np.log(np.array(aspects, dtype=np.float32))
+        self.owners = np.array(owners, dtype=np.intp)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def match(self, binary: np.ndarray, n: int = 5) -> List[Tuple[float, str]]:
+        """Top n (score, word) for a black-on-white binary image, best first."""
+        feature = ink_features(binary)
+        if feature is None or not len(self.owners):
+            return []
+        vector, aspect = feature
+        scores = self.features @ vector - ASPECT_WEIGHT * np.abs(self.log_aspects - np.log(aspect))
+        best = np.full(len(self.words), -np.inf, dtype=np.float32)
+        np.maximum.at(best, self.owners, scores)
+        top = np.argsort(-best, kind='stable')[:max(0, n)]
+        return [(float(best[k]), self.words[k]) for k in top.tolist()]
+
+
+class ClosedVocabularyReader:
+    """
+    Offline read_cell replacement for boards whose names all come from the player database.
+
+    Each ROI is matched against its own vocabulary: normalized last names (the
+    keys the reconciler matches on, one entry per key; printed spellings with
+    suffixes or punctuation are extra renderings of their key), upper-cased
+    first names, team codes, positions and "BYE n" for the database's bye
+    weeks. The result has the read_cell keys plus 'vocab_candidates', the top
+    normalized last names.
+    ROIs are binarized with text_binary rather than neutral_otsu: plain Otsu
+    keeps letter shapes intact, which template matching depends on more than
+    Tesseract does.
+    """
+
+    def __init__(self, players):
+        index = as_player_index(players)
+        spellings: Dict[str, List[str]] = {}
+        for p, key in zip(index, index.norm_last):
+            if key and p.last.upper() != key:
+                spellings.setdefault(key, []).append(p.last.upper())
+        self.fields: Dict[str, VocabularyRecognizer] = {
+            'pos': VocabularyRecognizer(POSITIONS),
+            'bye': VocabularyRecognizer([f"BYE {bye}" for bye in sorted({p.bye for p in index if p.bye})]),
+            'lastname': VocabularyRecognizer(sorted(set(index.norm_last)), spellings=spellings),
+            'team': VocabularyRecognizer(sorted(set(index.teams))),
+            'firstname': VocabularyRecognizer([p.first.upper() for p in index]),
+        }
+
+    def read(self, cell_img: np.ndarray, hsv=None, n: int = 5) -> Dict:
+        """read_cell-format dict for one cell, plus the top n last-name candidates."""
+        gray = cv2.cvtColor(cell_img, cv2.COLOR_BGR2GRAY) if cell_img.ndim == 3 else cell_img
+        matches = {}
+        for name, (x, y, w, h) in cell_roi_boxes(*gray.shape[:2]).items():
+            matches[name] = self.fields[name].match(text_binary(gray[y:y+h, x:x+w]), n)
+        texts = {name: (m[0][1] if m and m[0][0] >= MIN_MATCH_SCORE else '') for name, m in matches.items()}
+        result = build_roi_result(texts, cell_img, hsv)
+        result['vocab_candidates'] = [word for score, word in matches['lastname'] if score >= MIN_MATCH_SCORE]
+        return result
+
+
+@lru_cache(maxsize=2)
+def get_vocabulary_reader(players: PlayerIndex) -> ClosedVocabularyReader:
+    """ClosedVocabularyReader for a PlayerIndex, built once per index."""
+    return ClosedVocabularyReader(players)
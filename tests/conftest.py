@@ -0,0 +1,60 @@
+import multiprocessing
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import numpy as np
+import pytest
+
+import ocr_engine
+from ocr_engine import DATA_KEYS
+
+PLAYERS_CSV = os.path.join(os.path.dirname(__file__), '..', 'data', 'top500_playernames.csv')
+
+needs_fork = pytest.mark.skipif(multiprocessing.get_start_method() != 'fork',
+                                reason='process workers must inherit the registered OCR backend')
+
+
+class FixedBackend:
+    """Deterministic OCR backend: every ROI reads the same sticker."""
+    name = 'fixed'
+
+    def image_to_string(self, img, psm=7, whitelist=None):
+        if whitelist and 'QB' in whitelist:
+            return 'WR'
+        if whitelist and 'BYE' in whitelist:
+            return 'BYE 7'
+        return 'JEFFERSON'
+
+    def image_to_data(self, img, psm=6, whitelist=None):
+        return {key: [] for key in DATA_KEYS}
+
+
+@pytest.fixture
+def fixed_backend():
+    cache = ocr_engine.get_cache()
+    ocr_engine.configure_cache(0)
+    ocr_engine.register_backend('fixed', FixedBackend)
+    ocr_engine.set_backend('fixed')
+    yield
+    ocr_engine.set_backend('auto')
+    ocr_engine._cache = cache
+
+
+@pytest.fixture(scope='session')
+def players():
+    from reconcile import load_players
+    return load_players(PLAYERS_CSV)
+
+
+def board(rows=2, cols=3, cell=(120, 200)):
+    """Blue stickers on a white board, with their (row, col, x, y, w, h) cells."""
+    h, w = cell
+    img = np.full((rows * h, cols * w, 3), 255, dtype=np.uint8)
+    cells = []
+    for r in range(rows):
+        for c in range(cols):
+            img[r * h + 4:(r + 1) * h - 4, c * w + 4:(c + 1) * w - 4] = (200, 120, 40)
+            cells.append((r, c, c * w, r * h, w, h))
+    return img, cells
@@ -0,0 +1,17 @@
+from board_ocr import reading_order, words_to_whole_result
+
+
+def test_reading_order_groups_words_with_jittered_baselines():
+    # First name slightly lower and shorter than the last name on the same printed line
+    words = [(110, 40, 90, 22, 'CHASE'), (10, 44, 60, 16, 'JAMARR'), (10, 5, 30, 12, 'WR'),
+             (150, 6, 50, 14, 'BYE'), (205, 5, 12, 15, '6'), (10, 80, 40, 14, 'MIN')]
+    assert [wd[4] for wd in reading_order(words)] == ['WR', 'BYE', '6', 'JAMARR', 'CHASE', 'MIN']
+
+
+def test_whole_result_pairs_bye_with_its_number():
+    # Old top // height keys split this line: 10 // 10 = 1 for BYE but 8 // 16 = 0 for its number
+    words = [(10, 12, 30, 12, 'WR'), (150, 10, 50, 10, 'BYE'), (205, 8, 12, 16, '6'),
+             (10, 44, 60, 16, 'JAMARR'), (110, 40, 90, 22, 'CHASE')]
+    result = words_to_whole_result(words)
+    assert result['ocr_bye'] == 6
+    assert result['ocr_pos'] == 'WR'
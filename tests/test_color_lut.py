@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from manual_color_calibration import ColorProfile, ManualColorCalibrator
+
+# Ranges measured from examples/sample_data/positional_color_examples
+SAMPLE_PROFILES = {
+    'DST': [((57, 97, 31), (79, 145, 81))], 'K': [((154, 33, 28), (174, 100, 85))],
+    'QB': [((0, 180, 145), (12, 225, 191))], 'RB': [((0, 100, 98), (8, 146, 152))],
+    'TE': [((163, 235, 99), (180, 255, 149))], 'WR': [((119, 132, 31), (138, 186, 78))],
+}
+# Overlapping, wrapped and multi-range profiles with profile confidences below 1
+OVERLAPPING_PROFILES = {
+    'RB': ([((170, 90, 90), (10, 160, 160)), ((20, 0, 0), (40, 255, 255))], 0.8),
+    'QB': ([((0, 100, 100), (8, 200, 200))], 1.0),
+    'WR': ([((100, 50, 50), (130, 200, 200))], 0.9),
+    'TE': ([((110, 60, 60), (120, 190, 190))], 0.95),
+}
+
+
+def per_range(profiles, hsv):
+    """The per-profile, per-range check the lookup table replaces."""
+    h, s, v = hsv
+    best, best_conf = None, 0.0
+    for pos, profile in profiles.items():
+        for (lh, ls, lv), (uh, us, uv) in profile.hsv_ranges:
+            h_in = (h >= lh or h <= uh) if lh > uh else lh <= h <= uh
+            if not (h_in and ls <= s <= us and lv <= v <= uv):
+                continue
+            h_center = ((lh + uh + 180) % 360) / 2 if lh > uh else (lh + uh) / 2
+            h_dist = min(abs(h - h_center), abs(h - h_center + 180), abs(h - h_center - 180))
+            conf = max(0.0, 1.0 - (h_dist / 90.0 + abs(s - (ls + us) / 2) / 255.0
+                                   + abs(v - (lv + uv) / 2) / 255.0) / 3.0) * profile.confidence
+            if conf > best_conf:
+                best, best_conf = pos, conf
+    return best, best_conf
+
+
+def calibrator(profiles):
+    c = ManualColorCalibrator()
+    c.profiles = {}
+    for pos, spec in profiles.items():
+        ranges, confidence = spec if isinstance(spec, tuple) else (spec, 1.0)
+        c.profiles[pos] = ColorProfile(position=pos, hsv_ranges=ranges, confidence=confidence)
+    return c
+
+
+@pytest.mark.parametrize('profiles', [SAMPLE_PROFILES, OVERLAPPING_PROFILES])
+def test_lookup_matches_per_range_check(profiles):
+    c = calibrator(profiles)
+    rng = np.random.default_rng(0)
+    ints = np.column_stack([rng.integers(0, 181, 20000), rng.integers(0, 256, 20000), rng.integers(0, 256, 20000)])
+    floats = rng.uniform([0, 0, 0], [180, 255, 255], (5000, 3))
+    for colors in (ints, floats):
+        expected = [per_range(c.profiles, tuple(hsv)) for hsv in colors.tolist()]
+        assert c.detect_positions(colors) == expected
+        assert [c.detect_position_from_color(tuple(hsv)) for hsv in colors.tolist()[:2000]] == expected[:2000]
+
+
+def test_integer_image_uses_table():
+    c = calibrator(SAMPLE_PROFILES)
+    img = np.random.default_rng(1).integers(0, 256, (40, 60, 3)).astype(np.uint8)
+    pos_idx, conf = c.classify_hsv(img)
+    names = c.position_names
+    for (y, x), i in np.ndenumerate(pos_idx):
+        assert ((names[i] if i >= 0 else None), float(conf[y, x])) == per_range(c.profiles, tuple(img[y, x].tolist()))
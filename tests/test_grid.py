@@ -0,0 +1,27 @@
+import os
+
+import cv2
+
+from grid import detect_empty_cells
+
+SAMPLE_BOARD = os.path.join(os.path.dirname(__file__), '..', '.temp', 'uploads', '10x14.jpg')
+
+
+def sample_cells(rows=19, cols=10):
+    """Grid over the 10x14 sample photo: 14 rows of stickers, then blank ruled paper."""
+    x0, x1, y0, cell_h = 82, 2022, 404, 59.1
+    cell_w = (x1 - x0) / cols
+    return [(r, c, int(x0 + c * cell_w), int(y0 + r * cell_h), int(cell_w), int(cell_h))
+            for r in range(rows) for c in range(cols)]
+
+
+def test_detect_empty_cells_on_sample_board():
+    img = cv2.imread(SAMPLE_BOARD)
+    cells = sample_cells()
+
+    empty = detect_empty_cells(img, cells)
+
+    # Blank cells are crossed by ruled lines and paper texture; every sticker
+    # (the hand-written D. Henry one included) is kept
+    assert [flag for (r, *_), flag in zip(cells, empty) if r >= 14] == [True] * 50
+    assert not any(flag for (r, *_), flag in zip(cells, empty) if r < 14)
@@ -0,0 +1,27 @@
+import ocr_engine
+from conftest import board, needs_fork
+from pipeline import ocr_board_cells
+
+
+def cache_lookups():
+    stats = ocr_engine.cache_stats()
+    return stats['hits'] + stats['disk_hits'] + stats['misses']
+
+
+def test_thread_pool_counts_cache_lookups(fixed_backend):
+    ocr_engine.configure_cache(4096)
+    img, cells = board()
+    ocr_board_cells(img, cells, workers=2, executor='thread', ocr_mode='separate')
+    assert cache_lookups() > 0
+
+
+@needs_fork
+def test_process_pool_reports_worker_cache_lookups(fixed_backend):
+    ocr_engine.configure_cache(4096)
+    img, cells = board()
+    ocr_board_cells(img, cells, workers=2, executor='thread', ocr_mode='separate')
+    thread_lookups = cache_lookups()
+
+    ocr_engine.configure_cache(4096)
+    ocr_board_cells(img, cells, workers=2, executor='process', ocr_mode='separate')
+    assert cache_lookups() == thread_lookups
@@ -0,0 +1,22 @@
+import os
+import pickle
+
+from reconcile import PlayerIndex, load_players
+
+PLAYERS_CSV = os.path.join(os.path.dirname(__file__), '..', 'data', 'top500_playernames.csv')
+
+
+def test_player_index_pickle_round_trip():
+    index = load_players(PLAYERS_CSV)
+    assert isinstance(index, PlayerIndex)
+
+    restored = pickle.loads(pickle.dumps(index))
+
+    assert isinstance(restored, PlayerIndex)
+    assert tuple(restored) == tuple(index)
+    assert restored.identities == index.identities
+    assert dict(restored.exact_last) == dict(index.exact_last)
+    assert restored.by_full_name == index.by_full_name
+    assert restored.candidates('QB').tolist() == index.candidates('QB').tolist()
+    player = index[0]
+    assert restored.find_by_name(f"{player.first} {player.last}") == player
@@ -0,0 +1,41 @@
+from reconcile import get_draft_table, player_identity, scan_candidates
+from score_matrix import ScoreMatrix
+
+
+def _hypotheses(players):
+    hypotheses = []
+    for k, i in enumerate(range(0, 120, 4)):
+        p = players[i]
+        ocr = {'ocr_last': p.last[:-1] + 'X', 'ocr_first': p.first, 'ocr_team': p.team if k % 2 else '',
+               'ocr_bye': p.bye, 'color_pos': p.pos if k % 3 else None}
+        hypotheses.append((ocr, k % 16, k % 10))
+    hypotheses.append(({'ocr_last': 'ZZQ', 'color_pos': 'WR'}, 3, 3))  # no trigram in common: empty block
+    return hypotheses
+
+
+def _picks(scan):
+    return scan.best[2], [c[2] for c in scan.top]
+
+
+def test_blocked_matrix_matches_per_cell_blocking(players):
+    hypotheses = _hypotheses(players)
+    draft_table = get_draft_table(10, 16, len(players))
+    matrix = ScoreMatrix(players, hypotheses, draft_table=draft_table, block=True)
+    assert matrix.blocks[-1] is None
+
+    # The used set shrinks again after blocks ran out: rows go back to their blocks
+    for used in (set(), {player_identity(p) for p in players[:200]}, set()):
+        for r, (ocr, row, col) in enumerate(hypotheses):
+            expected = scan_candidates(ocr['ocr_last'], row, col, used, players, ocr.get('color_pos'), ocr,
+                                       draft_table=draft_table, block=True)
+            got = scan_candidates(ocr['ocr_last'], row, col, used, players, ocr.get('color_pos'), ocr,
+                                  scores=matrix.row(r), draft_table=draft_table)
+            assert _picks(got) == _picks(expected)
+
+
+def test_unblocked_matrix_is_the_full_scan(players):
+    hypotheses = _hypotheses(players)
+    full = ScoreMatrix(players, hypotheses)
+    off = ScoreMatrix(players, hypotheses, block=False)
+    assert (full.total == off.total).all()
+    assert all(b is None for b in off.blocks)
@@ -0,0 +1,37 @@
+import pickle
+
+from conftest import board, needs_fork
+from pipeline import ocr_board_cells
+from reconcile import PlayerIndex
+from staged_ocr import AdaptiveCellReader, StagedCellReader
+
+
+def test_staged_reader_pickles_with_player_index(players):
+    reader = pickle.loads(pickle.dumps(StagedCellReader(players)))
+    assert isinstance(reader.players, PlayerIndex)
+    assert tuple(reader.players) == tuple(players)
+
+
+@needs_fork
+def test_staged_mode_runs_in_process_pool(players, fixed_backend):
+    img, cells = board()
+    table = ocr_board_cells(img, cells, workers=2, executor='process', staged=StagedCellReader(players))
+    assert len(table) == len(cells)
+    assert all(bundle['tier'] for bundle in table)
+    assert all(bundle['roi']['ocr_last'] == 'JEFFERSON' for bundle in table)
+
+
+def test_adaptive_reader_pickles_with_player_index(players):
+    reader = pickle.loads(pickle.dumps(AdaptiveCellReader(players)))
+    assert isinstance(reader.players, PlayerIndex)
+    assert tuple(reader.players) == tuple(players)
+
+
+@needs_fork
+def test_adaptive_mode_runs_in_process_pool(players, fixed_backend):
+    img, cells = board()
+    reader = AdaptiveCellReader(players, sample_size=2)
+    table = ocr_board_cells(img, cells, workers=2, executor='process', adaptive=reader)
+    assert len(table) == len(cells)
+    assert sum(1 for bundle in table if bundle.get('sample')) == 2
+    assert all(bundle['roi']['ocr_last'] == 'JEFFERSON' for bundle in table)
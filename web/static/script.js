@@ -2081,8 +2081,15 @@ async function saveCorrection() {
 
         const data = await response.json();
         if (data.success) {
-            // Remove this cell from unrecognized list
-            unrecognizedCells.splice(currentCorrectionIndex, 1);
+            if (Array.isArray(data.unrecognized_cells)) {
+                // Server queue: the corrected cell is gone, re-reconciled cells may have joined or left
+                unrecognizedCells = data.unrecognized_cells;
+                const next = unrecognizedCells.findIndex(c => c.index > cell.index);
+                currentCorrectionIndex = next === -1 ? unrecognizedCells.length : next;
+            } else {
+                // Remove this cell from unrecognized list
+                unrecognizedCells.splice(currentCorrectionIndex, 1);
+            }
 
             // Refresh the displayed results to show the manual correction
             await refreshDisplayedResults();